@@ -0,0 +1,121 @@
+"""Frame-scheduled tweening of canvas items.
+
+One Animator drives every movement on the board from a single `after`
+loop at S.ANIMATION_FPS: each frame walks the running tweens and applies
+their `canvas.move`s together, so four tokens and a handful of cards
+sliding at the end of a turn cost one timer, not one chain per item.
+
+Progress comes from the clock, not the frame count: a frame that runs late
+lands every tween where it should be by now (the frames in between are
+dropped, see `dropped`) and a slow machine finishes on time. With
+enabled=False every move is applied at once, for simulations and tests.
+
+Moves are relative (dx, dy), so any item type works and a tween that is
+cancelled midway leaves its items where they are; the next move for the
+same key starts from there.
+"""
+import time
+
+import settings as S
+
+
+def linear(t):
+    return t
+
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+def ease_in_out_quad(t):
+    return 2 * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 2 / 2
+
+
+class _Tween:
+    __slots__ = ("items", "dx", "dy", "t0", "duration", "ease", "on_done", "done")
+
+    def __init__(self, items, dx, dy, t0, duration, ease, on_done):
+        self.items, self.dx, self.dy = items, dx, dy
+        self.t0, self.duration, self.ease, self.on_done = t0, duration, ease, on_done
+        self.done = 0.0  # eased progress already applied
+
+
+class Animator:
+    def __init__(self, canvas, timers, fps=None, enabled=True, clock=time.perf_counter):
+        self.canvas = canvas
+        self.timers = timers
+        self.interval_ms = max(1, int(1000 / (fps or S.ANIMATION_FPS)))
+        self.enabled = enabled
+        self.clock = clock
+        self._tweens = {}  # key -> _Tween, in start order
+        self._last_frame = None
+        self.frames = 0
+        self.dropped = 0
+
+    def __contains__(self, key):
+        return key in self._tweens
+
+    def __len__(self):
+        return len(self._tweens)
+
+    def move(self, key, items, dx, dy, duration_ms=None, ease=ease_out_cubic, on_done=None):
+        """Slide `items` by (dx, dy); a running tween under `key` is cancelled where it is."""
+        self.cancel(key)
+        items = tuple(i for i in items if i)
+        duration = (S.ANIMATION_MS if duration_ms is None else duration_ms) / 1000.0
+        if not self.enabled or duration <= 0 or (not dx and not dy):
+            self._shift(items, dx, dy)
+            if on_done is not None:
+                on_done()
+            return
+        self._tweens[key] = _Tween(items, dx, dy, self.clock(), duration, ease, on_done)
+        if "animation" not in self.timers:
+            self._last_frame = self.clock()
+            self.timers.schedule("animation", self.interval_ms, self._frame)
+
+    def cancel(self, key):
+        """Stop `key` where it is (its on_done is not called)."""
+        self._tweens.pop(key, None)
+        if not self._tweens:
+            self.timers.cancel("animation")
+
+    def finish(self, key):
+        """Jump `key` to its end now."""
+        tween = self._tweens.pop(key, None)
+        if tween is not None:
+            self._step(tween, 1.0)
+        if not self._tweens:
+            self.timers.cancel("animation")
+
+    def finish_all(self):
+        for key in list(self._tweens):
+            self.finish(key)
+
+    def _shift(self, items, dx, dy):
+        for item in items:
+            self.canvas.move(item, dx, dy)
+
+    def _step(self, tween, progress):
+        p = tween.ease(progress)
+        delta, tween.done = p - tween.done, p
+        self._shift(tween.items, tween.dx * delta, tween.dy * delta)
+        if progress >= 1.0 and tween.on_done is not None:
+            tween.on_done()
+
+    def _frame(self):
+        now = self.clock()
+        late = (now - self._last_frame) * 1000.0 / self.interval_ms
+        if late >= 2:
+            self.dropped += int(late) - 1
+        self._last_frame = now
+        self.frames += 1
+        for key, tween in list(self._tweens.items()):
+            if self._tweens.get(key) is not tween:
+                continue  # cancelled or replaced by an earlier tween's on_done
+            progress = min(1.0, (now - tween.t0) / tween.duration)
+            if progress >= 1.0:
+                del self._tweens[key]  # before on_done, which may start a new tween for the key
+            self._step(tween, progress)
+        if self._tweens:
+            spent_ms = (self.clock() - now) * 1000.0
+            self.timers.schedule("animation", max(1, int(self.interval_ms - spent_ms)), self._frame)
@@ -0,0 +1,158 @@
+"""Sprite atlases + a size-bucketed, memory-capped LRU of Tk images.
+
+Card faces, token graphics and hex markers are packed into a few large atlas
+sheets. Widgets ask the AssetCache for (sprite, width, height); sizes are
+rounded down to a bucket so a redraw at a nearby size reuses the same
+PhotoImage instead of creating a new one.
+"""
+import json
+import os
+import warnings
+from collections import OrderedDict
+
+import settings as S
+
+try:
+    from PIL import Image, ImageTk
+except Exception:
+    Image = ImageTk = None
+
+_IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+
+class SpriteAtlas:
+    """Named sprites packed into one or more sheets with a shelf packer."""
+
+    def __init__(self, sheets=None, index=None):
+        self.sheets = sheets or []     # list of PIL images
+        self.index = index or {}       # name -> (sheet_idx, (x0, y0, x1, y1))
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    @classmethod
+    def pack(cls, named_images, max_w=None, pad=1):
+        """Pack {name: PIL image} into sheets no wider/taller than max_w."""
+        max_w = max_w or S.ATLAS_MAX_W
+        # Tallest first keeps shelves tight
+        items = sorted(named_images.items(), key=lambda kv: kv[1].size[1], reverse=True)
+        placed, sheet_sizes = {}, []
+        sheet, x, y, shelf_h = 0, 0, 0, 0
+        for name, img in items:
+            w, h = img.size
+            if x + w > max_w:
+                x, y, shelf_h = 0, y + shelf_h + pad, 0
+            if y + h > max_w:
+                sheet_sizes.append(y)
+                sheet, x, y, shelf_h = sheet + 1, 0, 0, 0
+            placed[name] = (sheet, (x, y, x + w, y + h))
+            x += w + pad
+            shelf_h = max(shelf_h, h)
+        sheet_sizes.append(y + shelf_h)
+
+        sheets = [Image.new("RGBA", (max_w, max(1, h))) for h in sheet_sizes]
+        for name, (si, (x0, y0, _x1, _y1)) in placed.items():
+            sheets[si].paste(named_images[name].convert("RGBA"), (x0, y0))
+        return cls(sheets, placed)
+
+    @classmethod
+    def from_dirs(cls, dirs=None, max_w=None):
+        """Pack every image found in the asset dirs; sprite names are '<group>/<stem>'."""
+        if Image is None:
+            return cls()
+        dirs = S.ASSET_DIRS if dirs is None else dirs
+        named = {}
+        for group, path in dirs.items():
+            if not os.path.isdir(path):
+                continue
+            for fn in sorted(os.listdir(path)):
+                stem, ext = os.path.splitext(fn)
+                if ext.lower() in _IMAGE_EXTS:
+                    try:
+                        # copy() decodes now, so no file stays open while thousands are gathered
+                        with Image.open(os.path.join(path, fn)) as im:
+                            named[f"{group}/{stem}"] = im.copy()
+                    except OSError as e:  # unreadable or not an image
+                        warnings.warn(f"skipping sprite {os.path.join(path, fn)}: {e}", stacklevel=2)
+        return cls.pack(named, max_w) if named else cls()
+
+    def save(self, prefix):
+        """Write '<prefix>_<n>.png' sheets plus a '<prefix>.json' index."""
+        for i, sheet in enumerate(self.sheets):
+            sheet.save(f"{prefix}_{i}.png")
+        with open(f"{prefix}.json", "w", encoding="utf-8") as fh:
+            json.dump({"sheets": len(self.sheets), "index": self.index}, fh)
+
+    @classmethod
+    def load(cls, prefix):
+        with open(f"{prefix}.json", encoding="utf-8") as fh:
+            meta = json.load(fh)
+        sheets = [Image.open(f"{prefix}_{i}.png") for i in range(meta["sheets"])]
+        index = {k: (si, tuple(box)) for k, (si, box) in meta["index"].items()}
+        return cls(sheets, index)
+
+    def crop(self, name):
+        sheet_idx, box = self.index[name]
+        return self.sheets[sheet_idx].crop(box)
+
+
+def bucket_size(w, h, step=None):
+    """Round a requested size down to the cache bucket grid (so art never overflows its slot)."""
+    step = step or S.ASSET_SIZE_BUCKET
+    return (max(step, int(w) // step * step), max(step, int(h) // step * step))
+
+
+class AssetCache:
+    """LRU of rendered sprites keyed by (name, bucket_w, bucket_h).
+
+    Entries are charged at 4 bytes/pixel and evicted least-recently-used once
+    max_bytes is exceeded. Callers that display an image keep their own
+    reference, so eviction never blanks an item that is on screen.
+    """
+
+    def __init__(self, atlas, master=None, max_bytes=None, factory=None):
+        self.atlas = atlas
+        self.max_bytes = S.ASSET_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._factory = factory or (lambda img: ImageTk.PhotoImage(img, master=master))
+        self._entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def has(self, name):
+        return name in self.atlas
+
+    def get(self, name, w, h):
+        """Return the image for sprite `name` at (bucketed) size w x h, or None."""
+        if name not in self.atlas or Image is None:
+            return None
+        bw, bh = bucket_size(w, h)
+        key = (name, bw, bh)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        img = self.atlas.crop(name).resize((bw, bh), Image.LANCZOS)
+        photo = self._factory(img)
+        cost = bw * bh * 4
+        self._entries[key] = (photo, cost)
+        self.bytes_used += cost
+        self._evict()
+        return photo
+
+    def _evict(self):
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            _key, (_photo, cost) = self._entries.popitem(last=False)
+            self.bytes_used -= cost
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
@@ -0,0 +1,155 @@
+"""Crash-safe autosave of the rules state.
+
+The main thread only captures a history.Snapshot -- tuples shared with the
+previous snapshot wherever nothing changed, so it takes microseconds --
+and hands it to Autosaver. The worker thread serialises it, writes and
+fsyncs a temporary file, shifts the older saves along (path.1 ..
+path.N, S.AUTOSAVE_ROTATIONS of them) and renames the new file into
+place. A power cut at any moment leaves either the new save or the
+previous one intact; load_latest() takes the newest that parses.
+
+Saves are latest-wins: if the disk falls behind, snapshots queued in the
+meantime are skipped in favour of the newest.
+"""
+import json
+import os
+import queue
+import threading
+
+import settings as S
+from history import Snapshot
+
+FORMAT = 1
+
+
+def _tuples(value):
+    return tuple(_tuples(v) for v in value) if isinstance(value, list) else value
+
+
+def dumps(snap) -> bytes:
+    return json.dumps({"format": FORMAT, "snapshot": snap._asdict()}, separators=(",", ":")).encode()
+
+
+def loads(data) -> Snapshot:
+    doc = json.loads(data)
+    if doc.get("format") != FORMAT:
+        raise ValueError(f"unsupported autosave format {doc.get('format')!r}")
+    snap = doc["snapshot"]
+    return Snapshot(**{field: _tuples(snap[field]) for field in Snapshot._fields})
+
+
+def rotations(path, count=None):
+    """The save files for `path`, newest first."""
+    count = S.AUTOSAVE_ROTATIONS if count is None else count
+    return [path] + [f"{path}.{i}" for i in range(1, count + 1)]
+
+
+def load_latest(path, count=None):
+    """The newest readable save for `path` (None if there is none)."""
+    for candidate in rotations(path, count):
+        try:
+            with open(candidate, "rb") as fh:
+                return loads(fh.read())
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+    return None
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Autosaver:
+    """Writes submitted snapshots to `path` on a worker thread.
+
+    `saved` counts completed writes; `error` holds the last OSError from the
+    worker until the next submit() or close() raises it. The worker itself
+    carries on, so saves resume once the disk recovers.
+    """
+
+    def __init__(self, path, rotations=None):
+        self.path = path
+        self.rotations = S.AUTOSAVE_ROTATIONS if rotations is None else rotations
+        self.saved = 0
+        self.error = None
+        self.closed = False
+        self._last = None
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def submit(self, snap) -> bool:
+        """Queue `snap` for writing; False if it matches the last one submitted."""
+        if self.closed:
+            raise ValueError("Autosaver is closed")
+        self._raise_error()
+        if snap == self._last:
+            return False
+        self._last = snap
+        self._requests.put(snap)
+        return True
+
+    def _run(self):
+        stop = False
+        while not stop:
+            items = [self._requests.get()]
+            while True:
+                try:
+                    items.append(self._requests.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in items  # close(): write what came before it, then exit
+            snaps = [snap for snap in items if snap is not None]
+            if snaps:
+                try:
+                    self._write(snaps[-1])  # only the newest snapshot matters
+                    self.saved += 1
+                except OSError as e:
+                    self.error = e
+            for _ in items:
+                self._requests.task_done()
+
+    def _write(self, snap):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(dumps(snap))
+            fh.flush()
+            os.fsync(fh.fileno())
+        files = rotations(self.path, self.rotations)
+        for older, newer in zip(reversed(files[1:]), reversed(files[:-1])):
+            if os.path.exists(newer):
+                os.replace(newer, older)
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+
+    def _raise_error(self):
+        error, self.error = self.error, None  # each failure is reported once
+        if error is not None:
+            raise error
+
+    def flush(self):
+        """Block until everything submitted so far is on disk."""
+        self._requests.join()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self._requests.put(None)
+        self._thread.join()
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,279 @@
+"""Parameter sweep over the economy settings.
+
+Every combination of the given parameter values is played out headlessly
+(rules.SimGame) by each strategy for --games seeded games. The grid is
+fanned out over worker processes, which stream their results back through
+shared memory (shm_ring.py), and the outcome distribution of every
+(configuration, strategy) pair is written to CSV (summary quantiles) or
+NPZ (every game's outcome).
+
+    python balance_sweep.py --param FUNDS_START=5:25:5 \\
+        --param MODEL_UPGRADE_COSTS=0.5,1,2 --param FUNDS_SERIES.lobby=1,2 \\
+        --games 500 --strategies economy,model_rush --jobs 8 --out sweep.npz
+
+Parameters:
+  FUNDS_START, CHAOS_STEP              values are used as-is
+  FUNDS_SERIES.<key>                   values scale that cost progression
+  SCALING_PRESENCE_COSTS               scales the table and the charged
+  MODEL_UPGRADE_COSTS                  progression (scale_presence /
+                                       compute_or_model) together
+A value spec is "a,b,c" or an inclusive range "start:stop:step".
+
+--store DIR also records every turn of every game into a game_store
+directory (configuration index in each game's "config" field).
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+import settings as S
+from game_store import StoreWriter, TurnCollector
+from rules import play_game
+from shm_ring import run_pool, worker_ring
+from strategies import STRATEGIES, get_strategy
+from telemetry import turn_columns, turn_record
+
+METRICS = ("funds", "compute", "model", "ops", "presence", "reputation", "power", "chaos", "hand")
+QUANTILES = (0.1, 0.5, 0.9)
+
+# Sweep ring records (shm_ring.py): kind, config, strategy column, game, then the turn row or
+# the game's outcome (METRICS order); a game's turns come before its outcome
+_TURN, _GAME = 0, 1
+_RECORD_HEAD = 4
+
+# cost table -> FUNDS_SERIES entry that actually charges it
+_TABLE_SERIES = {"SCALING_PRESENCE_COSTS": "scale_presence", "MODEL_UPGRADE_COSTS": "compute_or_model"}
+
+
+def parse_values(spec: str) -> list:
+    """"1,2,5" -> [1, 2, 5]; "0.5:2:0.5" -> [0.5, 1.0, 1.5, 2.0] (inclusive)."""
+    num = lambda s: float(s) if any(ch in s for ch in ".eE") else int(s)
+    if ":" in spec:
+        start, stop, step = (num(p) for p in spec.split(":"))
+        if step <= 0:
+            raise ValueError(f"Step must be positive in {spec!r}")
+        n = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 10) for i in range(max(n, 0))]
+    return [num(p) for p in spec.split(",") if p]
+
+
+def _check_param(name):
+    if name in ("FUNDS_START", "CHAOS_STEP") or name in _TABLE_SERIES:
+        return
+    if name.startswith("FUNDS_SERIES.") and name.split(".", 1)[1] in S.FUNDS_SERIES:
+        return
+    raise ValueError(f"Can't sweep {name!r}")
+
+
+def _check_value(name, value):
+    """Refuse a value the game cannot run under (before any worker starts)."""
+    if name == "CHAOS_STEP":
+        if value != int(value) or value < 1:
+            raise ValueError(f"CHAOS_STEP must be a whole number >= 1, got {value!r}")
+    elif value < 0:
+        kind = "funds" if name == "FUNDS_START" else "a cost factor"
+        raise ValueError(f"{name} is {kind} and cannot be negative, got {value!r}")
+
+
+def _scaled(seq, factor):
+    return [max(0, int(round(v * factor))) for v in seq]
+
+
+@contextmanager
+def settings_overrides(params: dict):
+    """Temporarily apply one configuration to the settings module.
+
+    Everything reads S.<NAME> at call time, so this is exactly a settings.py
+    edit -- scoped to the calling (worker) process and undone on exit.
+    """
+    for name, value in params.items():
+        _check_value(name, value)
+    saved = {k: getattr(S, k) for k in ("FUNDS_START", "CHAOS_STEP", "FUNDS_SERIES", *_TABLE_SERIES)}
+    series = {k: list(v) for k, v in S.FUNDS_SERIES.items()}
+    try:
+        for name, value in params.items():
+            if name in ("FUNDS_START", "CHAOS_STEP"):
+                setattr(S, name, int(value))
+            elif name in _TABLE_SERIES:
+                setattr(S, name, _scaled(saved[name], value))
+                key = _TABLE_SERIES[name]
+                series[key] = _scaled(saved["FUNDS_SERIES"][key], value)
+            else:
+                key = name.split(".", 1)[1]
+                series[key] = _scaled(saved["FUNDS_SERIES"][key], value)
+        S.FUNDS_SERIES = series
+        yield
+    finally:
+        for k, v in saved.items():
+            setattr(S, k, v)
+
+
+def run_config(job):
+    """Worker entry: (config index, params, strategy, seeds, turns, record)
+    -> (index, strategy, outcomes, per-game turn rows or None)."""
+    index, params, strategy_name, seeds, turns, record = job
+    strategy = get_strategy(strategy_name)
+    out = np.empty((len(seeds), len(METRICS)), dtype=np.int64)
+    games = [] if record else None
+    with settings_overrides(params):
+        for i, seed in enumerate(seeds):
+            rows = TurnCollector() if record else None
+            res = play_game(strategy, seed=seed, turns=turns, telemetry=rows).outcome()
+            out[i] = [res[m] for m in METRICS]
+            if record:
+                games.append(np.asarray(rows.rows, dtype=np.int32))
+    return index, strategy_name, out, games
+
+
+class _RingTurns:
+    """Telemetry sink streaming one game's turns to the worker's ring."""
+
+    def __init__(self, ring, head):
+        self.ring, self.head = ring, head
+
+    def record_turn(self, game, funds_before, charges, income):
+        self.ring.put((_TURN, *self.head, *turn_record(game, funds_before, charges, income)))
+
+
+def ring_config(job):
+    """Worker entry: (strategy column, run_config job); streams records to the worker's ring."""
+    column, (index, params, strategy_name, seeds, turns, record) = job
+    ring = worker_ring()
+    strategy = get_strategy(strategy_name)
+    with settings_overrides(params):
+        for g, seed in enumerate(seeds):
+            head = (index, column, g)
+            rows = _RingTurns(ring, head) if record else None
+            res = play_game(strategy, seed=seed, turns=turns, telemetry=rows).outcome()
+            ring.put((_GAME, *head, *(res[m] for m in METRICS)))
+
+
+def sweep(grid: dict, strategies, games=100, turns=None, seed=0, jobs=None, progress=None, store=None):
+    """Play the whole grid; returns (configs, outcomes[config, strategy, game, metric]).
+
+    Every configuration uses the same seeds (common random numbers), so
+    differences between configurations are not seed noise. With `store`
+    (a game_store.StoreWriter) every game's turns are appended as results
+    arrive, so they are never all in memory.
+    """
+    names = list(grid)
+    configs = [dict(zip(names, combo)) for combo in itertools.product(*(grid[n] for n in names))]
+    seeds = list(range(seed, seed + games))
+    outcomes = np.empty((len(configs), len(strategies), games, len(METRICS)), dtype=np.int64)
+    strat_index = {name: j for j, name in enumerate(strategies)}
+    record = store is not None
+    work = [(i, cfg, name, seeds, turns, record) for i, cfg in enumerate(configs) for name in strategies]
+
+    if jobs == 1:
+        for done, (i, name, out, game_rows) in enumerate(map(run_config, work), 1):
+            outcomes[i, strat_index[name]] = out
+            for s, rows in zip(seeds, game_rows or ()):
+                store.add_game(rows, name, seed=s, config=i)
+            if progress:
+                progress(done, len(work))
+        return configs, outcomes
+
+    n_cols = len(turn_columns())
+    games_in_flight = {}  # (config, strategy column, game) -> its turn rows so far
+
+    def take(records):
+        if record:
+            for rec in records[records[:, 0] == _TURN]:
+                games_in_flight.setdefault(tuple(rec[1:_RECORD_HEAD].tolist()), []).append(rec[_RECORD_HEAD:_RECORD_HEAD + n_cols])
+        ended = records[records[:, 0] == _GAME]
+        outcomes[ended[:, 1], ended[:, 2], ended[:, 3]] = ended[:, _RECORD_HEAD:_RECORD_HEAD + len(METRICS)]
+        if record:
+            for i, j, g in ended[:, 1:_RECORD_HEAD].tolist():
+                rows = games_in_flight.pop((i, j, g), [])
+                store.add_game(np.array(rows).reshape(-1, n_cols), strategies[j], seed=seeds[g], config=i)
+
+    # outcomes and turns come back through shared memory, not pickled per run (see shm_ring.py)
+    workers = min(jobs or os.cpu_count() or 1, len(work)) or 1
+    width = _RECORD_HEAD + max(len(METRICS), n_cols if record else 0)
+    run_pool(ring_config, [(strat_index[job[2]], job) for job in work], workers, width, take, on_done=progress)
+    return configs, outcomes
+
+
+def write_csv(path, configs, strategies, outcomes):
+    names = list(configs[0]) if configs else []
+    header = names + ["strategy", "games"]
+    for m in METRICS:
+        header += [f"{m}_mean", f"{m}_std"] + [f"{m}_p{int(q * 100)}" for q in QUANTILES]
+    with open(path, "w", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(header)
+        for i, cfg in enumerate(configs):
+            for j, name in enumerate(strategies):
+                data = outcomes[i, j]
+                row = [cfg[n] for n in names] + [name, data.shape[0]]
+                qs = np.quantile(data, QUANTILES, axis=0)
+                for k in range(len(METRICS)):
+                    col = data[:, k]
+                    row += [round(float(col.mean()), 3), round(float(col.std()), 3)] + [float(q) for q in qs[:, k]]
+                w.writerow(row)
+
+
+def write_npz(path, configs, strategies, outcomes):
+    names = list(configs[0]) if configs else []
+    np.savez_compressed(
+        path,
+        param_names=np.array(names),
+        params=np.array([[cfg[n] for n in names] for cfg in configs], dtype=np.float64),
+        strategies=np.array(strategies),
+        metrics=np.array(METRICS),
+        outcomes=outcomes,
+    )
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Sweep economy settings over headless games.")
+    ap.add_argument("--param", action="append", default=[], metavar="NAME=SPEC",
+                    help="parameter to sweep (repeatable), e.g. FUNDS_START=5:25:5")
+    ap.add_argument("--strategies", default=",".join(STRATEGIES),
+                    help=f"comma-separated subset of: {', '.join(STRATEGIES)}")
+    ap.add_argument("--games", type=int, default=100, help="seeded games per configuration and strategy")
+    ap.add_argument("--turns", type=int, default=S.SIM_TURNS)
+    ap.add_argument("--seed", type=int, default=0, help="first seed")
+    ap.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    ap.add_argument("--out", default="balance_sweep.csv", help=".csv for summaries, .npz for every game")
+    ap.add_argument("--store", metavar="DIR", help="also record every turn into a game_store directory")
+    args = ap.parse_args(argv)
+
+    grid = {}
+    try:
+        for item in args.param:
+            name, _, spec = item.partition("=")
+            _check_param(name)
+            grid[name] = parse_values(spec)
+            for value in grid[name]:
+                _check_value(name, value)
+        strategies = [s for s in args.strategies.split(",") if s]
+        for name in strategies:
+            get_strategy(name)
+    except ValueError as exc:
+        ap.error(str(exc))
+
+    def progress(done, total):
+        print(f"\r{done}/{total} runs", end="", file=sys.stderr, flush=True)
+
+    store = StoreWriter(args.store) if args.store else None
+    try:
+        configs, outcomes = sweep(grid, strategies, args.games, args.turns, args.seed, args.jobs, progress, store)
+    finally:
+        if store is not None:
+            store.close()
+    print(file=sys.stderr)
+    if args.out.endswith(".npz"):
+        write_npz(args.out, configs, strategies, outcomes)
+    else:
+        write_csv(args.out, configs, strategies, outcomes)
+    print(f"{len(configs)} configurations x {len(strategies)} strategies -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
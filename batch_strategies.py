@@ -0,0 +1,204 @@
+"""Strategies that decide for a whole batch of games in one call.
+
+A per-game Strategy (strategies.py) is asked for placements, every region
+pick and every card choice separately, so with the rules engine fast the
+simulation time goes to those Python calls. A BatchStrategy instead gets
+one structured array row per game (STATE_DTYPE) and returns all of its
+decisions as arrays, so a policy is a handful of NumPy expressions:
+
+    class MoreChaos(BatchStrategy):
+        def decide(self, states):
+            d = super().decide(states)
+            d["regions"][:, TASK_TYPES.index("rep-1_chaos+10")] = states["chaos"].argmax(axis=1)
+            return d
+
+Decisions (all arrays have one row per game):
+    cells        (n, k) flat cell indices (row * S.GRID_COLS + col) in
+                 preference order, -1 for padding; taken greedily while the
+                 turn stays legal and affordable, up to ops_available
+    regions      (n, len(TASK_TYPES)) S.REGION_NAMES index per region-task
+                 type; a region that is not a candidate falls back to the
+                 first candidate
+    card_budget  (n,) the most a game will pay for the cheapest card it is
+                 offered (-1 or absent: always pass)
+"""
+import numpy as np
+
+import settings as S
+from cards import load_catalog
+from rules import ALL_CELLS, REGION_TASKS, SimGame, TurnLedger, preview_charges
+
+N_CELLS = len(ALL_CELLS)
+N_REGIONS = len(S.REGION_NAMES)
+TASK_TYPES = tuple(kind for _cell, kind, _requires in REGION_TASKS)
+_TASK_INDEX = {kind: i for i, kind in enumerate(TASK_TYPES)}
+
+# charge keys Take Actions gates on, and how many of each one token on a cell asks for
+COSTED_KEYS = ("compute_or_model", "lobby", "scale_presence")
+_CELL_COSTED = np.array([[preview_charges([cell])[k] for k in COSTED_KEYS] for cell in ALL_CELLS], dtype=np.int32)
+_PRESENCE_CELLS = np.array([cell in S.PRESENCE_REQUIRED_COORDS for cell in ALL_CELLS])
+
+STATE_DTYPE = np.dtype([
+    ("turn", "<i4"), ("funds", "<i4"), ("compute", "<i4"), ("model", "<i4"),
+    ("ops_available", "<i4"), ("ops_aspirational", "<i4"), ("hand", "<i4"), ("deck", "<i4"),
+    ("income", "<i4"),                       # reputation x power this turn would pay
+    ("reputation", "<i4", (N_REGIONS,)),     # per S.REGION_NAMES index
+    ("power", "<i4", (N_REGIONS,)),
+    ("chaos", "<i4", (N_REGIONS,)),
+    ("presence", "?", (N_REGIONS,)),
+    ("legal", "?", (N_CELLS,)),              # cells a token may go on (ignoring cost)
+    ("cell_cost", "<i4", (N_CELLS,)),        # what one token there would cost now
+])
+
+
+_SCALARS = ("turn", "funds", "compute", "model", "ops_available", "ops_aspirational", "hand", "deck")
+
+
+def _state_values(g):
+    vals = [g.turn, g.funds.value, g.compute_idx, g.model_idx, g.ops_available, g.ops_aspirational,
+            len(g.hand), len(g.deck)]
+    counters = g.funds.counters
+    vals += [counters[k] for k in COSTED_KEYS]
+    for r in g.regions.regions.values():  # S.REGION_NAMES order
+        vals += (r.reputation, r.power, r.chaos, r.player_presence)
+    return vals
+
+
+def encode_states(games, out=None):
+    """Write one STATE_DTYPE row per game into `out` (allocated if None)."""
+    if out is None:
+        out = np.zeros(len(games), dtype=STATE_DTYPE)
+    if not games:
+        return out
+    # one flat int row per game, then whole-column assignments
+    flat = np.array([_state_values(g) for g in games], dtype=np.int32)
+    for i, name in enumerate(_SCALARS):
+        out[name] = flat[:, i]
+    col = len(_SCALARS)
+    counters = flat[:, col:col + len(COSTED_KEYS)]
+    per_region = flat[:, col + len(COSTED_KEYS):].reshape(len(games), N_REGIONS, 4)
+    for i, name in enumerate(("reputation", "power", "chaos", "presence")):
+        out[name] = per_region[:, :, i]
+    out["income"] = out["reputation"].sum(axis=1) * out["power"].sum(axis=1)
+    out["legal"] = ~_PRESENCE_CELLS | out["presence"].any(axis=1)[:, None]
+    out["cell_cost"] = cell_costs(counters, games[0].funds.series_map)
+    return out
+
+
+def cell_costs(counters, series_map):
+    """(n, N_CELLS) price of one token on each cell, from (n, len(COSTED_KEYS)) funds counters.
+
+    The vectorised Funds.peek_cost(key, 1) for every game and cell at once.
+    """
+    counters = np.asarray(counters, dtype=np.int64)
+    price = np.stack([np.asarray(series_map[k])[np.minimum(counters[:, j], len(series_map[k]) - 1)]
+                      for j, k in enumerate(COSTED_KEYS)], axis=1)
+    return price @ _CELL_COSTED.T
+
+
+class BatchStrategy:
+    """Random play for every game at once; subclasses override decide()."""
+
+    name = "batch_random"
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def decide(self, states) -> dict:
+        n = len(states)
+        # random order over the legal cells, illegal ones padded out
+        keys = self.rng.random((n, N_CELLS)) + ~states["legal"]
+        cells = np.argsort(keys, axis=1)
+        cells[keys[np.arange(n)[:, None], cells] >= 1] = -1
+
+        regions = self.rng.integers(0, N_REGIONS, (n, len(TASK_TYPES)))
+        # new presence goes to a random region that has none yet
+        fresh = self.rng.random((n, N_REGIONS)) + states["presence"]
+        regions[:, _TASK_INDEX["add_presence"]] = fresh.argmin(axis=1)
+
+        budget = np.where(self.rng.random(n) < 0.5, states["funds"], -1)
+        return {"cells": cells, "regions": regions, "card_budget": budget}
+
+
+class BatchEconomyStrategy(BatchStrategy):
+    """strategies.EconomyStrategy, vectorised."""
+
+    name = "batch_economy"
+    ORDER = [(1, 1), (1, 0), (1, 2), (0, 1), (0, 2), (0, 0), (0, 3), (1, 3)]
+
+    def decide(self, states) -> dict:
+        d = super().decide(states)
+        n = len(states)
+        order = np.array([ALL_CELLS.index(c) for c in self.ORDER])
+        cells = np.tile(order, (n, 1))
+        # the product grows fastest by raising the smaller factor: lead with power
+        rep_ahead = states["reputation"].sum(axis=1) > states["power"].sum(axis=1)
+        power_first = np.concatenate(([ALL_CELLS.index((1, 2))], order[order != ALL_CELLS.index((1, 2))]))
+        cells[rep_ahead] = power_first
+        cells[~np.take_along_axis(states["legal"], cells, axis=1)] = -1
+        d["cells"] = cells
+
+        # weakest region with presence for every other task
+        absent = np.where(states["presence"], 0, 1 << 20)
+        weakest_power = (states["power"] + absent).argmin(axis=1)
+        weakest_rep = (states["reputation"] + absent).argmin(axis=1)
+        for kind, i in _TASK_INDEX.items():
+            if kind != "add_presence":
+                d["regions"][:, i] = weakest_power if "power" in kind else weakest_rep
+        d["card_budget"] = states["funds"] // 2
+        return d
+
+
+BATCH_STRATEGIES = {cls.name: cls for cls in (BatchStrategy, BatchEconomyStrategy)}
+
+
+def get_batch_strategy(name: str, seed=None) -> BatchStrategy:
+    try:
+        return BATCH_STRATEGIES[name](seed)
+    except KeyError:
+        raise ValueError(f"Unknown batch strategy {name!r}; choose from {', '.join(BATCH_STRATEGIES)}") from None
+
+
+def greedy_cells(game, prefs, ledger=None):
+    """The placement play_turn gets from one game's row of `cells`."""
+    ledger = ledger or TurnLedger()
+    ledger.clear()
+    for idx in prefs:
+        if ledger.placed == game.ops_available:
+            break
+        if idx < 0 or ALL_CELLS[idx] in ledger.cells:
+            continue
+        ledger.add(ALL_CELLS[idx])
+        if ledger.blocker(game.funds, game.regions):
+            ledger.remove(ALL_CELLS[idx])
+    return ledger.placed_cells()
+
+
+class RowDecision:
+    """One game's slice of a decide() result, shaped like the per-game Strategy play_turn asks."""
+
+    __slots__ = ("regions", "budget")
+
+    def pick_region(self, game, task_type, candidates):
+        name = S.REGION_NAMES[self.regions[_TASK_INDEX[task_type]]]
+        return name if name in candidates else candidates[0]
+
+    def keep_card(self, game, offered):
+        costs = [game.catalog.costs[cid] for cid in offered]
+        i = min(range(len(offered)), key=costs.__getitem__)
+        return i if costs[i] <= self.budget else None
+
+
+def play_batch(strategy, seeds, turns=None, catalog=None):
+    """Play one game per seed in lockstep, one decide() call per turn; returns the SimGames."""
+    catalog = catalog or load_catalog()
+    games = [SimGame(seed, catalog) for seed in seeds]
+    states = np.zeros(len(games), dtype=STATE_DTYPE)
+    row, ledger = RowDecision(), TurnLedger()
+    for _ in range(S.SIM_TURNS if turns is None else turns):
+        d = strategy.decide(encode_states(games, states))
+        cells, regions = np.asarray(d["cells"]).tolist(), np.asarray(d["regions"]).tolist()
+        budgets = np.asarray(d["card_budget"]).tolist() if "card_budget" in d else [-1] * len(games)
+        for game, prefs, row.regions, row.budget in zip(games, cells, regions, budgets):
+            game.play_turn(greedy_cells(game, prefs, ledger), row)
+    return games
@@ -0,0 +1,109 @@
+class ItemPool:
+    """Reusable canvas items of one kind (text, rectangle, polygon, image...).
+
+    Released items are hidden instead of deleted, and acquire() shows a free
+    one again, so transient UI (toasts, popups, markers) doesn't churn ids.
+    """
+
+    def __init__(self, canvas, kind: str, **defaults):
+        self.canvas = canvas
+        self.kind = kind
+        self.defaults = defaults
+        self._create = getattr(canvas, f"create_{kind}")
+        self._free = []
+        self.live = set()
+
+    def acquire(self, *coords, **opts):
+        """Show an item at coords with opts (raised to the top) and return its id."""
+        if self._free:
+            item = self._free.pop()
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfigure(item, state="normal", **opts)
+        else:
+            item = self._create(*coords, **{**self.defaults, **opts})
+        self.canvas.tag_raise(item)
+        self.live.add(item)
+        return item
+
+    def release(self, item):
+        if item not in self.live:
+            return
+        self.live.discard(item)
+        self.canvas.itemconfigure(item, state="hidden")
+        self._free.append(item)
+
+    def release_all(self):
+        for item in list(self.live):
+            self.release(item)
+
+
+class GridView:
+    """Keeps items only for the grid cells in view.
+
+    update() takes the (row0, row1, col0, col1) range in view (see
+    Layout.cells_in), calls make(row, col) -> items for cells that came into
+    view and drop(items) for those that left, so a board of any size costs
+    what fits on the screen. `margin` extra cells on each side keep short
+    scrolls from churning.
+    """
+
+    def __init__(self, rows, cols, make, drop, margin=1):
+        self.rows, self.cols = rows, cols
+        self.make = make
+        self.drop = drop
+        self.margin = margin
+        self.shown = {}  # (row, col) -> whatever make() returned
+
+    def update(self, rows0, rows1, cols0, cols1):
+        m = self.margin
+        r0, r1 = max(0, rows0 - m), min(self.rows, rows1 + m)
+        c0, c1 = max(0, cols0 - m), min(self.cols, cols1 + m)
+        for cell in [cell for cell in self.shown if not (r0 <= cell[0] < r1 and c0 <= cell[1] < c1)]:
+            self.drop(self.shown.pop(cell))
+        for r in range(r0, r1):
+            for c in range(c0, c1):
+                if (r, c) not in self.shown:
+                    self.shown[(r, c)] = self.make(r, c)
+
+    def clear(self):
+        for items in self.shown.values():
+            self.drop(items)
+        self.shown.clear()
+
+
+class TimerRegistry:
+    """Named `after` callbacks; rescheduling a name cancels the stale one."""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self._pending = {}
+
+    def __contains__(self, name):
+        return name in self._pending
+
+    def schedule(self, name: str, millis: int, fn, *args):
+        self.cancel(name)
+        self._pending[name] = self.widget.after(millis, self._fire, name, fn, args)
+        return self._pending[name]
+
+    def schedule_idle(self, name: str, fn, *args):
+        """Like schedule(), but runs once Tk is idle (after pending redraws)."""
+        self.cancel(name)
+        self._pending[name] = self.widget.after_idle(self._fire, name, fn, args)
+        return self._pending[name]
+
+    def _fire(self, name, fn, args):
+        self._pending.pop(name, None)
+        fn(*args)
+
+    def cancel(self, name: str):
+        after_id = self._pending.pop(name, None)
+        if after_id is not None:
+            try:
+                self.widget.after_cancel(after_id)
+            except Exception:
+                pass
+
+    def cancel_all(self):
+        for name in list(self._pending):
+            self.cancel(name)
@@ -0,0 +1,174 @@
+import csv
+import random
+from functools import lru_cache
+from typing import NamedTuple
+
+import settings as S
+
+
+class Card(NamedTuple):
+    id: int
+    type: str
+    cost: int
+    name: str
+    effect: str
+
+
+class CardCatalog:
+    """Immutable card table indexed by card id.
+
+    Columns are tuples addressed directly by id, so lookups are O(1) and games
+    only ever hold integer ids (definitions are never copied per game).
+    """
+
+    __slots__ = ("types", "costs", "names", "effects", "_ids_by_type")
+
+    def __init__(self, rows):
+        rows = list(rows)
+        size = max((r.id for r in rows), default=0) + 1
+        types, costs = [None] * size, [0] * size
+        names, effects = [""] * size, [""] * size
+        by_type = {t: [] for t in S.CARD_TYPES}
+
+        for r in rows:
+            if r.type not in by_type:
+                raise ValueError(f"Unknown card type {r.type!r} for card {r.id}")
+            if types[r.id] is not None:
+                raise ValueError(f"Duplicate card id {r.id}")
+            types[r.id], costs[r.id] = r.type, r.cost
+            names[r.id], effects[r.id] = r.name, r.effect
+            by_type[r.type].append(r.id)
+
+        set_ = object.__setattr__
+        set_(self, "types", tuple(types))
+        set_(self, "costs", tuple(costs))
+        set_(self, "names", tuple(names))
+        set_(self, "effects", tuple(effects))
+        set_(self, "_ids_by_type", {t: tuple(ids) for t, ids in by_type.items()})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CardCatalog is immutable")
+
+    def __len__(self):
+        return sum(len(ids) for ids in self._ids_by_type.values())
+
+    def __contains__(self, card_id):
+        return 0 <= card_id < len(self.types) and self.types[card_id] is not None
+
+    def __getitem__(self, card_id) -> Card:
+        if card_id not in self:
+            raise KeyError(card_id)
+        return Card(card_id, self.types[card_id], self.costs[card_id],
+                    self.names[card_id], self.effects[card_id])
+
+    def ids_of_type(self, card_type: str) -> tuple:
+        return self._ids_by_type[card_type]
+
+
+def _read_rows(path):
+    with open(path, newline="", encoding="utf-8") as fh:
+        for rec in csv.DictReader(fh):
+            yield Card(int(rec["id"]), rec["type"].strip().upper(), int(rec["cost"]),
+                       rec["name"].strip(), rec["effect"].strip())
+
+
+@lru_cache(maxsize=None)
+def load_catalog(*paths) -> CardCatalog:
+    """Load (and cache) the catalog; extra paths add expansion sets."""
+    paths = paths or (S.CARD_CATALOG_PATH,)
+    rows = [row for p in paths for row in _read_rows(p)]
+    return CardCatalog(rows)
+
+
+class Deck:
+    """Draw pile of card ids for one card type.
+
+    Draws are a partial Fisher-Yates: swap a random live card to the end and
+    pop it, so each draw is O(1) and the pile never needs a full shuffle.
+    """
+
+    def __init__(self, card_ids, rng=None):
+        self._ids = list(card_ids)
+        self._snap = None  # ids() as a tuple, kept until the pile changes
+        self._rng = rng or random
+        self.zobrist = None  # zobrist.Zobrist told which cards leave and rejoin the pile
+
+    def __len__(self):
+        return len(self._ids)
+
+    def draw(self, n: int = 1) -> list:
+        ids, out = self._ids, []
+        for _ in range(min(n, len(ids))):
+            j = self._rng.randrange(len(ids))
+            ids[j], ids[-1] = ids[-1], ids[j]
+            out.append(ids.pop())
+        if out:
+            self._snap = None
+        self._moved(out, True, False)
+        return out
+
+    def _moved(self, card_ids, old, new):
+        if self.zobrist is not None:
+            for cid in card_ids:
+                self.zobrist.move(("deck", cid), old, new)
+
+    def put_back(self, card_ids):
+        """Return undrawn/declined cards; draws are uniform so order is irrelevant."""
+        if card_ids:
+            self._ids.extend(card_ids)
+            self._snap = None
+        self._moved(card_ids, False, True)
+
+    def ids(self) -> tuple:
+        """The pile as a tuple; the same object until the pile changes, so snapshots can share it."""
+        if self._snap is None:
+            self._snap = tuple(self._ids)
+        return self._snap
+
+    def reset(self, card_ids):
+        old, self._ids = set(self._ids), list(card_ids)
+        self._snap = None
+        new = set(self._ids)
+        self._moved(old - new, True, False)
+        self._moved(new - old, False, True)
+
+
+class DeckSet:
+    """One Deck per card type, all drawing from the shared catalog."""
+
+    def __init__(self, catalog: CardCatalog, rng=None):
+        self.catalog = catalog
+        self._rng = rng or random
+        self.decks = {t: Deck(catalog.ids_of_type(t), self._rng) for t in S.CARD_TYPES}
+
+    def __getitem__(self, card_type) -> Deck:
+        return self.decks[card_type]
+
+    def __len__(self):
+        return sum(len(d) for d in self.decks.values())
+
+    def draw(self, card_type: str, n: int = 1) -> list:
+        return self.decks[card_type].draw(n)
+
+    def draw_any(self):
+        """Draw one card uniformly across all decks (None when empty)."""
+        total = len(self)
+        if not total:
+            return None
+        k = self._rng.randrange(total)
+        for deck in self.decks.values():
+            if k < len(deck):
+                return deck.draw(1)[0]
+            k -= len(deck)
+
+    def put_back(self, card_ids):
+        for cid in card_ids:
+            self.decks[self.catalog.types[cid]].put_back((cid,))
+
+    def snapshot(self) -> tuple:
+        """Remaining ids per deck, in S.CARD_TYPES order."""
+        return tuple(self.decks[t].ids() for t in S.CARD_TYPES)
+
+    def restore(self, snap):
+        for t, ids in zip(S.CARD_TYPES, snap):
+            self.decks[t].reset(ids)
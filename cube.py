@@ -1,18 +1,47 @@
-import settings as S
+from layout import DEFAULT_LAYOUT
 
 class Cube:
-    def __init__(self, canvas, idx, x, y, color, size=60, locked=False):
+    def __init__(self, canvas, idx, x, y, color, size=60, locked=False, image=None, font=None, layout=None):
         self.canvas = canvas
         self.idx = idx
         self.size = size
+        self.layout = layout or DEFAULT_LAYOUT
         self.locked = locked
-        self.current_cell = None
+        self.on_cell_change = None  # callback(cube, old_cell, new_cell), e.g. the turn ledger
+        self.animator = None  # animation.Animator to slide with; None snaps
+        self._cell = None
         self.dragging = False
 
         self.rect = canvas.create_rectangle(x, y, x + size, y + size, fill=color, outline="#222", width=3)
-        self.text = canvas.create_text(x + size/2, y + size/2, text=f"C{idx+1}", fill="white", font=("Helvetica", 14, "bold"))
+        self.text = canvas.create_text(x + size/2, y + size/2, text=f"C{idx+1}", fill="white",
+                                       font=font or ("Helvetica", 14, "bold"))
+        # Optional token art drawn over the rect (rect stays the hit/drag shape)
+        self.image = image
+        self.image_id = canvas.create_image(x + size/2, y + size/2, image=image) if image else None
         self.start_x, self.start_y = x, y
 
+    def set_image(self, image):
+        """Put token art over the rect (or swap it), e.g. once the sprites are loaded."""
+        self.image = image
+        if image is None:
+            return
+        if self.image_id:
+            self.canvas.itemconfigure(self.image_id, image=image)
+            return
+        x0, y0, x1, y1 = self.canvas.coords(self.rect)
+        self.image_id = self.canvas.create_image((x0 + x1) / 2, (y0 + y1) / 2, image=image)
+        self.canvas.tag_raise(self.image_id, self.text)
+
+    @property
+    def current_cell(self):
+        return self._cell
+
+    @current_cell.setter
+    def current_cell(self, cell):
+        old, self._cell = self._cell, cell
+        if old != cell and self.on_cell_change is not None:
+            self.on_cell_change(self, old, cell)
+
     def contains(self, px, py):
         x0, y0, x1, y1 = self.canvas.coords(self.rect)
         return x0 <= px <= x1 and y0 <= py <= y1
@@ -20,6 +49,8 @@ class Cube:
     def begin_drag(self, x, y):
         if self.locked:
             return
+        if self.animator is not None:
+            self.animator.cancel(("cube", self.idx))  # the pointer takes over mid-slide
         self.dragging = True
         self.drag_offset_x = x - self.start_x
         self.drag_offset_y = y - self.start_y
@@ -31,39 +62,56 @@ class Cube:
         ny = y - self.drag_offset_y
         self.canvas.coords(self.rect, nx, ny, nx + self.size, ny + self.size)
         self.canvas.coords(self.text, nx + self.size/2, ny + self.size/2)
+        if self.image_id:
+            self.canvas.coords(self.image_id, nx + self.size/2, ny + self.size/2)
 
     def end_drag(self):
         self.dragging = False
 
+    def _slide_by(self, dx, dy):
+        items = (self.rect, self.text, self.image_id)
+        if self.animator is None:
+            for item in items:
+                if item:
+                    self.canvas.move(item, dx, dy)
+        else:
+            self.animator.move(("cube", self.idx), items, dx, dy)
+
+    def _slide_center_to(self, cx, cy):
+        if self.animator is not None:
+            self.animator.cancel(("cube", self.idx))  # measure from where it is now
+        rx0, ry0, rx1, ry1 = self.canvas.coords(self.rect)
+        self._slide_by(cx - (rx0 + rx1) / 2, cy - (ry0 + ry1) / 2)
+
     def return_to_start(self):
-        self.canvas.coords(self.rect, self.start_x, self.start_y, self.start_x + self.size, self.start_y + self.size)
-        self.canvas.coords(self.text, self.start_x + self.size/2, self.start_y + self.size/2)
+        self._slide_center_to(self.start_x + self.size/2, self.start_y + self.size/2)
         self.current_cell = None
 
     def center_on_cell(self, row, col, grid_origin_x=None, grid_origin_y=None, cell_size=None):
         """Snap the cube to the center of (row, col).
-        Backwards-compatible: if grid geometry is not passed, use settings.
+        Backwards-compatible: explicit grid geometry overrides the layout table.
         """
-        gx = S.GRID_ORIGIN_X if grid_origin_x is None else grid_origin_x
-        gy = S.GRID_ORIGIN_Y if grid_origin_y is None else grid_origin_y
-        cs = S.CELL_SIZE if cell_size is None else cell_size
-
-        x0 = gx + col * cs
-        y0 = gy + row * cs
-        cx = x0 + cs / 2
-        cy = y0 + cs / 2
-
-        # move the rect so its center is (cx, cy)
-        rx0, ry0, rx1, ry1 = self.canvas.coords(self.rect)
-        cur_cx = (rx0 + rx1) / 2
-        cur_cy = (ry0 + ry1) / 2
-        dx = cx - cur_cx
-        dy = cy - cur_cy
-        self.canvas.move(self.rect, dx, dy)
-        self.canvas.move(self.text, dx, dy)
+        if grid_origin_x is None and grid_origin_y is None and cell_size is None:
+            cx, cy = self.layout.cell_centers[self.layout.cell_index(row, col)]
+        else:
+            L = self.layout
+            gx = L.grid_x if grid_origin_x is None else grid_origin_x
+            gy = L.grid_y if grid_origin_y is None else grid_origin_y
+            cs = L.cell if cell_size is None else cell_size
+            cx = gx + col * cs + cs / 2
+            cy = gy + row * cs + cs / 2
 
+        self._slide_center_to(cx, cy)
         self.current_cell = (row, col)
 
     def set_start(self, x, y):
         self.start_x, self.start_y = x, y
         self.return_to_start()
+
+    def rescale(self, ratio, layout=None):
+        """Follow a canvas.scale(..., 0, 0, ratio, ratio) of the items."""
+        if layout is not None:
+            self.layout = layout
+        self.size *= ratio
+        self.start_x *= ratio
+        self.start_y *= ratio
@@ -0,0 +1,79 @@
+"""Fixed-size numeric feature vector for a game state.
+
+One layout (FEATURE_NAMES) shared by search, training (vec_env) and
+analytics. encode_into() writes a Game or SimGame straight into a row of
+a buffer the caller owns -- element by element, no lists, dicts or
+temporary arrays -- so encoding millions of states leaves nothing behind
+for the garbage collector.
+
+    buf = np.empty((len(games), FEATURE_SIZE), dtype=np.float32)
+    encode_batch(games, buf)
+"""
+import settings as S
+from rules import ALL_CELLS
+from telemetry import region_slug
+
+SERIES_KEYS = tuple(S.FUNDS_SERIES)
+_CELL_INDEX = {cell: i for i, cell in enumerate(ALL_CELLS)}
+
+
+def _names():
+    names = [f"occupancy_{r}_{c}" for r, c in ALL_CELLS]
+    names += ["funds"] + [f"counter_{k}" for k in SERIES_KEYS]
+    names += ["compute", "model", "ops_available", "ops_aspirational"]
+    for region in S.REGION_NAMES:
+        slug = region_slug(region)
+        names += [f"{slug}_chaos", f"{slug}_rep", f"{slug}_power", f"{slug}_presence"]
+    names += ["hand", "deck"]
+    return tuple(names)
+
+
+FEATURE_NAMES = _names()
+FEATURE_SIZE = len(FEATURE_NAMES)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+F_FUNDS = FEATURE_INDEX["funds"]
+F_COMPUTE = FEATURE_INDEX["compute"]
+F_REGIONS = F_COMPUTE + 4  # chaos, rep, power, presence per region from here
+F_HAND = FEATURE_INDEX["hand"]
+
+
+def encode_into(game, out):
+    """Write `game`'s features into the 1-D buffer `out` (len FEATURE_SIZE); returns out."""
+    for i in range(len(ALL_CELLS)):
+        out[i] = 0
+    ledger = getattr(game, "ledger", None)  # only the Tk game has tokens on the board between turns
+    if ledger is not None:
+        for cell, n in ledger.cells.items():
+            out[_CELL_INDEX[cell]] = n
+
+    funds = game.funds
+    out[F_FUNDS] = funds.value
+    i = F_FUNDS + 1
+    for key in SERIES_KEYS:
+        out[i] = funds.counters[key]
+        i += 1
+
+    out[F_COMPUTE] = game.compute_idx
+    out[F_COMPUTE + 1] = game.model_idx
+    out[F_COMPUTE + 2] = game.ops_available
+    out[F_COMPUTE + 3] = game.ops_aspirational
+
+    i = F_REGIONS
+    for r in game.regions.regions.values():  # S.REGION_NAMES order
+        out[i] = r.chaos
+        out[i + 1] = r.reputation
+        out[i + 2] = r.power
+        out[i + 3] = r.player_presence
+        i += 4
+
+    out[F_HAND] = len(game.hand)
+    out[F_HAND + 1] = len(game.deck)
+    return out
+
+
+def encode_batch(games, out):
+    """encode_into() every game into the matching row of the 2-D buffer `out`."""
+    for i, game in enumerate(games):
+        encode_into(game, out[i])
+    return out
@@ -0,0 +1,105 @@
+"""What-if projection of the placement on the board, off the UI thread.
+
+project() copies a game's rules state into a SimGame and plays the same
+placement for S.FORECAST_TURNS turns (a turn it can no longer afford is
+passed), picking regions and cards as EconomyStrategy would. The draws
+use a fixed seed, so a state and placement always project the same way
+and the result is memoised in zobrist.EVAL_CACHE.
+
+Forecaster runs projections on a worker thread. Each request() bumps a
+generation number; the worker drops queued requests older than the newest
+and abandons a projection as soon as a newer one arrives, so only the
+placement on the board when the player let go is ever finished.
+"""
+import queue
+import threading
+
+import settings as S
+import zobrist
+from replay import restore, snapshot
+from rules import SimGame
+from strategies import get_strategy
+
+
+def capture(game):
+    """The part of `game` a projection needs, as plain values (cheap; main thread)."""
+    return snapshot(game)
+
+
+def sim_from(state, catalog) -> SimGame:
+    sim = SimGame(seed=S.FORECAST_SEED, catalog=catalog)
+    restore(sim, state)  # draw piles included
+    zobrist.rehash(sim)
+    return sim
+
+
+def project(sim, cells, turns=None, strategy=None, stale=None):
+    """Play `cells` every turn on `sim`; one row per turn, or None if `stale()` turns True midway.
+
+    Row: {"turn", "played", "funds", "income", "compute", "model", "ops"}, turn counting from 1.
+    """
+    strategy = strategy or get_strategy("economy")
+    cells = list(cells)
+    rows = []
+    for ahead in range(1, (S.FORECAST_TURNS if turns is None else turns) + 1):
+        if stale is not None and stale():
+            return None
+        played = sim.can_take(cells)
+        income = sim.play_turn(cells if played else [], strategy)["income"]
+        rows.append({"turn": ahead, "played": played, "funds": sim.funds.value, "income": income,
+                     "compute": sim.compute_idx, "model": sim.model_idx, "ops": sim.ops_available})
+    return rows
+
+
+class Forecaster:
+    """request() answers from the cache or queues a projection; results arrive on `results`
+    as (generation, rows), and only those matching `generation` are current."""
+
+    def __init__(self, turns=None, cache=None):
+        self.turns = S.FORECAST_TURNS if turns is None else turns
+        self.cache = cache or zobrist.EVAL_CACHE
+        self.generation = 0
+        self.projected = 0  # projections run to the end (cache misses that were not cancelled)
+        self._requests = queue.Queue()
+        self.results = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="forecast", daemon=True)
+        self._thread.start()
+
+    def key(self, game, cells):
+        return (game.zobrist.value, "forecast", tuple(sorted(cells)), self.turns)
+
+    def request(self, game, cells):
+        """Supersede every earlier request; returns the rows at once if cached, else None."""
+        self.generation += 1
+        key = self.key(game, cells)
+        rows = self.cache.peek(key)
+        if rows is None:
+            self._requests.put((self.generation, key, capture(game), game.catalog, list(cells)))
+        return rows
+
+    def _stale(self, generation):
+        return lambda: generation != self.generation
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            while item is not None:
+                try:
+                    item = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+            if item is None:
+                break
+            generation, key, state, catalog, cells = item
+            if generation != self.generation:
+                continue
+            rows = project(sim_from(state, catalog), cells, self.turns, stale=self._stale(generation))
+            if rows is None:
+                continue
+            self.projected += 1
+            self.cache.put(key, rows)
+            self.results.put((generation, rows))
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join()
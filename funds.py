@@ -1,31 +1,43 @@
 class Funds:
-    def __init__(self, start_amount: int, series_map: dict, canvas, x: int, y: int):
+    def __init__(self, start_amount: int, series_map: dict, canvas, x: int, y: int, font=None):
         """
         start_amount: starting integer funds
         series_map: dict[str, list[int]] cost progressions
-        canvas: Tk canvas to render the label
+        canvas: Tk canvas to render the label (None for headless use)
         x, y: position for the label text
+        font: label font (defaults to Helvetica 12 bold)
         """
         self.value = int(start_amount)
         self.series_map = {k: list(v) for k, v in series_map.items()}
         self.counters = {k: 0 for k in self.series_map.keys()}
+        self.zobrist = None  # zobrist.Zobrist kept current by charge/add/pay
         self.canvas = canvas
         self.pos = (x, y)
 
-        self.label_id = self.canvas.create_text(
-            x, y,
-            text=self._label_text(),
-            anchor="w",
-            font=("Helvetica", 12, "bold"),
-            fill="black",
-        )
+        self.label_id = None
+        if canvas is not None:
+            self.label_id = self.canvas.create_text(
+                x, y,
+                text=self._label_text(),
+                anchor="w",
+                font=font or ("Helvetica", 12, "bold"),
+                fill="black",
+            )
 
     def _label_text(self):
         return f"Current Funds: ${self.value}"
 
     def _update_label(self):
+        if self.label_id is None:
+            return
         self.canvas.itemconfigure(self.label_id, text=self._label_text())
 
+    def _set_value(self, value):
+        old, self.value = self.value, max(0, value)
+        if self.zobrist is not None:
+            self.zobrist.move(("funds",), old, self.value)
+        self._update_label()
+
     def charge(self, key: str, times: int = 1):
         """Charge the user 'times' steps of the progression for 'key'. Clamp at 0."""
         if times <= 0:
@@ -43,16 +55,24 @@ class Funds:
             idx += 1
 
         # apply and clamp
+        old_idx, old_value = self.counters[key], self.value
         self.counters[key] = idx
         self.value = max(0, self.value - total_cost)
+        if self.zobrist is not None:
+            self.zobrist.move(("counter", key), old_idx, idx)
+            self.zobrist.move(("funds",), old_value, self.value)
         self._update_label()
         return total_cost
 
     def add(self, amount: int):
         """Increase funds (positive amount)."""
         if amount:
-            self.value = max(0, self.value + int(amount))
-            self._update_label()
+            self._set_value(self.value + int(amount))
+
+    def pay(self, amount: int):
+        """Decrease funds by a flat amount (e.g. a card cost). Clamp at 0."""
+        if amount:
+            self._set_value(self.value - int(amount))
 
     def peek_cost(self, key: str, times: int = 1) -> int:
         """Return the total cost for 'times' future uses of 'key' without mutating state."""
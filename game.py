@@ -1,16 +1,32 @@
 # game.py (refactored)
+import time
 import tkinter as tk
-import random
 import settings as S
 from funds import Funds
 from cube import Cube
 from regions import RegionManager
+from cards import DeckSet, load_catalog
+from assets import AssetCache, SpriteAtlas
+from animation import Animator
+from canvas_pool import ItemPool, TimerRegistry
+from layout import FontBook, build_layout, fit_scale
+from rules import TurnLedger
+from telemetry import TelemetryWriter
+import zobrist
 
 from mixins.ui_grid import UIGridMixin
 from mixins.ui_cards import UICardsMixin
 from mixins.ui_costs import UICostsMixin
 from mixins.ui_trackers import UITrackersMixin
 from mixins.ui_regions import UIRegionsMixin
+from mixins.ui_layout import UILayoutMixin
+from mixins.ui_replay import UIReplayMixin
+from mixins.ui_history import UIHistoryMixin
+from mixins.ui_heatmap import UIHeatmapMixin
+from mixins.ui_startup import UIStartupMixin
+from mixins.ui_autosave import UIAutosaveMixin
+from mixins.ui_forecast import UIForecastMixin
+from mixins.ui_remote import UIRemoteMixin
 from mixins.logic_core import LogicCoreMixin
 
 # Re-export PIL handles for tests (may be None in headless)
@@ -22,18 +38,35 @@ except Exception:
 
 BOARD_LABELS = S.BOARD_LABELS
 
-class Game(UIGridMixin, UICardsMixin, UICostsMixin, UITrackersMixin, UIRegionsMixin, LogicCoreMixin):
+class Game(UIGridMixin, UICardsMixin, UICostsMixin, UITrackersMixin, UIRegionsMixin, UILayoutMixin,
+           UIReplayMixin, UIHistoryMixin, UIHeatmapMixin, UIStartupMixin, UIAutosaveMixin,
+           UIForecastMixin, UIRemoteMixin, LogicCoreMixin):
     BOARD_LABELS = BOARD_LABELS
 
-    def __init__(self, root):
+    def __init__(self, root, window_size=None, telemetry=None, staged=False, autosave=None, animate=False):
+        """window_size: (w, h) to fit the board to; None draws at design size (scale 1).
+        telemetry: path (or TelemetryWriter) to stream one record per turn to; off when None.
+        staged: build only the grid and tokens now and the rest on idle (see UIStartupMixin).
+        autosave: path (or autosave.Autosaver) to save the game to in the background; off when None.
+        animate: slide tokens and cards into place (see animation.py); False moves them at once.
+        """
+        t0 = time.perf_counter()
         self.root = root
         self.root.title("AI Apocalypser")
         self.regions = RegionManager(S.REGION_NAMES)
 
         self.occupied = {}
         self.active_cube = None
-        self.deck = list(range(1, 51)); random.shuffle(self.deck)
+        self.catalog = load_catalog()
+        self.deck = DeckSet(self.catalog)
         self.hand = []
+        self.card_offers = []  # pending (card_type, [card ids]) keep-one choices
+        self.turn = 0
+        self.replay = None  # replay.Recording while the board is a read-only viewer
+        if isinstance(telemetry, str):
+            telemetry = TelemetryWriter(telemetry)
+        self.telemetry = telemetry
+        self.on_ready = None  # callback(game) once every construction stage has run
 
         # --- tracker state (leftmost index by default) ---
         self.compute_idx = 0
@@ -46,77 +79,92 @@ class Game(UIGridMixin, UICardsMixin, UICostsMixin, UITrackersMixin, UIRegionsMi
         }
 
         self.cell_text_ids = {}
+        self.grid_view = None  # canvas_pool.GridView on boards large enough to cull
         self.side_image_id = None
         self.side_image_dims = (0, 0)
 
-        w = S.GRID_ORIGIN_X + S.GRID_COLS * S.CELL_SIZE + S.GRID_PADDING + 300
-        h = S.CARD_AREA_Y + S.CARD_AREA_H + S.GRID_PADDING
-        self.canvas = tk.Canvas(root, width=w, height=h, bg="#f7f7fb")
-        self.canvas.pack()
+        # All geometry comes from one frozen layout table sized to the window; the map's
+        # aspect is read from its header and the map itself is decoded in a later stage
+        side_aspect = self._probe_side_image()
+        scale = fit_scale(*window_size, side_aspect) if window_size else 1.0
+        self.layout = build_layout(scale, side_aspect)
+        self.fonts = FontBook(root, scale)
+
+        L = self.layout
+        self.canvas = tk.Canvas(root, width=L.width, height=L.height, bg="#f7f7fb", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.assets = AssetCache(SpriteAtlas(), master=self.canvas)  # sprites are packed in a stage
+
+        # Transient items are pooled (hidden/shown) and all `after` timers go through one registry
+        self.timers = TimerRegistry(self.canvas)
+        self._init_scrolling()
+        self.animator = Animator(self.canvas, self.timers, enabled=animate)
+        self.pools = {
+            "toast": ItemPool(self.canvas, "text"),
+            "popup_rect": ItemPool(self.canvas, "rectangle"),
+            "popup_text": ItemPool(self.canvas, "text"),
+            "hex": ItemPool(self.canvas, "polygon"),
+            "hex_image": ItemPool(self.canvas, "image"),
+        }
+        self.toast_id = None
+        self.canvas.bind("<Destroy>", self._on_destroy, add="+")
 
         self.draw_grid()
-
-        start_box_width = S.CUBE_SIZE + 2 * S.START_AREA_PAD
-        start_box_height = 4 * S.CUBE_SIZE + 3 * S.CUBE_GAP + 2 * S.START_AREA_PAD
-        start_x = S.GRID_ORIGIN_X - S.GRID_PADDING - start_box_width
-        start_y = S.GRID_ORIGIN_Y
-        self._start_area_geom = (start_x, start_y, start_box_width, start_box_height)
-
+        self._start_area_geom = L.start_area
         self.draw_start_area()
         self.draw_card_area()
 
         # ----- ops tracks + tokens -----
         self._draw_ops_tracks()
 
-        asp_slots = self._ops_slot_starts(S.OPS_ASP_X)
-        ava_slots = self._ops_slot_starts(S.OPS_AVAIL_X)
+        asp_slots = L.ops_asp_slots
+        ava_slots = L.ops_avail_slots
 
         self.ops_available = S.OPS_START_AVAILABLE
         self.ops_aspirational = S.OPS_START_ASPIRATIONAL
+        self.ledger = TurnLedger()  # running cost/gating totals for the placed tokens
 
         self.cubes = []
         colors = ["#ff7f50", "#87cefa", "#98fb98", "#dda0dd"]
 
         # 1 available token (draggable)
         ax, ay = ava_slots[0]
-        self.cubes.append(Cube(self.canvas, 0, ax, ay, colors[0], locked=False))
+        self.cubes.append(Cube(self.canvas, 0, ax, ay, colors[0], size=L.token, locked=False,
+                               image=self._token_art(0), font=self.fonts.get(14, "bold"), layout=L))
 
         # 3 aspirational tokens (locked)
         for i in range(1, 1 + self.ops_aspirational):
             x, y = asp_slots[i - 1]
-            self.cubes.append(Cube(self.canvas, i, x, y, colors[i % len(colors)], locked=True))
+            self.cubes.append(Cube(self.canvas, i, x, y, colors[i % len(colors)], size=L.token, locked=True,
+                                   image=self._token_art(i), font=self.fonts.get(14, "bold"), layout=L))
 
-        self._draw_side_image()
-        if self.side_image_id is not None:
-            grid_w = S.GRID_COLS * S.CELL_SIZE
-            base_w = S.GRID_ORIGIN_X + grid_w + S.GRID_PADDING + self.side_image_dims[0] + S.GRID_PADDING
-            if int(float(self.canvas.cget("width"))) < base_w:
-                self.canvas.config(width=base_w)
+        for cube in self.cubes:
+            cube.on_cell_change = self._on_cube_cell_change
+            cube.animator = self.animator
 
-        # Right-hand panel + trackers + region panels
-        self._draw_trackers()
+        # The sprites, map, costs panel, trackers and region panels are construction stages
+        self._init_heatmap()
 
         # Funds
-        funds_x = self.trackers_left_x
-        funds_y = self.trackers_bottom_y + 20
-        self.funds = Funds(S.FUNDS_START, S.FUNDS_SERIES, self.canvas, funds_x, funds_y)
+        self.funds = Funds(S.FUNDS_START, S.FUNDS_SERIES, self.canvas, *L.funds,
+                           font=self.fonts.get(12, "bold"))
+        zobrist.attach(self)  # self.zobrist: incremental fingerprint of the rules state
 
         # Selection state / region UI
         self.selecting_regions = False
         self.selection_tasks = []
         self.region_hitboxes = {}
         self.region_hex_ids = {}
-        self._build_region_hitboxes()
-        self._render_region_markers()
 
         # Actions button
-        btn_pad_x = 12
-        btn_center_y = S.CARD_AREA_Y + S.CARD_AREA_H / 2
         self.take_action_button = tk.Button(self.root, text="Take Actions", command=self.take_actions)
         self.take_action_button_window = self.canvas.create_window(
-            S.CARD_AREA_X - btn_pad_x, btn_center_y, window=self.take_action_button, anchor="e"
+            *L.take_button, window=self.take_action_button, anchor="e"
         )
         self.canvas.itemconfigure(self.take_action_button_window, state="hidden")
+        self.turn_cost_id = self.canvas.create_text(
+            *L.turn_cost, text="", anchor="e", font=self.fonts.get(12, "bold"), fill="#111"
+        )
 
         # Input bindings
         self.canvas.bind("<Button-1>", self.on_mouse_down)
@@ -124,6 +172,30 @@ class Game(UIGridMixin, UICardsMixin, UICostsMixin, UITrackersMixin, UIRegionsMi
         self.canvas.bind("<ButtonRelease-1>", self.on_mouse_up)
         self.canvas.bind("<Button-1>", self.on_mouse_down, add="+")
         self.canvas.bind("<Button-1>", self._maybe_region_click, add="+")
+        self.canvas.bind("<Button-1>", self._maybe_card_choice_click, add="+")
+        self.canvas.bind("<Configure>", self._on_canvas_configure, add="+")
+
+        self._init_history()
+        self._init_autosave(autosave)
+        self._init_forecast()
+        self._init_remote()
+        self._request_forecast()
+        self._start_construction(t0, staged)
+
+    def _on_destroy(self, _event=None):
+        self.timers.cancel_all()
+        self.heatmap.close()
+        self.forecaster.close()
+        self.detach_host()
+        try:
+            if self.autosave is not None:
+                self._close_autosave()
+        finally:
+            if self.telemetry is not None:
+                self.telemetry.close()
+
+    def _token_art(self, idx):
+        return self.assets.get(f"tokens/C{idx + 1}", self.layout.token, self.layout.token)
 
     @property
     def selection_queue(self):
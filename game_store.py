@@ -0,0 +1,234 @@
+"""On-disk store of per-turn game records, read through np.memmap.
+
+A store is a directory:
+    meta.json      column names, strategy names, row counts
+    turns.bin      one fixed-width record per turn: game id + the telemetry
+                   schema (telemetry.turn_columns), games stored contiguously
+    games.bin      one record per game: seed, strategy, where its turns are,
+                   final funds/income and each region's peak chaos
+    idx_*.npy      secondary indexes (sorted row numbers, and for the
+                   per-game ones the sorted keys beside them), built on close
+
+Nothing is loaded whole: queries slice the memmaps, walk the indexes or
+scan a column chunk by chunk, so a sweep far larger than RAM stays usable.
+"""
+import json
+import os
+
+import numpy as np
+
+import settings as S
+from telemetry import region_slug, turn_columns, turn_record
+
+
+def max_chaos_field(region):
+    return f"{region_slug(region)}_max_chaos"
+
+
+def turn_dtype(columns):
+    return np.dtype([("game", "<i8")] + [(c, "<i4") for c in columns])
+
+
+def game_dtype(region_names=None):
+    fields = [("game", "<i8"), ("seed", "<i8"), ("strategy", "<i2"), ("config", "<i4"), ("first", "<i8"),
+              ("turns", "<i4"), ("final_funds", "<i4"), ("final_income", "<i4")]
+    fields += [(max_chaos_field(n), "<i4") for n in region_names or S.REGION_NAMES]
+    return np.dtype(fields)
+
+
+class TurnCollector:
+    """Telemetry sink that keeps one game's rows in memory (for StoreWriter.add_game)."""
+
+    def __init__(self):
+        self.rows = []
+
+    def record_turn(self, game, funds_before, charges, income):
+        self.rows.append(turn_record(game, funds_before, charges, income))
+
+
+class StoreWriter:
+    """Append games to a store (creating it if needed); indexes rebuild on close()."""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                self.meta = json.load(fh)
+            if self.meta["turn_columns"] != list(turn_columns()):
+                raise ValueError(f"{path} was written with a different turn schema")
+        else:
+            self.meta = {"turn_columns": list(turn_columns()), "region_names": list(S.REGION_NAMES),
+                         "strategies": [], "n_turns": 0, "n_games": 0}
+        self.turn_dtype = turn_dtype(self.meta["turn_columns"])
+        self.game_dtype = game_dtype(self.meta["region_names"])
+        self._turns = open(os.path.join(path, "turns.bin"), "ab")
+        self._games = open(os.path.join(path, "games.bin"), "ab")
+        # drop anything a crashed writer appended past the last committed meta.json
+        self._turns.truncate(self.meta["n_turns"] * self.turn_dtype.itemsize)
+        self._games.truncate(self.meta["n_games"] * self.game_dtype.itemsize)
+
+    def _strategy_code(self, name):
+        names = self.meta["strategies"]
+        if name not in names:
+            names.append(name)
+        return names.index(name)
+
+    def add_game(self, rows, strategy, seed=-1, config=-1) -> int:
+        """Append one game's turn rows (telemetry order); returns its game id.
+
+        config tags the sweep configuration the game was played under (-1: none).
+        """
+        game_id = self.meta["n_games"]
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, len(self.meta["turn_columns"]))
+        turns = np.empty(len(rows), dtype=self.turn_dtype)
+        turns["game"] = game_id
+        for i, col in enumerate(self.meta["turn_columns"]):
+            turns[col] = rows[:, i]
+
+        rec = np.zeros(1, dtype=self.game_dtype)
+        rec["game"], rec["seed"], rec["strategy"] = game_id, seed, self._strategy_code(strategy)
+        rec["config"] = config
+        rec["first"], rec["turns"] = self.meta["n_turns"], len(rows)
+        if len(rows):
+            rec["final_funds"] = turns["funds_after"][-1]
+            rec["final_income"] = turns["income"][-1]
+            for name in self.meta["region_names"]:
+                rec[max_chaos_field(name)] = turns[f"{region_slug(name)}_chaos"].max()
+
+        self._turns.write(turns.tobytes())
+        self._games.write(rec.tobytes())
+        self.meta["n_turns"] += len(rows)
+        self.meta["n_games"] += 1
+        return game_id
+
+    def close(self):
+        self._turns.close()
+        self._games.close()
+        tmp = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp, "w") as fh:
+            json.dump(self.meta, fh)
+        os.replace(tmp, os.path.join(self.path, "meta.json"))
+        build_indexes(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_indexes(path, chunk_rows=None):
+    """(Re)build idx_turn / idx_income / idx_strategy for the store at path."""
+    store = GameStore(path, indexes=False)
+    chunk = chunk_rows or S.STORE_CHUNK_ROWS
+    turns = store.turns
+
+    # turn number: counting sort done chunkwise, so only the output is big
+    counts = np.zeros(1, dtype=np.int64)
+    for lo in range(0, len(turns), chunk):
+        c = np.bincount(turns["turn"][lo:lo + chunk])
+        if len(c) > len(counts):
+            counts = np.pad(counts, (0, len(c) - len(counts)))
+        counts[:len(c)] += c
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    fill = starts[:-1].copy()
+    order = np.lib.format.open_memmap(os.path.join(path, "idx_turn.npy"), mode="w+",
+                                      dtype=np.int64, shape=(len(turns),))
+    for lo in range(0, len(turns), chunk):
+        vals = turns["turn"][lo:lo + chunk]
+        rows = np.arange(lo, lo + len(vals), dtype=np.int64)
+        for t in np.unique(vals):
+            hit = rows[vals == t]
+            order[fill[t]:fill[t] + len(hit)] = hit
+            fill[t] += len(hit)
+    order.flush()
+    del order
+    np.save(os.path.join(path, "idx_turn_starts.npy"), starts)
+
+    # per-game indexes: one small column each, saved with its keys in sorted order
+    # so a query binary-searches the keys instead of gathering the column
+    games = store.games
+    for name, col in (("income", "final_income"), ("strategy", "strategy")):
+        keys = np.asarray(games[col])
+        order = np.argsort(keys, kind="stable")
+        np.save(os.path.join(path, f"idx_{name}.npy"), order)
+        np.save(os.path.join(path, f"idx_{name}_keys.npy"), keys[order])
+
+
+class GameStore:
+    """Read side: memmapped tables plus index-backed queries."""
+
+    def __init__(self, path, indexes=True):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as fh:
+            self.meta = json.load(fh)
+        self.strategies = self.meta["strategies"]
+        self.turns = self._memmap("turns.bin", turn_dtype(self.meta["turn_columns"]), self.meta["n_turns"])
+        self.games = self._memmap("games.bin", game_dtype(self.meta["region_names"]), self.meta["n_games"])
+        if indexes:
+            load = lambda name: np.load(os.path.join(path, name), mmap_mode="r")
+            self._idx_turn = load("idx_turn.npy")
+            self._idx_turn_starts = load("idx_turn_starts.npy")
+            self._idx_income = load("idx_income.npy")
+            self._idx_income_keys = load("idx_income_keys.npy")
+            self._idx_strategy = load("idx_strategy.npy")
+            self._idx_strategy_keys = load("idx_strategy_keys.npy")
+
+    def _memmap(self, name, dtype, n):
+        if n == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.path, name), dtype=dtype, mode="r", shape=(n,))
+
+    def __len__(self):
+        return len(self.games)
+
+    # --- game id ---
+    def game_turns(self, game_id):
+        """The game's turn records (a memmap view, nothing copied)."""
+        g = self.games[game_id]  # ids are dense row numbers
+        return self.turns[g["first"]:g["first"] + g["turns"]]
+
+    # --- turn number ---
+    def turn_rows(self, turn):
+        """Row numbers (into .turns) of every game's record for `turn`."""
+        starts = self._idx_turn_starts
+        if not 0 <= turn < len(starts) - 1:
+            return np.empty(0, dtype=np.int64)
+        return self._idx_turn[starts[turn]:starts[turn + 1]]
+
+    # --- strategy ---
+    def games_for_strategy(self, name):
+        if name not in self.strategies:
+            return np.empty(0, dtype=np.int64)
+        code = self.strategies.index(name)
+        lo, hi = np.searchsorted(self._idx_strategy_keys, [code, code + 1])
+        return np.sort(np.asarray(self._idx_strategy[lo:hi]))
+
+    # --- final income ---
+    def games_by_income(self, lo=None, hi=None):
+        """Game ids with lo <= final income <= hi (either bound optional)."""
+        incomes = self._idx_income_keys
+        a = 0 if lo is None else np.searchsorted(incomes, lo, side="left")
+        b = len(incomes) if hi is None else np.searchsorted(incomes, hi, side="right")
+        return np.sort(np.asarray(self._idx_income[a:b]))
+
+    # --- ad-hoc ---
+    def games_where(self, predicate, chunk_rows=None):
+        """Game ids whose games-table record satisfies predicate(chunk) -> bool mask."""
+        return self._scan(self.games, predicate, chunk_rows)
+
+    def turns_where(self, predicate, chunk_rows=None):
+        """Row numbers of turn records satisfying predicate(chunk) -> bool mask."""
+        return self._scan(self.turns, predicate, chunk_rows)
+
+    def games_hitting_chaos_max(self, region):
+        col = max_chaos_field(region)
+        return self.games_where(lambda g: g[col] >= S.CHAOS_MAX)
+
+    @staticmethod
+    def _scan(table, predicate, chunk_rows):
+        chunk = chunk_rows or S.STORE_CHUNK_ROWS
+        hits = [np.flatnonzero(predicate(table[lo:lo + chunk])) + lo for lo in range(0, len(table), chunk)]
+        return np.concatenate(hits) if hits else np.empty(0, dtype=np.int64)
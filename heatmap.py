@@ -0,0 +1,135 @@
+"""Region heat maps composited over the world map.
+
+The map has no hand-drawn mask, so region_labels() derives one: every
+non-background pixel is given to the region box (S.REGION_BBOXES_FRAC) it
+falls in, overlaps going to the box whose centre is nearest. composite()
+then tints each region in one vectorised pass -- the per-region weights
+are looked up through the label array, never per pixel in Python.
+
+HeatmapCompositor does that work on a worker thread and memoises results
+by (map size, metric, region values), so a click that leaves the shown
+metric unchanged costs a dict lookup.
+"""
+import queue
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+import settings as S
+
+METRICS = ("chaos", "reputation", "power")  # Region attributes
+
+
+def region_labels(rgb, bboxes=None, names=None):
+    """(h, w) int8 array: index into `names` of each map pixel's region, -1 for background."""
+    bboxes = bboxes or S.REGION_BBOXES_FRAC
+    names = names or S.REGION_NAMES
+    h, w = rgb.shape[:2]
+    land = rgb.min(axis=2) < S.HEATMAP_LAND_THRESHOLD
+    xs = (np.arange(w, dtype=np.float32) + 0.5) / w
+    ys = (np.arange(h, dtype=np.float32) + 0.5) / h
+    labels = np.full((h, w), -1, dtype=np.int8)
+    best = np.full((h, w), np.inf, dtype=np.float32)
+    for i, name in enumerate(names):
+        x0, y0, x1, y1 = bboxes[name]
+        # distance to the box centre in box-sized units, so a small box wins its own middle
+        dx = ((xs - (x0 + x1) / 2) / (x1 - x0)) ** 2
+        dy = ((ys - (y0 + y1) / 2) / (y1 - y0)) ** 2
+        dx[(xs < x0) | (xs >= x1)] = np.inf
+        dy[(ys < y0) | (ys >= y1)] = np.inf
+        dist = dy[:, None] + dx[None, :]
+        take = land & (dist < best)
+        labels[take] = i
+        best[take] = dist[take]
+    return labels
+
+
+def region_values(regions, metric) -> tuple:
+    """The metric for every region, in S.REGION_NAMES order (hashable)."""
+    return tuple(getattr(regions[name], metric) for name in S.REGION_NAMES)
+
+
+def metric_weights(metric, values):
+    """0..1 tint strength per region: chaos against S.CHAOS_MAX, the rest against the leader."""
+    vals = np.asarray(values, dtype=np.float32)
+    vmax = S.CHAOS_MAX if metric == "chaos" else max(float(vals.max(initial=0)), 1.0)
+    return np.clip(vals / vmax, 0.0, 1.0)
+
+
+def composite(base, labels, weights, color, alpha=None):
+    """`base` (h, w, 3 uint8) with `color` blended into each region by its weight."""
+    alpha = S.HEATMAP_ALPHA if alpha is None else alpha
+    # label -1 indexes the trailing 0, so background pixels are left alone
+    w = np.append(np.asarray(weights, dtype=np.float32) * alpha, np.float32(0))[labels]
+    out = base.astype(np.float32)
+    out += (np.asarray(color, dtype=np.float32) - out) * w[..., None]
+    return out.astype(np.uint8)
+
+
+class HeatmapCompositor:
+    """Builds overlays off the calling thread.
+
+    request() answers from the memo at once, or queues the work and
+    returns None; finished (key, image) pairs arrive on `results`.
+    """
+
+    def __init__(self, cache_size=None):
+        self.cache_size = cache_size or S.HEATMAP_CACHE
+        self._cache = OrderedDict()  # key -> (h, w, 3) uint8
+        self._labels = (None, None)  # (map size, labels) for the map last seen
+        self._lock = threading.Lock()
+        self._requests = queue.Queue()
+        self.results = queue.Queue()
+        self.composited = 0  # overlays actually computed (memo misses)
+        self._thread = threading.Thread(target=self._run, name="heatmap", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def key(base, metric, values):
+        return (base.shape[:2], metric, tuple(values))
+
+    def request(self, base, metric, values):
+        key = self.key(base, metric, values)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        self._requests.put((key, base, metric, values))
+        return None
+
+    def _labels_for(self, base):
+        size, labels = self._labels
+        if size != base.shape[:2]:
+            labels = region_labels(base)
+            self._labels = (base.shape[:2], labels)
+        return labels
+
+    def _run(self):
+        while True:
+            item = self._requests.get()
+            # only the newest request matters; older ones were superseded by later clicks
+            while item is not None:
+                try:
+                    nxt = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                item = nxt
+            if item is None:
+                break
+            key, base, metric, values = item
+            with self._lock:
+                img = self._cache.get(key)
+            if img is None:
+                img = composite(base, self._labels_for(base), metric_weights(metric, values),
+                                S.HEATMAP_COLORS[metric])
+                self.composited += 1
+                with self._lock:
+                    self._cache[key] = img
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            self.results.put((key, img))
+
+    def close(self):
+        self._requests.put(None)
+        self._thread.join()
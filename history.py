@@ -0,0 +1,94 @@
+"""Undo/redo history with structurally shared snapshots.
+
+A Snapshot is a tree of tuples. capture() reuses any sub-tuple of the
+previous snapshot that did not change, so a step that only moves a cube
+stores a new `board` tuple and shares funds, regions, hand and decks with
+its neighbour, and a draw copies only the pile it was drawn from. The
+history is a pair of bounded stacks; the top of the undo stack is always
+the current state.
+"""
+from collections import deque
+from typing import NamedTuple
+
+import settings as S
+
+
+class Snapshot(NamedTuple):
+    turn: int
+    funds: tuple     # (value, ((series key, uses), ...))
+    trackers: tuple  # (compute, model, ops available, ops aspirational)
+    regions: tuple   # one (rep, power, chaos, presence) per S.REGION_NAMES
+    hand: tuple
+    decks: tuple     # remaining ids per S.CARD_TYPES
+    board: tuple     # one (cube idx, cell or None, locked) per cube
+    pending: tuple   # (card offers, selection tasks, selecting regions)
+
+
+def _share(new, old):
+    return old if old is not None and (old is new or old == new) else new
+
+
+def capture(game, prev=None) -> Snapshot:
+    p = prev or Snapshot(*([None] * len(Snapshot._fields)))
+    old_regions = p.regions or (None,) * len(S.REGION_NAMES)
+    regions = tuple(
+        _share((r.reputation, r.power, r.chaos, r.player_presence), old)
+        for r, old in zip((game.regions[n] for n in S.REGION_NAMES), old_regions)
+    )
+    # Deck.ids() hands back the same tuple while a pile is unchanged, so sharing is per type and O(1)
+    decks = tuple(_share(new, old) for new, old in zip(game.deck.snapshot(), p.decks or (None,) * len(S.CARD_TYPES)))
+    pending = (
+        tuple((t, tuple(ids)) for t, ids in game.card_offers),
+        tuple((task["type"], task["requires_presence"]) for task in game.selection_tasks),
+        bool(game.selecting_regions),
+    )
+    return Snapshot(
+        turn=game.turn,
+        funds=_share((game.funds.value, tuple(game.funds.counters.items())), p.funds),
+        trackers=_share((game.compute_idx, game.model_idx, game.ops_available, game.ops_aspirational), p.trackers),
+        regions=_share(regions, p.regions),
+        hand=_share(tuple(game.hand), p.hand),
+        decks=_share(decks, p.decks),
+        board=_share(tuple((c.idx, c.current_cell, c.locked) for c in game.cubes), p.board),
+        pending=_share(pending, p.pending),
+    )
+
+
+class History:
+    def __init__(self, limit=None):
+        self._undo = deque(maxlen=(limit or S.UNDO_LIMIT) + 1)  # +1: the current state
+        self._redo = []
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def current(self):
+        return self._undo[-1] if self._undo else None
+
+    def commit(self, snap) -> bool:
+        """Record `snap` as the new current state; False if nothing changed."""
+        if snap == self.current:
+            return False
+        self._undo.append(snap)
+        self._redo.clear()
+        return True
+
+    def can_undo(self):
+        return len(self._undo) > 1
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo(self):
+        """Step back; returns the snapshot to restore (None if at the start)."""
+        if not self.can_undo():
+            return None
+        self._redo.append(self._undo.pop())
+        return self._undo[-1]
+
+    def redo(self):
+        if not self._redo:
+            return None
+        self._undo.append(self._redo.pop())
+        return self._undo[-1]
@@ -0,0 +1,399 @@
+"""Many headless games behind one local socket.
+
+GameHost runs each session (a rules.SimGame) inside one asyncio loop and
+serves them over TCP or a Unix socket, so dozens of hot-seat and bot
+matches share a process and anyone can watch a game from another window.
+A bot session plays itself on an asyncio task, one turn every
+S.HOST_BOT_TURN_MS; a hot-seat session waits for its players' moves.
+
+Messages are compact JSON objects, each framed by a 4-byte big-endian
+length. Client to host:
+
+    {"op": "join", "session": "s1", "seed": 3, "bot": "economy", "turns": 20, "watch": false}
+    {"op": "place", "cells": [[1, 1], [0, 0]], "budget": 6}
+    {"op": "select", "region": "Europe"}
+    {"op": "leave"}
+
+Host to client:
+
+    {"op": "state", "session": "s1", "state": {...}}     full replay.snapshot(), on join
+    {"op": "prompt", "tasks": [...], "candidates": [...]} the region picks still owed
+    {"op": "diff", "turn": 4, "income": 3, "kept": [...], "set": {...}}  changed fields
+    {"op": "error", "msg": "..."}
+
+Only "seed", "bot", "turns" and "watch" are optional; they take effect
+when the join creates the session. A placement's region picks come one
+"select" at a time, answering each "prompt"; offered cards are settled on
+the host, keeping the cheapest one that costs no more than "budget" (none
+when it is left out). Every member of a session gets the "diff" of each
+turn, players and watchers alike.
+
+    python host.py unix:/tmp/apocalypser.sock --bots 24
+    python main.py --connect unix:/tmp/apocalypser.sock --session bot-3 --watch
+"""
+import argparse
+import asyncio
+import json
+import queue
+import socket
+import struct
+import threading
+
+import settings as S
+from replay import snapshot
+from rules import SimGame, selection_tasks
+from strategies import STRATEGIES, Strategy, get_strategy
+
+HEADER = struct.Struct(">I")
+
+
+def encode(msg) -> bytes:
+    body = json.dumps(msg, separators=(",", ":")).encode()
+    return HEADER.pack(len(body)) + body
+
+
+def decode(body: bytes) -> dict:
+    msg = json.loads(body)
+    if not isinstance(msg, dict) or "op" not in msg:
+        raise ValueError("a message is an object with an 'op'")
+    return msg
+
+
+def _frame_size(header: bytes) -> int:
+    (size,) = HEADER.unpack(header)
+    if size > S.HOST_MAX_FRAME:
+        raise ValueError(f"frame of {size} bytes exceeds {S.HOST_MAX_FRAME}")
+    return size
+
+
+async def read_message(reader) -> dict:
+    """The next message on an asyncio stream (IncompleteReadError at EOF)."""
+    size = _frame_size(await reader.readexactly(HEADER.size))
+    return decode(await reader.readexactly(size))
+
+
+def parse_address(address):
+    """"unix:PATH" -> ("unix", PATH); "HOST:PORT" or ":PORT" -> ("tcp", (HOST, PORT))."""
+    if address.startswith("unix:"):
+        return "unix", address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"expected unix:PATH or HOST:PORT, got {address!r}")
+    return "tcp", (host or "127.0.0.1", int(port))
+
+
+def state_diff(old, new) -> dict:
+    return {k: v for k, v in new.items() if old.get(k) != v}
+
+
+class _Answers(Strategy):
+    """The picks a client made for one turn, fed back to SimGame.play_turn."""
+
+    def __init__(self, regions, budget):
+        self.regions = list(regions)
+        self.budget = budget
+
+    def pick_region(self, game, task_type, candidates):
+        return self.regions.pop(0)
+
+    def keep_card(self, game, offered):
+        if self.budget is None:
+            return None
+        costs = game.catalog.costs
+        affordable = [i for i, cid in enumerate(offered) if costs[cid] <= min(self.budget, game.funds.value)]
+        return min(affordable, key=lambda i: costs[offered[i]]) if affordable else None
+
+
+class _Plan:
+    """A placement waiting for its region picks."""
+
+    __slots__ = ("cells", "tasks", "picks", "budget", "presence", "owner")
+
+    def __init__(self, game, cells, budget, owner):
+        self.cells, self.budget, self.owner = cells, budget, owner
+        self.tasks = selection_tasks(cells)
+        self.picks = []
+        self.presence = [r.name for r in game.regions.with_presence()]
+
+    def candidates(self):
+        if self.tasks[len(self.picks)]["requires_presence"]:
+            return list(self.presence)
+        return list(S.REGION_NAMES)
+
+    def pick(self, name):
+        if self.tasks[len(self.picks)]["type"] == "add_presence" and name not in self.presence:
+            self.presence.append(name)  # later picks this turn may need it, as in play_turn
+        self.picks.append(name)
+
+    @property
+    def done(self):
+        return len(self.picks) == len(self.tasks)
+
+    def prompt(self):
+        return {"op": "prompt", "tasks": self.tasks[len(self.picks):], "candidates": self.candidates()}
+
+
+class Session:
+    """One game and the connections attached to it."""
+
+    def __init__(self, name, seed=None, bot=None, turns=None):
+        self.name = name
+        self.game = SimGame(seed)
+        self.bot = get_strategy(bot) if bot else None
+        self.turns = S.SIM_TURNS if turns is None else turns
+        self.members = set()
+        self.state = snapshot(self.game)
+        self.plan = None
+        self.task = None  # the bot's asyncio task
+
+    def play(self, cells, strategy) -> dict:
+        """Resolve a turn; returns the "diff" message for it."""
+        result = self.game.play_turn(cells, strategy)
+        state = snapshot(self.game)
+        diff, self.state = state_diff(self.state, state), state
+        return {"op": "diff", "turn": self.game.turn, "income": result["income"],
+                "kept": result["kept"], "set": diff}
+
+
+class _Conn:
+    __slots__ = ("writer", "session", "watch", "task")
+
+    def __init__(self, writer):
+        self.writer, self.session, self.watch = writer, None, False
+        self.task = asyncio.current_task()
+
+
+class GameHost:
+    def __init__(self, bot_turn_ms=None):
+        self.bot_turn_ms = S.HOST_BOT_TURN_MS if bot_turn_ms is None else bot_turn_ms
+        self.sessions = {}
+        self.dropped = 0  # connections cut for falling S.HOST_SEND_BUFFER bytes behind
+        self._server = None
+        self._conns = set()
+
+    async def start(self, address):
+        kind, where = parse_address(address)
+        if kind == "unix":
+            self._server = await asyncio.start_unix_server(self._serve, path=where)
+        else:
+            self._server = await asyncio.start_server(self._serve, *where)
+        return self.address
+
+    @property
+    def address(self):
+        sockname = self._server.sockets[0].getsockname()
+        return f"unix:{sockname}" if isinstance(sockname, str) else f"{sockname[0]}:{sockname[1]}"
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        for session in self.sessions.values():
+            if session.task is not None:
+                session.task.cancel()
+        conns = list(self._conns)
+        for conn in conns:
+            conn.writer.close()  # their readers see EOF and the handlers return
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        tasks = [s.task for s in self.sessions.values() if s.task] + [c.task for c in conns]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def session(self, name, seed=None, bot=None, turns=None) -> Session:
+        """The session called `name`, created (and its bot started) on first use."""
+        session = self.sessions.get(name)
+        if session is None:
+            session = self.sessions[name] = Session(name, seed, bot, turns)
+            if session.bot is not None:
+                session.task = asyncio.get_running_loop().create_task(self._run_bot(session))
+        return session
+
+    async def _run_bot(self, session):
+        game, strategy = session.game, session.bot
+        while game.turn < session.turns:
+            await asyncio.sleep(self.bot_turn_ms / 1000)
+            self._broadcast(session, session.play(strategy.place(game), strategy))
+
+    # --- connections ---
+
+    def _send(self, conn, msg):
+        self._write(conn, encode(msg))
+
+    def _broadcast(self, session, msg):
+        frame = encode(msg)  # once for every member
+        for conn in list(session.members):
+            self._write(conn, frame)
+
+    def _write(self, conn, frame):
+        writer = conn.writer
+        if writer.is_closing():
+            return
+        writer.write(frame)
+        if writer.transport.get_write_buffer_size() > S.HOST_SEND_BUFFER:
+            self.dropped += 1
+            writer.close()  # a stalled watcher must not hold every frame it missed
+
+    async def _serve(self, reader, writer):
+        conn = _Conn(writer)
+        self._conns.add(conn)
+        try:
+            while True:
+                try:
+                    msg = await read_message(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except ValueError as e:
+                    self._send(conn, {"op": "error", "msg": str(e)})
+                    break  # the stream is out of step; there is no resynchronising it
+                try:
+                    self._handle(conn, msg)
+                except (KeyError, TypeError, ValueError) as e:
+                    self._send(conn, {"op": "error", "msg": f"bad {msg.get('op')!r}: {e}"})
+                try:
+                    await writer.drain()
+                except ConnectionError:
+                    break
+        finally:
+            self._leave(conn)
+            self._conns.discard(conn)
+            writer.close()
+
+    def _leave(self, conn):
+        if conn.session is not None:
+            conn.session.members.discard(conn)
+            if conn.session.plan is not None and conn.session.plan.owner is conn:
+                conn.session.plan = None
+            conn.session = None
+
+    def _handle(self, conn, msg):
+        op = msg["op"]
+        if op == "join":
+            self._leave(conn)
+            session = self.session(str(msg["session"]), msg.get("seed"), msg.get("bot"), msg.get("turns"))
+            conn.session, conn.watch = session, bool(msg.get("watch"))
+            session.members.add(conn)
+            self._send(conn, {"op": "state", "session": session.name, "state": session.state})
+            if session.plan is not None and session.plan.owner is conn:
+                self._send(conn, session.plan.prompt())
+        elif op == "leave":
+            self._leave(conn)
+        elif op == "place":
+            session = self._playing(conn)
+            if session.plan is not None:
+                raise ValueError("the last placement still needs its regions")
+            cells = [tuple(cell) for cell in msg["cells"]]
+            if not session.game.can_take(cells):
+                raise ValueError(f"illegal placement {cells}")
+            session.plan = _Plan(session.game, cells, msg.get("budget"), conn)
+            self._advance(conn, session)
+        elif op == "select":
+            session = self._playing(conn)
+            plan = session.plan
+            if plan is None or plan.owner is not conn:
+                raise ValueError("no region pick is pending")
+            if msg["region"] not in plan.candidates():
+                self._send(conn, {"op": "error", "msg": f"{msg['region']!r} cannot be picked"})
+                self._send(conn, plan.prompt())
+                return
+            plan.pick(msg["region"])
+            self._advance(conn, session)
+        else:
+            raise ValueError(f"unknown op {op!r}")
+
+    def _playing(self, conn) -> Session:
+        session = conn.session
+        if session is None:
+            raise ValueError("join a session first")
+        if conn.watch or session.bot is not None:
+            raise ValueError("watchers and bot sessions cannot move")
+        return session
+
+    def _advance(self, conn, session):
+        plan = session.plan
+        if not plan.done:
+            self._send(conn, plan.prompt())
+            return
+        session.plan = None
+        self._broadcast(session, session.play(plan.cells, _Answers(plan.picks, plan.budget)))
+
+
+class HostClient:
+    """Blocking client for one connection; messages from the host land on `inbox`.
+
+    A reader thread decodes frames as they arrive, so a Tk window can poll
+    `inbox` from a timer. None on `inbox` means the connection closed.
+    """
+
+    def __init__(self, address, timeout=None):
+        kind, where = parse_address(address)
+        family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(where)
+        self.sock.settimeout(None)
+        self.inbox = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="host-client", daemon=True)
+        self._thread.start()
+
+    def send(self, msg):
+        with self._lock:
+            self.sock.sendall(encode(msg))
+
+    def _recv_exact(self, n):
+        buf = bytearray()
+        while len(buf) < n:
+            chunk = self.sock.recv(n - len(buf))
+            if not chunk:
+                raise EOFError
+            buf += chunk
+        return bytes(buf)
+
+    def _run(self):
+        try:
+            while True:
+                size = _frame_size(self._recv_exact(HEADER.size))
+                self.inbox.put(decode(self._recv_exact(size)))
+        except (EOFError, OSError, ValueError):
+            pass
+        self.inbox.put(None)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self._thread.join()
+
+
+async def _main(args):
+    host = GameHost(args.bot_turn_ms)
+    print(f"serving on {await host.start(args.address)}")
+    for i in range(args.bots):
+        host.session(f"bot-{i}", seed=args.seed + i, bot=args.strategy, turns=args.turns)
+    try:
+        await host.serve_forever()
+    finally:
+        await host.close()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Host headless games over a local socket")
+    ap.add_argument("address", help="unix:PATH or HOST:PORT (port 0 picks a free one)")
+    ap.add_argument("--bots", type=int, default=0, help="bot matches to start, named bot-0 .. bot-N-1")
+    ap.add_argument("--strategy", default="economy", choices=STRATEGIES)
+    ap.add_argument("--seed", type=int, default=0, help="bot-i plays seed + i")
+    ap.add_argument("--turns", type=int, default=None, help=f"turns per bot match (default {S.SIM_TURNS})")
+    ap.add_argument("--bot-turn-ms", type=int, default=None,
+                    help=f"pause between bot turns (default {S.HOST_BOT_TURN_MS})")
+    args = ap.parse_args(argv)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
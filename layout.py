@@ -0,0 +1,300 @@
+"""Window-size driven geometry table.
+
+The constants in settings.py describe the board in design pixels (scale 1.0).
+build_layout() derives every rect, slot and anchor the UI uses once, scales
+the lot by a single factor and freezes it. Mixins and Cube index into the
+Layout instead of re-deriving positions from S at each call site, and
+headless renderers can use the same table without a Tk window.
+"""
+from dataclasses import dataclass, field
+
+import tkinter.font as tkfont
+
+import settings as S
+
+
+@dataclass(frozen=True)
+class Layout:
+    scale: float
+    width: int
+    height: int
+
+    # grid; cells are indexed row * GRID_COLS + col
+    grid_x: float
+    grid_y: float
+    cell: float
+    grid_w: float
+    grid_h: float
+    grid_title: tuple
+    cell_rects: tuple
+    cell_centers: tuple
+    token: float
+
+    # start area (x, y, w, h) and ops tracks; slots are token top-left corners
+    start_area: tuple
+    ops_titles: tuple          # (aspirational (x, y), available (x, y))
+    ops_asp_rect: tuple
+    ops_avail_rect: tuple
+    ops_asp_slots: tuple
+    ops_avail_slots: tuple
+
+    # hand / card area
+    card_x: float
+    card_y: float
+    card_w: float
+    card_h: float
+    card_rect: tuple
+    hand_title: tuple
+    deck_text: tuple
+    hand_full_text: tuple
+    hand_slots: tuple          # (x0, y0, x1, y1) per hand index
+    offer_title: tuple
+    offer_cards: tuple         # one rect per offered card
+    offer_pass: tuple
+    take_button: tuple
+    turn_cost: tuple           # "this turn costs $X" readout, right-aligned under the button
+    toast: tuple
+
+    # right-hand column: map, costs, trackers, region panels, funds
+    side_x: float
+    side_y: float
+    side_w: float
+    side_h: float
+    region_hitboxes: tuple     # per S.REGION_NAMES index
+    region_markers: tuple      # hex centre per region
+    costs_title: tuple
+    costs_rect: tuple
+    costs_lines: tuple         # (x, y) per costs panel line
+    tracker_rows: tuple        # per row: ((label x, y), (box rect, ...))
+    regions_title: tuple
+    panel_rects: tuple         # per S.REGION_NAMES index
+    panel_text: tuple
+    funds: tuple
+    forecast_rect: tuple       # what-if panel under the funds line
+    forecast_text: tuple
+    placeholders: tuple        # rects shown until staged construction draws them: (map, costs, panels)
+
+    popup_center: tuple
+    popup_wrap: float
+
+    side_aspect: float = field(default=0.0, repr=False)
+
+    def px(self, v):
+        """Scale a design-pixel length."""
+        return v * self.scale
+
+    def cell_index(self, row, col):
+        return row * S.GRID_COLS + col
+
+    def cell_at(self, x, y):
+        """(row, col) under a canvas point, or None; O(1)."""
+        if not (self.grid_x <= x < self.grid_x + self.grid_w and self.grid_y <= y < self.grid_y + self.grid_h):
+            return None
+        col = int((x - self.grid_x) // self.cell)
+        row = int((y - self.grid_y) // self.cell)
+        return (row, col) if (0 <= row < S.GRID_ROWS and 0 <= col < S.GRID_COLS) else None
+
+    def cells_in(self, x0, y0, x1, y1):
+        """(row0, row1, col0, col1), half-open, of the cells overlapping a canvas rect; O(1)."""
+        def span(lo, hi, origin, n):
+            a = int((lo - origin) // self.cell)
+            b = int((hi - origin) // self.cell) + 1
+            return max(0, min(a, n)), max(0, min(b, n))
+        r0, r1 = span(y0, y1, self.grid_y, S.GRID_ROWS)
+        c0, c1 = span(x0, x1, self.grid_x, S.GRID_COLS)
+        return r0, r1, c0, c1
+
+
+def costs_line_pads():
+    """Extra top padding per costs-panel line (section spacers get 6px).
+
+    Lines: model header + one per model step, spacer, ops header + one per
+    ops total, spacer, presence header + one per region cost.
+    """
+    return ((0,) * (1 + len(S.MODEL_STEPS)) + (6,)
+            + (0,) * (1 + len(S.SCALING_OPERATION_COSTS)) + (6,)
+            + (0,) * (1 + len(S.SCALING_PRESENCE_COSTS)))
+
+
+def _scaled(v, s):
+    if isinstance(v, tuple):
+        return tuple(_scaled(x, s) for x in v)
+    return v * s
+
+
+def _rect(x, y, w, h):
+    return (x, y, x + w, y + h)
+
+
+def _design_tables(side_aspect):
+    """Every position in design pixels (scale 1)."""
+    t = {}
+    gx, gy, cs = S.GRID_ORIGIN_X, S.GRID_ORIGIN_Y, S.CELL_SIZE
+    grid_w, grid_h = S.GRID_COLS * cs, S.GRID_ROWS * cs
+    t.update(grid_x=gx, grid_y=gy, cell=cs, grid_w=grid_w, grid_h=grid_h, token=S.TOKEN_SIZE)
+    t["grid_title"] = (gx + grid_w / 2, 20)
+    cells = [(r, c) for r in range(S.GRID_ROWS) for c in range(S.GRID_COLS)]
+    t["cell_rects"] = tuple(_rect(gx + c * cs, gy + r * cs, cs, cs) for r, c in cells)
+    t["cell_centers"] = tuple((gx + c * cs + cs / 2, gy + r * cs + cs / 2) for r, c in cells)
+
+    # --- left column ---
+    start_w = S.CUBE_SIZE + 2 * S.START_AREA_PAD
+    start_h = 4 * S.CUBE_SIZE + 3 * S.CUBE_GAP + 2 * S.START_AREA_PAD
+    t["start_area"] = (gx - S.GRID_PADDING - start_w, gy, start_w, start_h)
+
+    def track(left_x):
+        slots, y = [], S.OPS_TRACK_TOP + S.OPS_TRACK_PAD + S.OPS_DISC_R
+        for _ in range(S.OPS_MAX_TOKENS):
+            slots.append((left_x + S.OPS_TRACK_W / 2 - S.OPS_DISC_R, y - S.OPS_DISC_R))
+            y += 2 * S.OPS_DISC_R + S.OPS_DISC_GAP
+        return _rect(left_x, S.OPS_TRACK_TOP, S.OPS_TRACK_W, S.OPS_TRACK_H), tuple(slots)
+
+    t["ops_asp_rect"], t["ops_asp_slots"] = track(S.OPS_ASP_X)
+    t["ops_avail_rect"], t["ops_avail_slots"] = track(S.OPS_AVAIL_X)
+    t["ops_titles"] = tuple((x + S.OPS_TRACK_W / 2, S.OPS_TRACK_TOP - 14) for x in (S.OPS_ASP_X, S.OPS_AVAIL_X))
+
+    # --- hand / card area ---
+    cx, cy, cw, ch = S.CARD_AREA_X, S.CARD_AREA_Y, S.CARD_AREA_W, S.CARD_AREA_H
+    t.update(card_x=cx, card_y=cy, card_w=cw, card_h=ch, card_rect=_rect(cx, cy, cw, ch))
+    t["hand_title"] = (gx + 100, cy - 8)
+    t["deck_text"] = (cx + cw - 10, cy + 16)
+    t["hand_full_text"] = (cx + 10, cy + 16)
+    hand = []
+    for i in range(S.HAND_LIMIT):
+        r, c = divmod(i, S.HAND_COLS)
+        hand.append(_rect(cx + 16 + c * (S.HAND_SLOT_W + S.HAND_SLOT_GAP_X),
+                          cy + S.HAND_TOP_PAD + r * (S.HAND_SLOT_H + S.HAND_SLOT_GAP_Y),
+                          S.HAND_SLOT_W, S.HAND_SLOT_H))
+    t["hand_slots"] = tuple(hand)
+    offer_w, offer_h, offer_gap, offer_top = 130, 170, 16, cy + 40
+    t["offer_title"] = (cx + 16, cy + 18)
+    t["offer_cards"] = tuple(_rect(cx + 16 + i * (offer_w + offer_gap), offer_top, offer_w, offer_h)
+                             for i in range(S.CARD_DRAW_COUNT))
+    t["offer_pass"] = _rect(cx + 16 + S.CARD_DRAW_COUNT * (offer_w + offer_gap), offer_top, 80, 40)
+    t["take_button"] = (cx - 12, cy + ch / 2)
+    t["turn_cost"] = (cx - 12, cy + ch / 2 + 30)
+    t["toast"] = (cx + cw / 2, cy - 8)
+
+    # --- right column ---
+    side_x, side_y = gx + grid_w + S.GRID_PADDING, gy
+    side_w = max(1, int(round(grid_h * side_aspect))) if side_aspect else 0
+    t.update(side_x=side_x, side_y=side_y, side_w=side_w, side_h=grid_h)
+    hit = []
+    for name in S.REGION_NAMES:
+        fx0, fy0, fx1, fy1 = S.REGION_BBOXES_FRAC[name]
+        hit.append((side_x + fx0 * side_w, side_y + fy0 * grid_h, side_x + fx1 * side_w, side_y + fy1 * grid_h))
+    t["region_hitboxes"] = tuple(hit)
+    t["region_markers"] = tuple(((x0 + x1) / 2, (y0 + y1) / 2) for x0, y0, x1, y1 in hit)
+
+    costs_x = side_x + side_w + S.GRID_PADDING
+    t["costs_title"] = (costs_x, gy)
+    rect_top = gy + 22
+    line_h, y, lines = 18 + 4, rect_top + S.COSTS_PANEL_PAD, []
+    for pad_top in costs_line_pads():
+        y += pad_top
+        lines.append((costs_x + S.COSTS_PANEL_PAD, y))
+        y += line_h
+    t["costs_lines"] = tuple(lines)
+    t["costs_rect"] = (costs_x, rect_top, costs_x + S.COSTS_PANEL_W, y + S.COSTS_PANEL_PAD)
+
+    # trackers sit under whichever is taller: the map or the costs panel
+    top_y = max(t["costs_rect"][3], side_y + grid_h) + 20
+    n_steps = max(len(S.COMPUTE_STEPS), len(S.MODEL_STEPS))
+    rows = []
+    for row in range(2):
+        ry = top_y + row * S.TRACKER_ROW_H
+        x0 = side_x + S.TRACKER_LABEL_W
+        boxes = tuple(_rect(x0 + i * (S.TRACKER_BOX_W + S.TRACKER_BOX_GAP), ry - 14, S.TRACKER_BOX_W, 28)
+                      for i in range(n_steps))
+        rows.append(((side_x, ry), boxes))
+    t["tracker_rows"] = tuple(rows)
+    trackers_right = rows[0][1][-1][2]
+
+    panels_title_y = top_y + 2 * S.TRACKER_ROW_H
+    t["regions_title"] = (side_x, panels_title_y)
+    panels, texts = [], []
+    for idx in range(len(S.REGION_NAMES)):
+        r, c = divmod(idx, S.REGION_PANEL_COLS)
+        px = side_x + c * (S.REGION_PANEL_W + S.REGION_PANEL_GAP_X)
+        py = panels_title_y + 24 + r * (S.REGION_PANEL_H + S.REGION_PANEL_GAP_Y)
+        panels.append(_rect(px, py, S.REGION_PANEL_W, S.REGION_PANEL_H))
+        texts.append((px + 10, py + 10))
+    t["panel_rects"], t["panel_text"] = tuple(panels), tuple(texts)
+    panels_right = max(p[2] for p in panels)
+    panels_bottom = max(p[3] for p in panels)
+    t["funds"] = (side_x, panels_bottom + 20)
+    forecast_h = (S.FORECAST_TURNS + 1) * S.FORECAST_LINE_H + 2 * S.COSTS_PANEL_PAD
+    t["forecast_rect"] = _rect(side_x, panels_bottom + 40, S.FORECAST_PANEL_W, forecast_h)
+    t["forecast_text"] = (side_x + S.COSTS_PANEL_PAD, panels_bottom + 40 + S.COSTS_PANEL_PAD)
+    t["placeholders"] = (
+        _rect(side_x, side_y, side_w, grid_h),
+        (costs_x, gy, t["costs_rect"][2], t["costs_rect"][3]),
+        (side_x, top_y - 14, max(trackers_right, panels_right), panels_bottom),
+    )
+
+    width = max(gx + grid_w + S.GRID_PADDING + 300, t["costs_rect"][2] + S.GRID_PADDING,
+                trackers_right + S.GRID_PADDING, panels_right + S.GRID_PADDING)
+    height = max(S.CARD_AREA_Y + S.CARD_AREA_H, t["forecast_rect"][3]) + S.GRID_PADDING
+    t["popup_center"] = (width / 2, height / 2)
+    t["popup_wrap"] = min(420, width - 60)
+    return t, width, height
+
+
+def build_layout(scale: float = 1.0, side_aspect: float = 0.0) -> Layout:
+    """Compute the whole geometry table for one scale factor.
+
+    side_aspect is the map image's width/height (0 when there is no image).
+    """
+    tables, width, height = _design_tables(side_aspect)
+    return Layout(
+        scale=scale,
+        width=int(round(width * scale)),
+        height=int(round(height * scale)),
+        side_aspect=side_aspect,
+        **{k: _scaled(v, scale) for k, v in tables.items()},
+    )
+
+
+def fit_scale(win_w, win_h, side_aspect: float = 0.0) -> float:
+    """Largest scale at which the whole board fits a win_w x win_h window."""
+    base = build_layout(1.0, side_aspect)
+    s = min(win_w / base.width, win_h / base.height)
+    return max(S.LAYOUT_MIN_SCALE, min(S.LAYOUT_MAX_SCALE, s))
+
+
+# Design-size table for code that has no Game (e.g. a bare Cube in tests)
+DEFAULT_LAYOUT = build_layout()
+
+
+class FontBook:
+    """Shared named fonts sized by the layout scale.
+
+    Text items reference these Font objects, so rescaling is one configure()
+    per distinct (size, style) rather than one itemconfigure per text item.
+    """
+
+    def __init__(self, root, scale: float = 1.0, family: str = "Helvetica"):
+        self.root = root
+        self.scale = scale
+        self.family = family
+        self._fonts = {}
+
+    def _size(self, size):
+        return max(1, int(round(size * self.scale)))
+
+    def get(self, size: int, style: str = "normal") -> tkfont.Font:
+        key = (size, style)
+        font = self._fonts.get(key)
+        if font is None:
+            font = tkfont.Font(
+                root=self.root, family=self.family, size=self._size(size),
+                weight="bold" if style == "bold" else "normal",
+                slant="italic" if style == "italic" else "roman",
+            )
+            self._fonts[key] = font
+        return font
+
+    def rescale(self, scale: float):
+        self.scale = scale
+        for (size, _style), font in self._fonts.items():
+            font.configure(size=self._size(size))
@@ -1,9 +1,143 @@
-import tkinter as tk
-from game import Game
+import argparse
+import csv
+import os
+import sys
+import time
+
+import numpy as np
+
+import settings as S
+from balance_sweep import METRICS
+from batch_strategies import BATCH_STRATEGIES, get_batch_strategy, play_batch
+from rules import play_game
+from shm_ring import run_pool, worker_ring
+from strategies import STRATEGIES, get_strategy
+
+
+def _outcomes(job):
+    """(strategy, seeds, turns) -> one outcome row (in METRICS order) per seed."""
+    strategy_name, seeds, turns = job
+    if strategy_name in BATCH_STRATEGIES:
+        # the whole chunk in lockstep, one decide() per turn
+        games = play_batch(get_batch_strategy(strategy_name, seeds[0]), seeds, turns)
+    else:
+        strategy = get_strategy(strategy_name)
+        games = (play_game(strategy, seed=seed, turns=turns) for seed in seeds)
+    for game in games:
+        res = game.outcome()
+        yield [res[m] for m in METRICS]
+
+
+def play_seeds(job):
+    """In-process entry: (strategy, seeds, turns) -> (seeds, outcomes[game, metric])."""
+    return job[1], np.array(list(_outcomes(job)), dtype=np.int64).reshape(len(job[1]), len(METRICS))
+
+
+def ring_seeds(job):
+    """Worker entry: writes one (seed, *outcome) record per game to the worker's ring."""
+    ring = worker_ring()
+    for seed, row in zip(job[1], _outcomes(job)):
+        ring.put((seed, *row))
+
+
+def run_batch(strategy, games, seed=0, turns=None, jobs=None):
+    """Play `games` seeded games headlessly; returns (seeds, outcomes[game, metric])."""
+    seeds = list(range(seed, seed + games))
+    workers = jobs or os.cpu_count() or 1
+    # a few chunks per worker keeps them all busy to the end
+    size = max(1, -(-games // (4 * workers)))
+    work = [(strategy, seeds[i:i + size], turns) for i in range(0, games, size)]
+    outcomes = np.empty((games, len(METRICS)), dtype=np.int64)
+    if workers == 1:
+        for chunk, out in map(play_seeds, work):
+            outcomes[chunk[0] - seed:chunk[-1] - seed + 1] = out
+        return seeds, outcomes
+
+    def take(records):
+        outcomes[records[:, 0] - seed] = records[:, 1:]
+
+    # results come back through shared memory, not pickled per chunk (see shm_ring.py)
+    run_pool(ring_seeds, work, min(workers, len(work)), 1 + len(METRICS), take)
+    return seeds, outcomes
+
+
+def write_results(path, seeds, outcomes):
+    with open(path, "w", newline="") as fh:
+        w = csv.writer(fh)
+        w.writerow(["seed", *METRICS])
+        for s, row in zip(seeds, outcomes):
+            w.writerow([s, *row.tolist()])
+
+
+def headless(args):
+    turns = S.SIM_TURNS if args.turns is None else args.turns
+    start = time.perf_counter()
+    seeds, outcomes = run_batch(args.strategy, args.games, args.seed, turns, args.jobs)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(f"{args.games} games x {turns} turns of {args.strategy!r} in {elapsed:.2f}s: "
+          f"{args.games / elapsed:.1f} games/s, {args.games * turns / elapsed:.0f} turns/s")
+    print(f"{'metric':<12}{'mean':>10}{'std':>10}{'min':>8}{'p50':>8}{'max':>8}")
+    for k, m in enumerate(METRICS):
+        col = outcomes[:, k]
+        print(f"{m:<12}{col.mean():>10.2f}{col.std():>10.2f}{col.min():>8}{int(np.median(col)):>8}{col.max():>8}")
+    if args.out:
+        write_results(args.out, seeds, outcomes)
+        print(f"per-game results -> {args.out}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="AI Apocalypser")
+    ap.add_argument("--telemetry", metavar="PATH", help="append one record per turn to PATH")
+    ap.add_argument("--replay", metavar="PATH", help="open a recorded game (see replay.py) read-only")
+    ap.add_argument("--autosave", metavar="PATH",
+                    help="save the game to PATH in the background, resuming from it if it exists")
+    ap.add_argument("--connect", metavar="ADDRESS",
+                    help="play a session on a running host.py (unix:PATH or HOST:PORT) instead of locally")
+    ap.add_argument("--session", default="main", help="session to join with --connect")
+    ap.add_argument("--watch", action="store_true", help="with --connect, watch the session without moving")
+    ap.add_argument("--startup-metrics", action="store_true",
+                    help="print time to first interactive frame and to a fully built board")
+
+    batch = ap.add_argument_group("headless batch mode (no window)")
+    batch.add_argument("--headless", action="store_true", help="play games with a strategy instead of opening a window")
+    batch.add_argument("--games", type=int, default=100)
+    batch.add_argument("--strategy", default="economy", choices=[*STRATEGIES, *BATCH_STRATEGIES])
+    batch.add_argument("--seed", type=int, default=0, help="first seed; game i uses seed + i")
+    batch.add_argument("--turns", type=int, default=None, help=f"turns per game (default {S.SIM_TURNS})")
+    batch.add_argument("--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    batch.add_argument("--out", metavar="PATH", help="write one CSV row per game")
+    args = ap.parse_args(argv)
+
+    if args.headless:
+        if args.games < 1:
+            ap.error("--games must be at least 1")
+        headless(args)
+        return
+
+    # Tk only for the windowed game, so the batch mode runs on display-less machines
+    import tkinter as tk
+    from autosave import load_latest
+    from game import Game
+    from replay import Recording
 
-def main():
     root = tk.Tk()
-    Game(root)
+    # Fit the board to the screen; the window stays resizable afterwards
+    screen = (root.winfo_screenwidth() * 0.9, root.winfo_screenheight() * 0.85)
+    game = Game(root, window_size=screen, telemetry=args.telemetry, staged=True, autosave=args.autosave,
+                animate=True)
+    saved = load_latest(args.autosave) if args.autosave and not args.replay else None
+    if saved is not None:
+        game.resume(saved)
+    if args.startup_metrics:
+        game.on_ready = lambda g: print(
+            "first interactive frame {first_frame:.0f} ms, board ready {ready:.0f} ms".format(**g.startup_ms),
+            file=sys.stderr)
+    if args.replay:
+        game.enter_replay(Recording.load(args.replay))
+    elif args.connect:
+        from host import HostClient
+        game.attach_host(HostClient(args.connect), args.session, watch=args.watch)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -1,13 +1,18 @@
 # mixins/logic_core.py
 import settings as S
+import rules
+import zobrist
 
 class LogicCoreMixin:
     # Mouse + placement
     def on_mouse_down(self, event):
+        if self.replay is not None:
+            return
+        x, y = self._event_xy(event)
         for cube in reversed(self.cubes):
-            if cube.contains(event.x, event.y) and not cube.locked:
+            if cube.contains(x, y) and not cube.locked:
                 self.active_cube = cube
-                cube.begin_drag(event.x, event.y)
+                cube.begin_drag(x, y)
                 if cube.current_cell is not None:
                     self.occupied.pop(cube.current_cell, None)
                     cube.current_cell = None
@@ -15,7 +20,7 @@ class LogicCoreMixin:
 
     def on_mouse_move(self, event):
         if self.active_cube:
-            self.active_cube.drag_to(event.x, event.y)
+            self.active_cube.drag_to(*self._event_xy(event))
 
     def on_mouse_up(self, event):
         if not self.active_cube:
@@ -25,27 +30,23 @@ class LogicCoreMixin:
         cell = self.cell_from_cube_center(cube)
         if cell and self.can_place(cell):
             r, c = cell
-            self.active_cube.center_on_cell(r, c, S.GRID_ORIGIN_X, S.GRID_ORIGIN_Y, S.CELL_SIZE)
+            self.active_cube.center_on_cell(r, c)
             self.occupied[(r, c)] = self.active_cube.idx
         else:
             cube.return_to_start()
         self.update_reset_visibility()
         self.active_cube = None
+        self._checkpoint()
+        self._request_forecast()  # supersedes the projection for the previous placement
 
     def place_cube_and_handle_events(self, cube, row, col):
         # snap to grid with explicit geometry
-        cube.center_on_cell(row, col, S.GRID_ORIGIN_X, S.GRID_ORIGIN_Y, S.CELL_SIZE)
+        cube.center_on_cell(row, col)
         self.occupied[(row, col)] = cube.idx
 
     def cell_from_cube_center(self, cube):
         x0, y0, x1, y1 = self.canvas.bbox(cube.rect)
-        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
-        inside = (S.GRID_ORIGIN_X <= cx < S.GRID_ORIGIN_X + S.GRID_COLS * S.CELL_SIZE
-                  and S.GRID_ORIGIN_Y <= cy < S.GRID_ORIGIN_Y + S.GRID_ROWS * S.CELL_SIZE)
-        if not inside: return None
-        col = int((cx - S.GRID_ORIGIN_X) // S.CELL_SIZE)
-        row = int((cy - S.GRID_ORIGIN_Y) // S.CELL_SIZE)
-        return (row, col) if (0 <= row < S.GRID_ROWS and 0 <= col < S.GRID_COLS) else None
+        return self.layout.cell_at((x0 + x1) / 2, (y0 + y1) / 2)
 
     def can_place(self, cell):
         return cell not in self.occupied
@@ -59,89 +60,79 @@ class LogicCoreMixin:
                     results.append((row, col))
         return results
 
-    # Buttons / gating
-    def update_reset_visibility(self):
-        placed = sum(1 for c in self.cubes if c.current_cell is not None)
-        if placed >= 1:
-            self.canvas.itemconfigure(self.take_action_button_window, state="normal")
+    def placed_cells(self):
+        return self.ledger.placed_cells()
 
-            pending_cost = self._pending_total_cost()
-            funds_ok = (pending_cost <= self.funds.value)
+    def _on_cube_cell_change(self, _cube, old, new):
+        # Every placement change funnels through Cube.current_cell, so the ledger is never stale
+        if old is not None:
+            self.ledger.remove(old)
+        if new is not None:
+            self.ledger.add(new)
+        self._render_turn_cost()
 
-            need_presence = any(
-                c.current_cell in S.PRESENCE_REQUIRED_COORDS
-                for c in self.cubes if c.current_cell
-            )
-            presence_ok = (not need_presence) or self.regions.any_presence()
+    def _render_turn_cost(self):
+        if not hasattr(self, "turn_cost_id"):
+            return
+        if not self.ledger.placed:
+            self.canvas.itemconfigure(self.turn_cost_id, text="")
+            return
+        cost = self.ledger.pending_cost(self.funds)
+        self.canvas.itemconfigure(self.turn_cost_id, text=f"This turn costs ${cost}",
+                                  fill="#111" if cost <= self.funds.value else "#b00020")
 
-            if funds_ok and presence_ok:
+    # Buttons / gating
+    def update_reset_visibility(self):
+        self._render_turn_cost()
+        if self.ledger.placed:
+            self.canvas.itemconfigure(self.take_action_button_window, state="normal")
+            blocker = self.ledger.blocker(self.funds, self.regions)
+            if not blocker:
                 self.take_action_button.config(state="normal")
             else:
                 self.take_action_button.config(state="disabled")
-                if not presence_ok:
-                    self._toast("Requires presence in a region")
+                if blocker != "Insufficient Funds":
+                    self._toast(blocker)
         else:
             self.canvas.itemconfigure(self.take_action_button_window, state="hidden")
             self.take_action_button.config(state="normal")
 
     def take_actions(self):
-        pending = self._pending_total_cost()
-        if pending > self.funds.value:
-            self._toast("Insufficient Funds"); return
+        if self.replay is not None:
+            return
+        self.finish_construction()  # the turn updates panels that may still be queued
+        if self.choosing_cards:
+            self._toast("Choose a card to keep first"); return
+        blocker = self.ledger.blocker(self.funds, self.regions)
+        if blocker:
+            self._toast(blocker); return
+        if self.remote is not None:
+            self._send_placement(); return  # the host resolves the turn and pushes the result
 
-        need_presence = any(
-            c.current_cell in S.PRESENCE_REQUIRED_COORDS
-            for c in self.cubes if c.current_cell
-        )
-        if need_presence and not self.regions.any_presence():
-            self._toast("Requires presence in a region"); return
-
-        self.selection_tasks = []
-
-        for _ in [c for c in self.cubes if c.current_cell == (1, 1)]:
-            self.selection_tasks.append({"type": "add_presence", "requires_presence": False})
-        for _ in [c for c in self.cubes if c.current_cell == (1, 0)]:
-            self.selection_tasks.append({"type": "rep+1", "requires_presence": True})
-        for _ in [c for c in self.cubes if c.current_cell == (1, 2)]:
-            self.selection_tasks.append({"type": "power+1", "requires_presence": True})
-        for _ in [c for c in self.cubes if c.current_cell == (2, 1)]:
-            self.selection_tasks.append({"type": "power+1_rep-2_chaos+10", "requires_presence": True})
-        for _ in [c for c in self.cubes if c.current_cell == (2, 2)]:
-            self.selection_tasks.append({"type": "rep-1_chaos+10", "requires_presence": True})
+        self.selection_tasks = rules.selection_tasks(self.placed_cells())
 
         if self.selection_tasks:
             self.selecting_regions = True
             self._show_center_popup(self._current_selection_prompt())
+            self._checkpoint()
             return
 
         self._finish_take_actions_after_selection()
+        self._checkpoint()
 
     def _finish_take_actions_after_selection(self):
-        for _ in self.cubes_on_final_column():
-            self.draw_card()
+        funds_before = self.funds.value
+        for row, _col in self.cubes_on_final_column():
+            self.offer_cards(S.FINAL_COLUMN_CARD_TYPES[row])
 
         if any(c.current_cell == (0, 1) for c in self.cubes if c.current_cell):
             for r in self.regions.with_presence():
                 r.adjust_rep(+1); r.adjust_power(+1)
 
-        bumps_compute = bumps_model = 0
-        charges = {"lobby": 0, "scale_presence": 0, "compute_or_model": 0, "scale_operations": 0}
-
-        for cube in self.cubes:
-            if not cube.current_cell: continue
-            r, c = cube.current_cell
-            if (r, c) == (0, 0):
-                bumps_compute += 1; charges["compute_or_model"] += 1
-            elif (r, c) == (0, 1):
-                bumps_model += 1; charges["compute_or_model"] += 1
-            if (r, c) in ((2, 1), (2, 2)):
-                pass
-            if (r, c) == (0, 2):
-                charges["scale_operations"] += 1
-            if (r, c) == (1, 1):
-                charges["scale_presence"] += 1
+        bumps_compute, bumps_model, charges = rules.turn_effects(self.placed_cells())
 
         ops_to_add = charges.get("scale_operations", 0)
+        ops = (self.ops_available, self.ops_aspirational)
         while ops_to_add > 0 and self.ops_available < S.OPS_MAX_TOKENS and self.ops_aspirational > 0:
             # flip one locked token to available
             for c in self.cubes:
@@ -151,6 +142,7 @@ class LogicCoreMixin:
                     self.ops_aspirational -= 1
                     break
             ops_to_add -= 1
+        self.zobrist.move_all(zobrist.TRACKERS[2:], ops, (self.ops_available, self.ops_aspirational))
 
         if bumps_compute: self.inc_compute(bumps_compute)
         if bumps_model: self.inc_model(bumps_model)
@@ -158,11 +150,12 @@ class LogicCoreMixin:
         for key, n in charges.items():
             if n: self.funds.charge(key, n)
 
-        income = self.regions.total_reputation() * self.regions.total_power()
+        income = rules.turn_income(self.regions)
         if income: self.funds.add(income)
 
         # refresh costs panel so bold moves to next ops price
         self._render_costs_panel()
+        self._refresh_heatmap()
 
         # reset tokens back to their tracks (positions) and clear placements
         for cube in self.cubes:
@@ -171,31 +164,29 @@ class LogicCoreMixin:
         self.occupied.clear()
         self.canvas.itemconfigure(self.take_action_button_window, state="hidden")
 
+        self.turn += 1
+        if self.telemetry is not None:
+            # keep-one card payments are settled later and land in the next record
+            self.telemetry.record_turn(self, funds_before, charges, income)
+        self._autosave()
+        self._request_forecast()
+
     # Cost helpers / toast
     def _charges_for_current_turn(self):
-        charges = {"lobby": 0, "scale_presence": 0, "compute_or_model": 0, "scale_operations": 0}
-        for cube in self.cubes:
-            if not cube.current_cell: continue
-            r, c = cube.current_cell
-            if (r, c) in ((0, 0), (0, 1)): charges["compute_or_model"] += 1
-            if (r, c) == (0, 2): charges["lobby"] += 1
-            if (r, c) == (1, 1): charges["scale_presence"] += 1
-            if (r, c) == (0, 2): charges["scale_operations"] += 1
-
-        return charges
+        return dict(self.ledger.charges)
 
     def _pending_total_cost(self):
-        charges = self._charges_for_current_turn()
-        return (self.funds.peek_cost("compute_or_model", charges["compute_or_model"])
-                + self.funds.peek_cost("lobby", charges["lobby"])
-                + self.funds.peek_cost("scale_presence", charges["scale_presence"]))
+        return self.ledger.pending_cost(self.funds)
 
     def _toast(self, msg: str, millis: int = 1500):
-        if hasattr(self, "toast_id") and self.toast_id:
-            self.canvas.delete(self.toast_id); self.toast_id = None
-        x = S.CARD_AREA_X + S.CARD_AREA_W / 2
-        y = S.CARD_AREA_Y - 8
-        self.toast_id = self.canvas.create_text(
-            x, y, text=msg, fill="#b00020", font=("Helvetica", 12, "bold"), anchor="s"
+        if self.toast_id:
+            self.pools["toast"].release(self.toast_id)
+        self.toast_id = self.pools["toast"].acquire(
+            *self.layout.toast, text=msg, fill="#b00020", font=self.fonts.get(12, "bold"), anchor="s"
         )
-        self.canvas.after(millis, lambda: (self.canvas.delete(self.toast_id), setattr(self, "toast_id", None)))
+        self.timers.schedule("toast", millis, self._hide_toast)
+
+    def _hide_toast(self):
+        if self.toast_id:
+            self.pools["toast"].release(self.toast_id)
+            self.toast_id = None
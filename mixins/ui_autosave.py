@@ -0,0 +1,54 @@
+# mixins/ui_autosave.py
+import settings as S
+from autosave import Autosaver
+from history import History, capture
+
+
+class UIAutosaveMixin:
+    """Autosave after every finished turn and every S.AUTOSAVE_INTERVAL_MS.
+
+    The Tk side only captures a history snapshot (structurally shared, so
+    cheap) and submits it; Autosaver writes it on its own thread.
+    """
+
+    def _init_autosave(self, autosave):
+        if isinstance(autosave, str):
+            autosave = Autosaver(autosave)
+        self.autosave = autosave
+        if autosave is not None:
+            self.timers.schedule("autosave", S.AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+
+    def autosave_now(self):
+        """Queue the current state for saving (a no-op without an autosave path or in replay).
+
+        Raises the OSError an earlier save failed with, if one did since the last call.
+        """
+        if self.autosave is None or self.replay is not None:
+            return False
+        return self.autosave.submit(capture(self, self.history.current))
+
+    def _autosave(self):
+        """autosave_now(), reporting a failed save on the board instead of raising."""
+        try:
+            return self.autosave_now()
+        except OSError as e:
+            self._toast(f"Autosave failed: {e.strerror or e}", S.AUTOSAVE_ERROR_TOAST_MS)
+            return False
+
+    def _autosave_tick(self):
+        self._autosave()
+        self.timers.schedule("autosave", S.AUTOSAVE_INTERVAL_MS, self._autosave_tick)
+
+    def _close_autosave(self):
+        """Save one last time and wait for it; a failed save is raised (the board is going away)."""
+        try:
+            self.autosave_now()
+        finally:
+            self.autosave.close()  # waits for the last save to reach the disk
+
+    def resume(self, snap):
+        """Continue from a saved snapshot (see autosave.load_latest) as a fresh history."""
+        self.finish_construction()
+        self._restore_snapshot(snap)
+        self.history = History()  # undo stops at the resumed state
+        self._checkpoint()
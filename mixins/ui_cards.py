@@ -3,78 +3,224 @@ import settings as S
 
 class UICardsMixin:
     def draw_card_area(self):
+        L = self.layout
         self.canvas.create_text(
-            S.GRID_ORIGIN_X + 100, S.CARD_AREA_Y - 8,
+            *L.hand_title,
             text=f"Current Hand Limit: {S.HAND_LIMIT}).",
             anchor="w",
-            font=("Helvetica", 12, "bold"),
+            font=self.fonts.get(12, "bold"),
             fill="black"
         )
-        self.canvas.create_rectangle(
-            S.CARD_AREA_X, S.CARD_AREA_Y,
-            S.CARD_AREA_X + S.CARD_AREA_W, S.CARD_AREA_Y + S.CARD_AREA_H,
-            outline="#bbbbc6"
-        )
+        self.canvas.create_rectangle(*L.card_rect, outline="#bbbbc6")
         self.deck_text = self.canvas.create_text(
-            S.CARD_AREA_X + S.CARD_AREA_W - 10, S.CARD_AREA_Y + 16,
-            text=f"Deck: {len(self.deck)}",
+            *L.deck_text,
+            text=self._deck_label(),
             anchor="e",
-            font=("Helvetica", 12)
+            font=self.fonts.get(12)
         )
         self.hand_full_text = self.canvas.create_text(
-            S.CARD_AREA_X + 10, S.CARD_AREA_Y + 16,
+            *L.hand_full_text,
             text="", anchor="w",
-            font=("Helvetica", 12, "italic"), fill="#a00"
+            font=self.fonts.get(12, "italic"), fill="#a00"
         )
 
         self.hand_slot_ids = []
-        start_x = S.CARD_AREA_X + 16
-        start_y = S.CARD_AREA_Y + 40
-
-        for i in range(S.HAND_LIMIT):
-            r, c = divmod(i, S.HAND_COLS)
-            x0 = start_x + c * (S.HAND_SLOT_W + S.HAND_SLOT_GAP_X)
-            y0 = start_y + r * (S.HAND_SLOT_H + S.HAND_SLOT_GAP_Y)
-            rect_id = self.canvas.create_rectangle(
-                x0, y0, x0 + S.HAND_SLOT_W, y0 + S.HAND_SLOT_H, fill="#ffffff", outline="#333"
-            )
+        self.hand_slot_image_ids = []
+        self._hand_slot_photos = [None] * S.HAND_LIMIT  # keeps displayed art alive past LRU eviction
+        for x0, y0, x1, y1 in L.hand_slots:
+            cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+            rect_id = self.canvas.create_rectangle(x0, y0, x1, y1, fill="#ffffff", outline="#333")
             text_id = self.canvas.create_text(
-                x0 + S.HAND_SLOT_W / 2, y0 + S.HAND_SLOT_H / 2,
-                text="—", font=("Helvetica", 18, "bold"), fill="#111"
+                cx, cy, text="—", font=self.fonts.get(18, "bold"), fill="#111"
             )
             self.canvas.tag_raise(text_id, rect_id)
+            image_id = self.canvas.create_image(cx, cy, anchor="c", state="hidden")
             self.hand_slot_ids.append((rect_id, text_id))
+            self.hand_slot_image_ids.append(image_id)
 
         self.render_hand()
 
-    def draw_card(self):
-        if len(self.hand) >= S.HAND_LIMIT:
+    def _deck_label(self):
+        counts = " / ".join(f"{t.title()} {len(self.deck[t])}" for t in S.CARD_TYPES)
+        return f"Deck: {counts}"
+
+    def _hand_has_room(self):
+        # Pending offers each reserve one hand slot
+        if len(self.hand) + len(self.card_offers) >= S.HAND_LIMIT:
             self.canvas.itemconfigure(self.hand_full_text, text="Hand is full")
-            return
+            return False
         self.canvas.itemconfigure(self.hand_full_text, text="")
+        return True
 
-        if not self.deck:
+    def draw_card(self, card_type=None):
+        """Draw one card straight into the hand (no keep-one choice)."""
+        if not self._hand_has_room():
             return
 
-        card = self.deck.pop()
+        card = self.deck.draw_any() if card_type is None else next(iter(self.deck.draw(card_type)), None)
+        if card is None:
+            return
         self.hand.append(card)
+        self.zobrist.move(("hand", card), False, True)
 
         slot_index = len(self.hand) - 1
         if 0 <= slot_index < len(self.hand_slot_ids):
-            _, text_id = self.hand_slot_ids[slot_index]
-            self.canvas.itemconfigure(text_id, text=str(card), fill="#111")
-            self.canvas.tag_raise(text_id)
+            self._render_hand_slot(slot_index)
+            self._fly_into_hand_slot(slot_index, self.layout.deck_text)
 
-        self.canvas.itemconfigure(self.deck_text, text=f"Deck: {len(self.deck)}")
+        self.canvas.itemconfigure(self.deck_text, text=self._deck_label())
         try:
             self.canvas.update_idletasks()
         except Exception:
             pass
 
     def render_hand(self):
-        for i, (_rect_id, text_id) in enumerate(self.hand_slot_ids):
-            if i < len(self.hand):
-                self.canvas.itemconfigure(text_id, text=str(self.hand[i]), fill="#111")
-                self.canvas.tag_raise(text_id)
+        for i in range(len(self.hand_slot_ids)):
+            self._render_hand_slot(i)
+
+    def _fly_into_hand_slot(self, i, source):
+        """Slide hand slot `i`'s items in from `source` (x, y) to where they belong."""
+        key = ("hand", i)
+        self.animator.finish(key)
+        x0, y0, x1, y1 = self.layout.hand_slots[i]
+        dx, dy = source[0] - (x0 + x1) / 2, source[1] - (y0 + y1) / 2
+        items = (*self.hand_slot_ids[i], self.hand_slot_image_ids[i])
+        for item in items:
+            self.canvas.move(item, dx, dy)
+            self.canvas.tag_raise(item)  # over the board while it flies
+        self.animator.move(key, items, -dx, -dy, S.CARD_FLY_MS)
+
+    def _render_hand_slot(self, i):
+        rect_id, text_id = self.hand_slot_ids[i]
+        image_id = self.hand_slot_image_ids[i]
+        photo = None
+        if i < len(self.hand):
+            card = self.hand[i]
+            fill = S.CARD_TYPE_COLORS.get(self.catalog.types[card], "#ffffff")
+            x0, y0, x1, y1 = self.layout.hand_slots[i]
+            photo = self.assets.get(f"cards/{card}", x1 - x0, y1 - y0)
+            self.canvas.itemconfigure(rect_id, fill=fill)
+            self.canvas.itemconfigure(text_id, text=str(card), fill="#111",
+                                      state="hidden" if photo else "normal")
+            self.canvas.tag_raise(text_id)
+        else:
+            self.canvas.itemconfigure(rect_id, fill="#ffffff")
+            self.canvas.itemconfigure(text_id, text="—", fill="#aaa", state="normal")
+
+        if photo is not self._hand_slot_photos[i]:
+            self._hand_slot_photos[i] = photo
+            if photo:
+                self.canvas.itemconfigure(image_id, image=photo, state="normal")
             else:
-                self.canvas.itemconfigure(text_id, text="—", fill="#aaa")
+                self.canvas.itemconfigure(image_id, image="", state="hidden")
+
+    # --- draw 3, keep 1 ---
+    @property
+    def choosing_cards(self):
+        return bool(self.card_offers)
+
+    def offer_cards(self, card_type):
+        """Queue a keep-one choice of CARD_DRAW_COUNT cards from card_type's deck."""
+        if not self._hand_has_room():
+            return
+        drawn = self.deck.draw(card_type, S.CARD_DRAW_COUNT)
+        if not drawn:
+            return
+        self.card_offers.append((card_type, drawn))
+        self.canvas.itemconfigure(self.deck_text, text=self._deck_label())
+        if len(self.card_offers) == 1:
+            self._show_card_offer()
+
+    def choose_offered_card(self, index=None):
+        """Keep card `index` of the current offer and pay its cost (None = keep none).
+        Returns False if the choice was rejected."""
+        if not self.card_offers:
+            return False
+        card_type, drawn = self.card_offers[0]
+        if index is not None:
+            card = drawn[index]
+            cost = self.catalog.costs[card]
+            if cost > self.funds.value:
+                self._toast("Insufficient Funds")
+                return False
+            self.funds.pay(cost)
+            self.hand.append(card)
+            self.zobrist.move(("hand", card), False, True)
+            x0, y0, x1, y1 = self.layout.offer_cards[index]
+            flown_from = ((x0 + x1) / 2, (y0 + y1) / 2)
+            drawn = drawn[:index] + drawn[index + 1:]
+        self.deck.put_back(drawn)
+        self.card_offers.pop(0)
+        self._request_forecast()
+
+        self.render_hand()
+        if index is not None and len(self.hand) <= len(self.hand_slot_ids):
+            self._fly_into_hand_slot(len(self.hand) - 1, flown_from)
+        self.canvas.itemconfigure(self.deck_text, text=self._deck_label())
+        if self.card_offers:
+            self._show_card_offer()
+        else:
+            self._hide_card_offer()
+        self._checkpoint()
+        return True
+
+    def _show_card_offer(self):
+        self._hide_card_offer()
+        card_type, drawn = self.card_offers[0]
+        L = self.layout
+        tag = "card_offer"
+        self.canvas.create_rectangle(
+            *L.card_rect, fill="#f7f7fb", outline="#555", width=2, tags=(tag,)
+        )
+        self.canvas.create_text(
+            *L.offer_title, anchor="w", font=self.fonts.get(13, "bold"), fill="black",
+            text=f"{card_type.title()}: choose 1 card to keep and pay its cost", tags=(tag,)
+        )
+
+        # hit areas are the rect items themselves, so they stay right if the canvas is rescaled
+        self._offer_hitboxes = []
+        self._offer_photos = []
+        for i, card in enumerate(drawn):
+            cx0, top, cx1, bottom = L.offer_cards[i]
+            card_w, card_h = cx1 - cx0, bottom - top
+            rect = self.canvas.create_rectangle(
+                cx0, top, cx1, bottom,
+                fill=S.CARD_TYPE_COLORS.get(card_type, "#fff"), outline="#333", tags=(tag,)
+            )
+            photo = self.assets.get(f"cards/{card}", card_w, card_h - L.px(30))
+            if photo:
+                self._offer_photos.append(photo)
+                self.canvas.create_image(cx0 + card_w / 2, top + L.px(4), image=photo, anchor="n", tags=(tag,))
+            else:
+                self.canvas.create_text(
+                    cx0 + card_w / 2, top + L.px(10), anchor="n", width=card_w - L.px(12), justify="center",
+                    font=self.fonts.get(11, "bold"), fill="#111", tags=(tag,),
+                    text=f"#{card}\n{self.catalog.names[card]}\n\n{self.catalog.effects[card]}"
+                )
+            self.canvas.create_text(
+                cx0 + card_w / 2, top + card_h - L.px(10), anchor="s",
+                font=self.fonts.get(12, "bold"), fill="#111", tags=(tag,),
+                text=f"Cost: ${self.catalog.costs[card]}"
+            )
+            self._offer_hitboxes.append((i, rect))
+
+        px0, py0, px1, py1 = L.offer_pass
+        rect = self.canvas.create_rectangle(px0, py0, px1, py1, fill="#e9e9ee", outline="#555", tags=(tag,))
+        self.canvas.create_text((px0 + px1) / 2, (py0 + py1) / 2, text="Pass",
+                                font=self.fonts.get(12, "bold"), tags=(tag,))
+        self._offer_hitboxes.append((None, rect))
+
+    def _hide_card_offer(self):
+        self.canvas.delete("card_offer")
+        self._offer_hitboxes = []
+        self._offer_photos = []
+
+    def _maybe_card_choice_click(self, event):
+        if not self.card_offers:
+            return
+        x, y = self._event_xy(event)
+        for index, rect in getattr(self, "_offer_hitboxes", []):
+            x0, y0, x1, y1 = self.canvas.coords(rect)
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                self.choose_offered_card(index)
+                return
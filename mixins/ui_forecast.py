@@ -0,0 +1,57 @@
+# mixins/ui_forecast.py
+import queue
+
+import settings as S
+from forecast import Forecaster
+
+
+class UIForecastMixin:
+    """What-if panel: funds, income and trackers S.FORECAST_TURNS turns ahead.
+
+    Every drop (on_mouse_up), finished turn and restore asks the Forecaster
+    for the placement now on the board; the projection runs on its thread
+    and the Tk side polls for the newest result, so dragging never waits on
+    it and a superseded placement's result is never shown.
+    """
+
+    def _init_forecast(self):
+        L = self.layout
+        self.forecaster = Forecaster()
+        self._forecast_wanted = None  # generation being projected
+        self.forecast_rows = None     # rows on the panel
+        self.forecast_rect_id = self.canvas.create_rectangle(*L.forecast_rect, outline="#ccccd6", fill="#fbfbfe")
+        self.forecast_text_id = self.canvas.create_text(
+            *L.forecast_text, text="", anchor="nw", font=self.fonts.get(11), fill="#333")
+
+    def _request_forecast(self):
+        if self.replay is not None:
+            self.canvas.itemconfigure(self.forecast_text_id, text="")
+            return
+        rows = self.forecaster.request(self, self.placed_cells())
+        if rows is not None:
+            self._show_forecast(rows)
+        else:
+            self._forecast_wanted = self.forecaster.generation
+            self.timers.schedule("forecast", S.FORECAST_POLL_MS, self._poll_forecast)
+
+    def _poll_forecast(self):
+        while True:
+            try:
+                generation, rows = self.forecaster.results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self._forecast_wanted:
+                self._show_forecast(rows)
+        if self._forecast_wanted is not None:
+            self.timers.schedule("forecast", S.FORECAST_POLL_MS, self._poll_forecast)
+
+    def _show_forecast(self, rows):
+        self._forecast_wanted = None
+        self.forecast_rows = rows
+        plan = "this placement" if self.ledger.placed else "passing"
+        lines = [f"Forecast: {plan} each turn"]
+        for row in rows:
+            skipped = "" if row["played"] else "  (can't afford, pass)"
+            lines.append(f"+{row['turn']}: ${row['funds']}  income {row['income']}  "
+                         f"C{row['compute']} M{row['model']}  ops {row['ops']}{skipped}")
+        self.canvas.itemconfigure(self.forecast_text_id, text="\n".join(lines))
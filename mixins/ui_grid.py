@@ -1,8 +1,8 @@
 # mixins/ui_grid.py
-import tkinter.font as tkfont
 import textwrap
 import tkinter as tk
 import settings as S
+from canvas_pool import GridView, ItemPool
 
 try:
     from PIL import Image, ImageTk
@@ -12,36 +12,86 @@ except Exception:
 
 class UIGridMixin:
     def draw_grid(self):
+        L = self.layout
         self.canvas.create_text(
-            S.GRID_ORIGIN_X + S.GRID_COLS * S.CELL_SIZE / 2,
-            20,
+            *L.grid_title,
             text="Quarterly Strategy",
-            font=("Helvetica", 16, "bold"),
+            font=self.fonts.get(16, "bold"),
             fill="black",
         )
-        for r in range(S.GRID_ROWS):
-            for c in range(S.GRID_COLS):
-                x0 = S.GRID_ORIGIN_X + c * S.CELL_SIZE
-                y0 = S.GRID_ORIGIN_Y + r * S.CELL_SIZE
-                x1, y1 = x0 + S.CELL_SIZE, y0 + S.CELL_SIZE
-                fill = "#ffffff" if c % 2 == r % 2 else "#f5f6fa"
-                self.canvas.create_rectangle(x0, y0, x1, y1, fill=fill, outline="#ccccd6")
-                idx = r * S.GRID_COLS + c
-                if idx < len(self.BOARD_LABELS):
-                    self.draw_cell_label(r, c, self.BOARD_LABELS[idx])
+        self._label_fits = {}  # (label, cell size) -> (font size, wrapped text)
+        if S.GRID_ROWS * S.GRID_COLS <= S.GRID_CULL_CELLS:
+            for r in range(S.GRID_ROWS):
+                for c in range(S.GRID_COLS):
+                    idx = L.cell_index(r, c)
+                    self.canvas.create_rectangle(*L.cell_rects[idx], fill=self._cell_fill(r, c), outline="#ccccd6")
+                    if idx < len(self.BOARD_LABELS):
+                        self.draw_cell_label(r, c, self.BOARD_LABELS[idx])
+            return
+        # Large boards: only the cells in view exist, recycled through pools as the view scrolls
+        self._cell_pools = (ItemPool(self.canvas, "rectangle", outline="#ccccd6"),
+                            ItemPool(self.canvas, "text", fill="#111", justify="center"))
+        self.grid_view = GridView(S.GRID_ROWS, S.GRID_COLS, self._show_cell, self._hide_cell)
+        self._update_grid_view()
+
+    @staticmethod
+    def _cell_fill(r, c):
+        return "#ffffff" if c % 2 == r % 2 else "#f5f6fa"
+
+    def _update_grid_view(self):
+        """Bring the materialised cells in line with the visible part of the canvas."""
+        if self.grid_view is None:
+            return
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.grid_view.update(*self.layout.cells_in(x0, y0, x0 + w, y0 + h))
+
+    def _show_cell(self, r, c):
+        L = self.layout
+        rects, texts = self._cell_pools
+        idx = L.cell_index(r, c)
+        rect = rects.acquire(*L.cell_rects[idx], fill=self._cell_fill(r, c))
+        text = None
+        if idx < len(self.BOARD_LABELS):
+            size, wrapped = self._fit_cell_label(self.BOARD_LABELS[idx])
+            text = texts.acquire(*L.cell_centers[idx], text=wrapped, font=self.fonts.get(size, "bold"))
+            self.cell_text_ids[(r, c)] = text
+            self.canvas.tag_lower(text)
+        self.canvas.tag_lower(rect)  # under the label, tokens and everything else
+        return r, c, rect, text
+
+    def _hide_cell(self, items):
+        r, c, rect, text = items
+        self._cell_pools[0].release(rect)
+        if text is not None:
+            self._cell_pools[1].release(text)
+            self.cell_text_ids.pop((r, c), None)
 
     def draw_cell_label(self, row, col, text):
-        CELL_TEXT_PAD = 10
-        x0 = S.GRID_ORIGIN_X + col * S.CELL_SIZE
-        y0 = S.GRID_ORIGIN_Y + row * S.CELL_SIZE
-        x1, y1 = x0 + S.CELL_SIZE, y0 + S.CELL_SIZE
+        L = self.layout
+        size, wrapped = self._fit_cell_label(text)
+        cx, cy = L.cell_centers[L.cell_index(row, col)]
+        t_id = self.canvas.create_text(
+            cx, cy, text=wrapped, font=self.fonts.get(size, "bold"),
+            fill="#111", justify="center",
+        )
+        self.cell_text_ids[(row, col)] = t_id
 
-        max_w = S.CELL_SIZE - 2 * CELL_TEXT_PAD
-        max_h = S.CELL_SIZE - 2 * CELL_TEXT_PAD
+    def _fit_cell_label(self, text):
+        """(font size, wrapped text) that fits a cell; memoised, as boards repeat labels."""
+        L = self.layout
+        key = (text, L.cell)
+        if key in self._label_fits:
+            return self._label_fits[key]
+        CELL_TEXT_PAD = L.px(10)
 
+        max_w = L.cell - 2 * CELL_TEXT_PAD
+        max_h = L.cell - 2 * CELL_TEXT_PAD
+
+        # Fonts come from the shared FontBook, so a later rescale keeps the fit
         size, wrapped = 18, text
         for fs in range(18, 9, -1):
-            font = tkfont.Font(family="Helvetica", size=fs, weight="bold")
+            font = self.fonts.get(fs, "bold")
             avg_char_px = max(font.measure("M"), 1)
             chars_per_line = max(int(max_w / (avg_char_px * 0.7)), 8)
             lines = []
@@ -54,13 +104,8 @@ class UIGridMixin:
                 wrapped = "\n".join(lines)
                 size = fs
                 break
-
-        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
-        t_id = self.canvas.create_text(
-            cx, cy, text=wrapped, font=("Helvetica", size, "bold"),
-            fill="#111", justify="center",
-        )
-        self.cell_text_ids[(row, col)] = t_id
+        self._label_fits[key] = (size, wrapped)
+        return size, wrapped
 
     def draw_start_area(self):
         start_x, start_y, start_w, start_h = self._start_area_geom
@@ -69,73 +114,81 @@ class UIGridMixin:
             outline="#bbbbc6", dash=(4, 2), fill=""
         )
 
-    def _draw_side_image(self):
+    def _probe_side_image(self):
+        """The map's aspect ratio from its header alone (0 if unavailable); nothing is decoded.
+
+        The layout is sized with it up front and the map itself is decoded
+        later by _load_side_image(), in a construction stage.
+        """
+        self._side_img_src = None
         if Image is None or ImageTk is None:
-            return
+            return 0.0
         try:
-            img = Image.open(S.SIDE_IMAGE_PATH)
+            with Image.open(S.SIDE_IMAGE_PATH) as img:
+                ow, oh = img.size
         except Exception:
-            return
-
-        grid_h = S.GRID_ROWS * S.CELL_SIZE
-        grid_w = S.GRID_COLS * S.CELL_SIZE
+            return 0.0
+        return ow / float(oh) if oh else 0.0
+
+    def _load_side_image(self):
+        """Decode the map once (after _probe_side_image() found it); False if it cannot be read."""
+        if self._side_img_src is not None:
+            return True
+        if not self.layout.side_aspect:
+            return False
+        try:
+            with Image.open(S.SIDE_IMAGE_PATH) as img:
+                self._side_img_src = img.copy()
+        except Exception:
+            return False
+        return True
 
-        ow, oh = img.size
-        if oh == 0:
+    def _draw_side_image(self):
+        if self._side_img_src is None:
             return
-        scale = grid_h / float(oh)
-        new_w, new_h = max(1, int(round(ow * scale))), grid_h
-        img = img.resize((new_w, new_h), Image.LANCZOS)
-
-        x = S.GRID_ORIGIN_X + grid_w + S.GRID_PADDING
-        y = S.GRID_ORIGIN_Y
+        L = self.layout
+        new_w, new_h = max(1, int(round(L.side_w))), max(1, int(round(L.side_h)))
+        img = self._side_img_src.resize((new_w, new_h), Image.LANCZOS)
 
         try:
             self._side_img_tk = ImageTk.PhotoImage(img, master=self.canvas)
-            self.side_image_id = self.canvas.create_image(x, y, image=self._side_img_tk, anchor="nw")
+            if self.side_image_id is None:
+                self.side_image_id = self.canvas.create_image(L.side_x, L.side_y, image=self._side_img_tk, anchor="nw")
+            else:
+                self.canvas.coords(self.side_image_id, L.side_x, L.side_y)
+                self.canvas.itemconfigure(self.side_image_id, image=self._side_img_tk)
             self.side_image_dims = (new_w, new_h)
+            self._set_heatmap_base(img)
         except tk.TclError:
             self._side_img_tk = None
             self.side_image_id = None
             self.side_image_dims = (0, 0)
 
     def _draw_ops_tracks(self):
+        L = self.layout
+        asp_title, avail_title = L.ops_titles
         # Titles
         self.canvas.create_text(
-            S.OPS_ASP_X + S.OPS_TRACK_W/2, S.OPS_TRACK_TOP - 14,
-            text="Aspirational Action Tokens", font=("Helvetica", 12, "bold"),
+            *asp_title,
+            text="Aspirational Action Tokens", font=self.fonts.get(12, "bold"),
             fill="black", anchor="s"
         )
         self.canvas.create_text(
-            S.OPS_AVAIL_X + S.OPS_TRACK_W/2, S.OPS_TRACK_TOP - 14,
-            text="Available Action Tokens", font=("Helvetica", 12, "bold"),
+            *avail_title,
+            text="Available Action Tokens", font=self.fonts.get(12, "bold"),
             fill="black", anchor="s"
         )
         # Columns
         self.ops_asp_rect = self.canvas.create_rectangle(
-            S.OPS_ASP_X, S.OPS_TRACK_TOP,
-            S.OPS_ASP_X + S.OPS_TRACK_W, S.OPS_TRACK_TOP + S.OPS_TRACK_H,
-            outline="#bbbbc6", fill="#e7f2ff"
+            *L.ops_asp_rect, outline="#bbbbc6", fill="#e7f2ff"
         )
         self.ops_avail_rect = self.canvas.create_rectangle(
-            S.OPS_AVAIL_X, S.OPS_TRACK_TOP,
-            S.OPS_AVAIL_X + S.OPS_TRACK_W, S.OPS_TRACK_TOP + S.OPS_TRACK_H,
-            outline="#bbbbc6", fill="#e7f2ff"
+            *L.ops_avail_rect, outline="#bbbbc6", fill="#e7f2ff"
         )
 
-    def _ops_slot_starts(self, left_x):
-        y = S.OPS_TRACK_TOP + S.OPS_TRACK_PAD + S.OPS_DISC_R
-        out = []
-        for _ in range(S.OPS_MAX_TOKENS):
-            cx = left_x + S.OPS_TRACK_W/2
-            cy = y
-            out.append((cx - S.OPS_DISC_R, cy - S.OPS_DISC_R))
-            y += 2 * S.OPS_DISC_R + S.OPS_DISC_GAP
-        return out
-
     def _reset_tokens_to_tracks(self):
-        asp_slots = self._ops_slot_starts(S.OPS_ASP_X)
-        ava_slots = self._ops_slot_starts(S.OPS_AVAIL_X)
+        asp_slots = self.layout.ops_asp_slots
+        ava_slots = self.layout.ops_avail_slots
 
         avail = [c for c in self.cubes if not c.locked]
         locked = [c for c in self.cubes if c.locked]
@@ -145,4 +198,4 @@ class UIGridMixin:
             c.set_start(x, y)
         for i, c in enumerate(sorted(locked, key=lambda x: x.idx)):
             x, y = asp_slots[i]
-            c.set_start(x, y)
\ No newline at end of file
+            c.set_start(x, y)
@@ -0,0 +1,89 @@
+# mixins/ui_heatmap.py
+import queue
+
+import numpy as np
+
+import settings as S
+from heatmap import METRICS, HeatmapCompositor, region_values
+
+try:
+    from PIL import Image, ImageTk
+except Exception:
+    Image = ImageTk = None
+
+
+class UIHeatmapMixin:
+    """Region heat map over the world map; "h" cycles chaos -> reputation -> power -> off.
+
+    Compositing runs on HeatmapCompositor's thread; the Tk side only polls
+    its result queue and wraps the finished array in a PhotoImage.
+    """
+
+    def _init_heatmap(self):
+        self.heatmap_metric = None
+        self.heatmap_id = None
+        self._heatmap_tk = None
+        self._heatmap_shown = None   # key of the overlay on the canvas
+        self._heatmap_wanted = None  # key of the overlay being composited
+        self._heatmap_base = None    # the map as drawn, (h, w, 3) uint8
+        self.heatmap = HeatmapCompositor()
+        self.root.bind("<KeyPress-h>", lambda _e: self.cycle_heatmap(), add="+")
+
+    def cycle_heatmap(self):
+        order = (None,) + METRICS
+        self.set_heatmap(order[(order.index(self.heatmap_metric) + 1) % len(order)])
+
+    def set_heatmap(self, metric):
+        if metric is not None and metric not in METRICS:
+            raise ValueError(f"Unknown heat-map metric {metric!r}")
+        self.heatmap_metric = metric
+        self._refresh_heatmap()
+
+    def _set_heatmap_base(self, img):
+        """Called with the map as drawn, after every resample."""
+        self._heatmap_base = np.asarray(img.convert("RGB"))
+        self._heatmap_shown = None
+        self._refresh_heatmap()
+
+    def _refresh_heatmap(self):
+        """Bring the overlay in line with the current state; a no-op when nothing it shows changed."""
+        base = self._heatmap_base
+        if self.heatmap_metric is None or base is None or self.side_image_id is None:
+            self._heatmap_wanted = self._heatmap_shown = None
+            if self.heatmap_id is not None:
+                self.canvas.itemconfigure(self.heatmap_id, state="hidden")
+            return
+        values = region_values(self.regions, self.heatmap_metric)
+        key = HeatmapCompositor.key(base, self.heatmap_metric, values)
+        if key in (self._heatmap_shown, self._heatmap_wanted):
+            return
+        img = self.heatmap.request(base, self.heatmap_metric, values)
+        if img is not None:
+            self._show_heatmap(key, img)
+        else:
+            self._heatmap_wanted = key
+            self.timers.schedule("heatmap", S.HEATMAP_POLL_MS, self._poll_heatmap)
+
+    def _poll_heatmap(self):
+        while True:
+            try:
+                key, img = self.heatmap.results.get_nowait()
+            except queue.Empty:
+                break
+            if key == self._heatmap_wanted:
+                self._show_heatmap(key, img)
+        if self._heatmap_wanted is not None:
+            self.timers.schedule("heatmap", S.HEATMAP_POLL_MS, self._poll_heatmap)
+
+    def _show_heatmap(self, key, img):
+        self._heatmap_wanted = None
+        self._heatmap_shown = key
+        L = self.layout
+        self._heatmap_tk = ImageTk.PhotoImage(Image.fromarray(img), master=self.canvas)
+        if self.heatmap_id is None:
+            self.heatmap_id = self.canvas.create_image(L.side_x, L.side_y, image=self._heatmap_tk, anchor="nw")
+        else:
+            self.canvas.coords(self.heatmap_id, L.side_x, L.side_y)
+            self.canvas.itemconfigure(self.heatmap_id, image=self._heatmap_tk, state="normal")
+        # just above the map, below the presence markers
+        self.canvas.tag_raise(self.heatmap_id, self.side_image_id)
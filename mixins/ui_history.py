@@ -0,0 +1,72 @@
+# mixins/ui_history.py
+from history import History, capture
+
+
+class UIHistoryMixin:
+    """Undo/redo of placements, turns, region picks and card choices.
+
+    Every completed action commits a snapshot; undo/redo restore one and
+    re-render the existing panels (see UIReplayMixin._refresh_after_restore).
+    """
+
+    def _init_history(self):
+        self.history = History()
+        self._checkpoint()
+        self.root.bind("<Control-z>", self.undo, add="+")
+        self.root.bind("<Control-y>", self.redo, add="+")
+        self.root.bind("<Control-Z>", self.redo, add="+")  # Ctrl+Shift+Z
+
+    def _checkpoint(self):
+        if self.replay is None:
+            self.history.commit(capture(self, self.history.current))
+
+    def undo(self, _event=None):
+        if self.active_cube is not None or self.replay is not None or self.remote is not None:
+            return False
+        snap = self.history.undo()
+        if snap is None:
+            self._toast("Nothing to undo"); return False
+        self._restore_snapshot(snap)
+        return True
+
+    def redo(self, _event=None):
+        if self.active_cube is not None or self.replay is not None or self.remote is not None:
+            return False
+        snap = self.history.redo()
+        if snap is None:
+            self._toast("Nothing to redo"); return False
+        self._restore_snapshot(snap)
+        return True
+
+    def _restore_snapshot(self, snap):
+        self.turn = snap.turn
+        value, counters = snap.funds
+        self.funds.value = value
+        self.funds.counters.update(counters)
+        self.compute_idx, self.model_idx, self.ops_available, self.ops_aspirational = snap.trackers
+        for r, (rep, power, chaos, presence) in zip((self.regions[n] for n in self.regions.regions), snap.regions):
+            r.reputation, r.power, r.chaos, r.player_presence = rep, power, chaos, presence
+        self.hand = list(snap.hand)
+        self.deck.restore(snap.decks)
+        self._refresh_after_restore()  # tokens back on their tracks, panels re-rendered
+
+        board = {idx: (cell, locked) for idx, cell, locked in snap.board}
+        for cube in self.cubes:
+            cell, cube.locked = board[cube.idx]
+            if cell is not None:
+                self.place_cube_and_handle_events(cube, *cell)
+
+        offers, tasks, selecting = snap.pending
+        self.card_offers = [(t, list(ids)) for t, ids in offers]
+        self.selection_tasks = [{"type": t, "requires_presence": req} for t, req in tasks]
+        self.selecting_regions = selecting
+        if self.card_offers:
+            self._show_card_offer()
+        else:
+            self._hide_card_offer()
+        if selecting:
+            self._show_center_popup(self._current_selection_prompt())
+        else:
+            self._hide_center_popup()
+        self.update_reset_visibility()
+        self._request_forecast()
@@ -0,0 +1,81 @@
+# mixins/ui_layout.py
+import tkinter as tk
+import settings as S
+from layout import build_layout, fit_scale
+
+
+class UILayoutMixin:
+    """Window resizing.
+
+    Every <Configure> rescales the vector items in place with canvas.scale
+    and swaps in a new frozen Layout (both cheap). Bitmap/font work -- map
+    resampling, font refit, art lookups -- waits until the resize settles.
+    """
+
+    def _init_scrolling(self):
+        """The canvas scrolls over the whole layout; boards past S.GRID_CULL_CELLS get scrollbars."""
+        self.xscrollbar = self.yscrollbar = None
+        if S.GRID_ROWS * S.GRID_COLS > S.GRID_CULL_CELLS:
+            self.yscrollbar = tk.Scrollbar(self.root, orient="vertical", command=self.canvas.yview)
+            self.xscrollbar = tk.Scrollbar(self.root, orient="horizontal", command=self.canvas.xview)
+            self.yscrollbar.pack(side="right", fill="y", before=self.canvas)
+            self.xscrollbar.pack(side="bottom", fill="x", before=self.canvas)
+        self.canvas.configure(xscrollcommand=lambda *f: self._on_view_change(self.xscrollbar, *f),
+                              yscrollcommand=lambda *f: self._on_view_change(self.yscrollbar, *f))
+        self._set_scrollregion()
+        self.canvas.bind("<MouseWheel>", lambda e: self._on_wheel("y", e), add="+")
+        self.canvas.bind("<Shift-MouseWheel>", lambda e: self._on_wheel("x", e), add="+")
+        self.canvas.bind("<Button-4>", lambda _e: self.canvas.yview_scroll(-S.SCROLL_UNITS, "units"), add="+")
+        self.canvas.bind("<Button-5>", lambda _e: self.canvas.yview_scroll(S.SCROLL_UNITS, "units"), add="+")
+
+    def _set_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self.layout.width, self.layout.height))
+
+    def _on_view_change(self, scrollbar, first, last):
+        if scrollbar is not None:
+            scrollbar.set(first, last)
+        self._update_grid_view()
+
+    def _on_wheel(self, axis, event):
+        step = -S.SCROLL_UNITS if event.delta > 0 else S.SCROLL_UNITS
+        getattr(self.canvas, f"{axis}view_scroll")(step, "units")
+
+    def _event_xy(self, event):
+        """An event's position in canvas coordinates (they differ from widget ones once scrolled)."""
+        return self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)
+
+    def _on_canvas_configure(self, event):
+        if event.widget is not self.canvas:
+            return
+        scale = fit_scale(event.width, event.height, self.layout.side_aspect)
+        if abs(scale - self.layout.scale) < 1e-3:
+            return
+        self.apply_scale(scale)
+
+    def apply_scale(self, scale):
+        """Rescale the board to `scale`; the expensive refit is debounced."""
+        self.finish_construction()
+        self.animator.finish_all()  # tweens hold unscaled offsets
+        old = self.layout
+        self.layout = build_layout(scale, old.side_aspect)
+        ratio = self.layout.scale / old.scale
+
+        self.canvas.scale("all", 0, 0, ratio, ratio)
+        for cube in self.cubes:
+            cube.rescale(ratio, self.layout)
+        self._start_area_geom = self.layout.start_area
+        self._build_region_hitboxes()
+        self._set_scrollregion()
+        self._update_grid_view()
+
+        self.timers.schedule("relayout", S.RELAYOUT_DEBOUNCE_MS, self._relayout_settled)
+
+    def _relayout_settled(self):
+        L = self.layout
+        self.fonts.rescale(L.scale)
+        self._draw_side_image()
+        self._render_costs_panel()
+        self.render_hand()
+        self._render_tracker_markers()
+        if getattr(self, "_popup_text_id", None):
+            self._update_center_popup(self.canvas.itemcget(self._popup_text_id, "text"))
@@ -0,0 +1,79 @@
+# mixins/ui_remote.py
+import queue
+
+import settings as S
+from replay import restore
+
+
+class UIRemoteMixin:
+    """Play or watch a session on a host.GameHost instead of resolving turns here.
+
+    Attached, the window is a thin client: Take Actions sends the placement,
+    region clicks answer the host's prompts, and the board is redrawn from
+    the state the host pushes after each turn (undo is off, since the host
+    owns the game). Offered cards are settled on the host, keeping the
+    cheapest one the funds on hand cover.
+    """
+
+    def _init_remote(self):
+        self.remote = None          # host.HostClient while attached
+        self.remote_session = None
+        self._remote_state = None   # the host's last full state, diffs applied
+
+    def attach_host(self, client, session, **join):
+        """Join `session` on the host `client` is connected to (join options as in host.py)."""
+        self.finish_construction()
+        self.remote, self.remote_session = client, session
+        client.send({"op": "join", "session": session, **join})
+        self.timers.schedule("remote", S.HOST_POLL_MS, self._poll_remote)
+
+    def detach_host(self):
+        if self.remote is None:
+            return
+        self.timers.cancel("remote")
+        self.remote.close()
+        self.remote = self.remote_session = None
+
+    def _poll_remote(self):
+        while self.remote is not None:
+            try:
+                msg = self.remote.inbox.get_nowait()
+            except queue.Empty:
+                break
+            if msg is None:
+                self.detach_host()
+                self._toast("Disconnected from the host")
+                return
+            self._on_host_message(msg)
+        if self.remote is not None:
+            self.timers.schedule("remote", S.HOST_POLL_MS, self._poll_remote)
+
+    def _on_host_message(self, msg):
+        op = msg["op"]
+        if op == "state":
+            self._remote_state = dict(msg["state"])
+        elif op == "diff":
+            self._remote_state.update(msg["set"])
+        elif op == "prompt":
+            self.selection_tasks = list(msg["tasks"])
+            self.selecting_regions = True
+            self._show_center_popup(self._current_selection_prompt())
+            return
+        elif op == "error":
+            self._toast(msg["msg"])
+            return
+        else:
+            return
+        self.selecting_regions = False
+        self.selection_tasks = []
+        self._hide_center_popup()
+        restore(self, self._remote_state)
+        self._refresh_after_restore()
+        self._request_forecast()
+
+    def _send_placement(self):
+        self.remote.send({"op": "place", "cells": [list(cell) for cell in self.placed_cells()],
+                          "budget": self.funds.value})
+
+    def _send_region(self, name):
+        self.remote.send({"op": "select", "region": name})
@@ -0,0 +1,73 @@
+# mixins/ui_replay.py
+import tkinter as tk
+import settings as S
+from replay import restore
+import zobrist
+
+
+class UIReplayMixin:
+    """Read-only viewer for a replay.Recording.
+
+    Seeking restores the recorded state into the live game objects and
+    re-renders the existing panels in place; nothing is rebuilt.
+    """
+
+    def enter_replay(self, recording):
+        self.replay = recording
+        self._hide_card_offer()
+        self.card_offers = []
+        self.canvas.itemconfigure(self.take_action_button_window, state="hidden")
+        self._request_forecast()  # clears the what-if panel; replays have no plan to project
+
+        self.replay_scale = tk.Scale(self.root, from_=0, to=len(recording), orient="horizontal",
+                                     showvalue=False, length=int(self.layout.px(300)),
+                                     command=lambda v: self.replay_seek(int(float(v))))
+        x, y = self.layout.take_button
+        self.replay_scale_window = self.canvas.create_window(x, y, window=self.replay_scale, anchor="e")
+        self.replay_text_id = self.canvas.create_text(
+            *self.layout.toast, anchor="s", fill="#333", font=self.fonts.get(12, "bold"), text=""
+        )
+        for key, step in (("<Left>", -1), ("<Right>", +1), ("<Prior>", -S.REPLAY_KEYFRAME_EVERY),
+                          ("<Next>", +S.REPLAY_KEYFRAME_EVERY)):
+            self.root.bind(key, lambda _e, d=step: self.replay_seek(self.replay_turn + d))
+        self.root.bind("<Home>", lambda _e: self.replay_seek(0))
+        self.root.bind("<End>", lambda _e: self.replay_seek(len(self.replay)))
+        self.replay_turn = -1
+        self.replay_seek(0)
+
+    def replay_seek(self, turn):
+        turn = max(0, min(int(turn), len(self.replay)))
+        if turn == self.replay_turn:
+            return
+        self.replay_turn = turn
+        restore(self, self.replay.state_at(turn))
+        self._refresh_after_restore()
+        self.replay_scale.set(turn)
+        self.canvas.itemconfigure(self.replay_text_id, text=self._replay_caption(turn))
+
+    def _replay_caption(self, turn):
+        head = f"Replay turn {turn}/{len(self.replay)}"
+        action = self.replay.action_at(turn)
+        if not action:
+            return head
+        names = [S.BOARD_LABELS[r * S.GRID_COLS + c].split(":")[0] for r, c in action["cells"]]
+        picks = f" -> {', '.join(action['regions'])}" if action["regions"] else ""
+        return f"{head}: {', '.join(names) or 'pass'}{picks}"
+
+    def _refresh_after_restore(self):
+        """Bring every panel, marker and token in line with the rules state."""
+        self.finish_construction()
+        zobrist.rehash(self)  # the state was written field by field, past the setters
+        self.funds._update_label()
+        for i, cube in enumerate(sorted(self.cubes, key=lambda c: c.idx)):
+            cube.locked = i >= self.ops_available
+            cube.current_cell = None
+        self.occupied.clear()
+        self._reset_tokens_to_tracks()
+        for name in S.REGION_NAMES:
+            self._update_region_panel(name)
+        self._render_region_markers()
+        self._render_tracker_markers()
+        self._render_costs_panel()
+        self.render_hand()
+        self.canvas.itemconfigure(self.deck_text, text=self._deck_label())
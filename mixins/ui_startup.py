@@ -0,0 +1,93 @@
+# mixins/ui_startup.py
+import time
+
+from assets import SpriteAtlas
+
+
+class UIStartupMixin:
+    """Staged construction: the grid and tokens paint first, the rest follows.
+
+    With staged=True, Game.__init__ builds only what the first turn's
+    placements need and queues the sprite atlas, the map, the costs panel
+    and the trackers/region panels as idle stages, the last three behind a
+    placeholder from L.placeholders. Until the sprites are packed the
+    tokens are plain colored squares; the layout is sized from the map's
+    header, and the map is decoded in its own stage. Anything that needs
+    the whole board (take_actions, rescaling, restores) calls
+    finish_construction() first, which runs the remaining stages at once.
+
+    startup_ms records "first_frame" (the first idle moment after the
+    interactive board was built, i.e. after Tk painted it) and "ready".
+    """
+
+    def _start_construction(self, t0, staged):
+        self._t0 = t0
+        self.startup_ms = {}
+        # (stage, indices into L.placeholders it replaces)
+        self._stages = [(self._stage_sprites, ()), (self._stage_map, (0,)), (self._stage_panels, (1, 2))]
+        self._placeholder_ids = {}
+        if not staged:
+            self.finish_construction()
+            return
+        for i, (x0, y0, x1, y1) in enumerate(self.layout.placeholders):
+            if x1 > x0 and y1 > y0:
+                self._placeholder_ids[i] = (
+                    self.canvas.create_rectangle(x0, y0, x1, y1, outline="#ccccd6", dash=(4, 2), fill="#eeeef3"),
+                    self.canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2, text="Loading…", fill="#999",
+                                            font=self.fonts.get(12)),
+                )
+        self.timers.schedule_idle("build", self._run_next_stage)
+
+    @property
+    def constructed(self):
+        return not self._stages
+
+    def _elapsed_ms(self):
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def _run_next_stage(self):
+        self.startup_ms.setdefault("first_frame", self._elapsed_ms())
+        if self._stages:
+            self._run_stage()
+        if self._stages:
+            self.timers.schedule_idle("build", self._run_next_stage)
+        else:
+            self._construction_done()
+
+    def finish_construction(self):
+        """Run every outstanding stage now (a no-op once the board is complete)."""
+        if not self._stages:
+            return
+        self.timers.cancel("build")
+        self.startup_ms.setdefault("first_frame", self._elapsed_ms())
+        while self._stages:
+            self._run_stage()
+        self._construction_done()
+
+    def _run_stage(self):
+        stage, placeholders = self._stages.pop(0)
+        stage()
+        for i in placeholders:
+            if i in self._placeholder_ids:
+                self.canvas.delete(*self._placeholder_ids.pop(i))
+
+    def _construction_done(self):
+        self.startup_ms["ready"] = self._elapsed_ms()
+        if self.on_ready is not None:
+            self.on_ready(self)
+
+    # --- stages ---
+    def _stage_sprites(self):
+        self.assets.atlas = SpriteAtlas.from_dirs()
+        self.assets.clear()
+        for cube in self.cubes:
+            cube.set_image(self._token_art(cube.idx))
+
+    def _stage_map(self):
+        if self._load_side_image():
+            self._draw_side_image()
+        self._build_region_hitboxes()
+        self._render_region_markers()
+
+    def _stage_panels(self):
+        self._draw_trackers()  # costs panel, tracker rows and region panels
@@ -10,6 +10,8 @@ class Region:
         self.reputation = 0
         self.power = 0
 
+        self.zobrist = None     # zobrist.Zobrist kept current by the setters below
+
         # UI hooks (optional; used by Game)
         self.canvas = None
         self.tracker_ids = None  # legacy; no longer required
@@ -18,8 +20,13 @@ class Region:
         """Kept for compatibility; panels are handled by Game now."""
         self.canvas = canvas
 
+    def _moved(self, field, old, new):
+        if self.zobrist is not None:
+            self.zobrist.move((field, self.name), old, new)
+
     def set_presence(self, value: bool = True):
-        self.player_presence = bool(value)
+        old, self.player_presence = self.player_presence, bool(value)
+        self._moved("presence", old, self.player_presence)
 
     @property
     def presence(self):  # compatibility alias
@@ -29,13 +36,18 @@ class Region:
         # Clamp and snap to steps of 10
         v = max(0, min(int(value), S.CHAOS_MAX))
         v = (v // S.CHAOS_STEP) * S.CHAOS_STEP
-        self.chaos = v
+        old, self.chaos = self.chaos, v
+        self._moved("chaos", old, v)
 
     def adjust_rep(self, delta: int):
+        old = self.reputation
         self.reputation += int(delta)
+        self._moved("rep", old, self.reputation)
 
     def adjust_power(self, delta: int):
+        old = self.power
         self.power += int(delta)
+        self._moved("power", old, self.power)
 
 
 class RegionManager:
@@ -0,0 +1,182 @@
+"""Recorded games for the replay viewer.
+
+A Recording keeps the per-turn action log (placements, region picks, card
+keeps) plus the state after every turn: a full keyframe every
+S.REPLAY_KEYFRAME_EVERY turns and only the changed fields in between.
+Draw piles are whole only in keyframes; a turn's delta lists just the
+card ids drawn from and returned to each pile.
+state_at(turn) starts from the nearest keyframe at or before `turn` and
+applies at most K-1 deltas, so seeking costs the same anywhere in a
+200-turn game.
+
+    python replay.py --strategy economy --seed 3 --turns 200 game.json
+    python main.py --replay game.json
+"""
+import argparse
+import json
+
+import settings as S
+from rules import SimGame
+from strategies import STRATEGIES, get_strategy
+
+
+def snapshot(game) -> dict:
+    """Flat, JSON-able copy of the rules state of a Game or SimGame."""
+    state = {
+        "turn": game.turn,
+        "funds": game.funds.value,
+        "compute": game.compute_idx,
+        "model": game.model_idx,
+        "ops_available": game.ops_available,
+        "ops_aspirational": game.ops_aspirational,
+        "hand": list(game.hand),
+    }
+    for t in S.CARD_TYPES:
+        state[f"deck:{t}"] = sorted(game.deck[t].ids())  # a set: draws are uniform, so order is irrelevant
+    for key, n in game.funds.counters.items():
+        state[f"counter:{key}"] = n
+    for r in game.regions.regions.values():
+        state[f"{r.name}:rep"] = r.reputation
+        state[f"{r.name}:power"] = r.power
+        state[f"{r.name}:chaos"] = r.chaos
+        state[f"{r.name}:presence"] = r.player_presence
+    return state
+
+
+def restore(game, state):
+    """Write a snapshot() back into a game's rules state (no redraw)."""
+    game.turn = state["turn"]
+    game.funds.value = state["funds"]
+    for key in game.funds.counters:
+        game.funds.counters[key] = state[f"counter:{key}"]
+    game.compute_idx, game.model_idx = state["compute"], state["model"]
+    game.ops_available, game.ops_aspirational = state["ops_available"], state["ops_aspirational"]
+    game.hand = list(state["hand"])
+    if f"deck:{S.CARD_TYPES[0]}" in state:  # recordings saved before the piles were kept lack them
+        game.deck.restore(tuple(tuple(state[f"deck:{t}"]) for t in S.CARD_TYPES))
+    for r in game.regions.regions.values():
+        r.reputation = state[f"{r.name}:rep"]
+        r.power = state[f"{r.name}:power"]
+        r.chaos = state[f"{r.name}:chaos"]
+        r.player_presence = state[f"{r.name}:presence"]
+
+
+def _delta(old, new) -> dict:
+    """What turns state `old` into `new`: changed fields, and each pile's drawn/returned ids."""
+    delta = {k: v for k, v in new.items() if not k.startswith("deck:") and old.get(k) != v}
+    for t in S.CARD_TYPES:
+        before, after = set(old[f"deck:{t}"]), set(new[f"deck:{t}"])
+        if before != after:
+            delta[f"drawn:{t}"] = sorted(before - after)
+            delta[f"returned:{t}"] = sorted(after - before)
+    return delta
+
+
+def _apply(state, delta):
+    state.update((k, v) for k, v in delta.items() if not k.startswith(("drawn:", "returned:")))
+    for t in S.CARD_TYPES:
+        if f"drawn:{t}" in delta:
+            pile = set(state[f"deck:{t}"]).difference(delta[f"drawn:{t}"])
+            state[f"deck:{t}"] = sorted(pile.union(delta[f"returned:{t}"]))
+
+
+class Recording:
+    def __init__(self, seed=None, strategy=None, keyframe_every=None):
+        self.seed = seed
+        self.strategy = strategy
+        self.keyframe_every = keyframe_every or S.REPLAY_KEYFRAME_EVERY
+        self.actions = []    # per turn: {"cells", "regions", "keeps"}
+        self.keyframes = {}  # turn -> full state
+        self.deltas = []     # deltas[t - 1] turns state t-1 into state t
+        self._last = None
+
+    def __len__(self):
+        return len(self.actions)
+
+    def start(self, game):
+        self._last = snapshot(game)
+        self.keyframes[0] = self._last
+
+    def add_turn(self, game, action):
+        state = snapshot(game)
+        self.actions.append(action)
+        self.deltas.append(_delta(self._last, state))
+        if len(self.actions) % self.keyframe_every == 0:
+            self.keyframes[len(self.actions)] = state
+        self._last = state
+
+    def state_at(self, turn) -> dict:
+        turn = max(0, min(turn, len(self)))
+        base = turn - turn % self.keyframe_every
+        state = dict(self.keyframes[base])
+        for delta in self.deltas[base:turn]:
+            _apply(state, delta)
+        return state
+
+    def action_at(self, turn):
+        """The action that led to `turn` (None for the start)."""
+        return self.actions[turn - 1] if 0 < turn <= len(self) else None
+
+    def save(self, path):
+        with open(path, "w") as fh:
+            json.dump({"seed": self.seed, "strategy": self.strategy, "keyframe_every": self.keyframe_every,
+                       "actions": self.actions, "keyframes": {str(k): v for k, v in self.keyframes.items()},
+                       "deltas": self.deltas}, fh)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as fh:
+            data = json.load(fh)
+        rec = cls(data["seed"], data["strategy"], data["keyframe_every"])
+        rec.actions = data["actions"]
+        rec.keyframes = {int(k): v for k, v in data["keyframes"].items()}
+        rec.deltas = data["deltas"]
+        return rec
+
+
+class _RecordingStrategy:
+    """Wraps a strategy and notes its region picks."""
+
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.regions = []
+
+    def place(self, game):
+        return self.strategy.place(game)
+
+    def pick_region(self, game, task_type, candidates):
+        name = self.strategy.pick_region(game, task_type, candidates)
+        self.regions.append(name)
+        return name
+
+    def keep_card(self, game, offered):
+        return self.strategy.keep_card(game, offered)
+
+
+def record_game(strategy_name, seed=None, turns=None) -> Recording:
+    """Play a headless game and return its Recording."""
+    rec = Recording(seed, strategy_name)
+    strategy = _RecordingStrategy(get_strategy(strategy_name))
+    game = SimGame(seed)
+    rec.start(game)
+    for _ in range(S.SIM_TURNS if turns is None else turns):
+        cells = strategy.place(game)
+        kept = game.play_turn(cells, strategy)["kept"]
+        rec.add_turn(game, {"cells": [list(c) for c in cells], "regions": strategy.regions, "keeps": kept})
+        strategy.regions = []
+    return rec
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Record a headless game for the replay viewer.")
+    ap.add_argument("out", help="recording file (.json)")
+    ap.add_argument("--strategy", default="economy", choices=list(STRATEGIES))
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--turns", type=int, default=S.SIM_TURNS)
+    args = ap.parse_args(argv)
+    record_game(args.strategy, args.seed, args.turns).save(args.out)
+    print(f"{args.turns} turns -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Turn rules shared by the Tk game and headless tools.
+
+Game resolves "Take Actions" through these helpers, and SimGame plays a
+whole game with them without any canvas, so simulations and the UI cannot
+drift apart on what a placement asks for, what it charges or how the
+trackers move.
+"""
+import random
+from functools import lru_cache
+
+import settings as S
+import zobrist
+from cards import DeckSet, load_catalog
+from funds import Funds
+from regions import RegionManager
+
+
+@lru_cache(maxsize=8)
+def _board_cells(rows, cols):
+    return tuple((r, c) for r in range(rows) for c in range(cols))
+
+
+def all_cells() -> tuple:
+    """Every board cell, row-major, for the board size in settings now."""
+    return _board_cells(S.GRID_ROWS, S.GRID_COLS)
+
+
+ALL_CELLS = all_cells()  # the standard board, for the fixed-shape tables built at import
+
+# (cell, task type, requires presence), in the order the region picks are asked for
+REGION_TASKS = (
+    ((1, 1), "add_presence", False),
+    ((1, 0), "rep+1", True),
+    ((1, 2), "power+1", True),
+    ((2, 1), "power+1_rep-2_chaos+10", True),
+    ((2, 2), "rep-1_chaos+10", True),
+)
+
+CHARGE_KEYS = ("lobby", "scale_presence", "compute_or_model", "scale_operations")
+
+
+def needs_presence(cells) -> bool:
+    return any(cell in S.PRESENCE_REQUIRED_COORDS for cell in cells)
+
+
+def selection_tasks(cells) -> list:
+    """Region picks the placed cells ask for."""
+    cells = list(cells)
+    tasks = []
+    for cell, kind, requires in REGION_TASKS:
+        for _ in range(cells.count(cell)):
+            tasks.append({"type": kind, "requires_presence": requires})
+    return tasks
+
+
+def apply_region_task(regions, task_type, name) -> bool:
+    """Apply one region pick; returns True when it added presence."""
+    R = regions[name]
+    if task_type == "add_presence":
+        if R.player_presence:
+            return False
+        regions.add_presence(name)
+        return True
+    if task_type == "rep+1":
+        R.adjust_rep(+1)
+    elif task_type == "power+1":
+        R.adjust_power(+1)
+    elif task_type == "power+1_rep-2_chaos+10":
+        R.adjust_power(+1); R.adjust_rep(-2); R.set_chaos(R.chaos + S.CHAOS_STEP)
+    elif task_type == "rep-1_chaos+10":
+        R.adjust_rep(-1); R.set_chaos(R.chaos + S.CHAOS_STEP)
+    return False
+
+
+def turn_effects(cells):
+    """(compute bumps, model bumps, charges) for the placed cells."""
+    bumps_compute = bumps_model = 0
+    charges = dict.fromkeys(CHARGE_KEYS, 0)
+    for r, c in cells:
+        if (r, c) == (0, 0):
+            bumps_compute += 1; charges["compute_or_model"] += 1
+        elif (r, c) == (0, 1):
+            bumps_model += 1; charges["compute_or_model"] += 1
+        if (r, c) == (0, 2):
+            charges["scale_operations"] += 1
+        if (r, c) == (1, 1):
+            charges["scale_presence"] += 1
+    return bumps_compute, bumps_model, charges
+
+
+def preview_charges(cells) -> dict:
+    """Charges shown (and gated on) before the turn is taken."""
+    charges = dict.fromkeys(CHARGE_KEYS, 0)
+    for r, c in cells:
+        if (r, c) in ((0, 0), (0, 1)): charges["compute_or_model"] += 1
+        if (r, c) == (0, 2): charges["lobby"] += 1
+        if (r, c) == (1, 1): charges["scale_presence"] += 1
+        if (r, c) == (0, 2): charges["scale_operations"] += 1
+    return charges
+
+
+def pending_cost(funds, cells) -> int:
+    charges = preview_charges(cells)
+    return (funds.peek_cost("compute_or_model", charges["compute_or_model"])
+            + funds.peek_cost("lobby", charges["lobby"])
+            + funds.peek_cost("scale_presence", charges["scale_presence"]))
+
+
+@lru_cache(maxsize=8)
+def _board_charges(rows, cols):
+    return {cell: tuple((k, n) for k, n in preview_charges([cell]).items() if n) for cell in _board_cells(rows, cols)}
+
+
+def cell_charges() -> dict:
+    """Preview charge counts one token adds on each cell of the current board."""
+    return _board_charges(S.GRID_ROWS, S.GRID_COLS)
+
+
+class TurnLedger:
+    """Running totals for the tokens currently on the board.
+
+    add()/remove() are called as single tokens land or are lifted, so the
+    cost preview and Take Actions gating never rescan the board.
+    """
+
+    def __init__(self):
+        self.cells = {}
+        self.charges = dict.fromkeys(CHARGE_KEYS, 0)
+        self.placed = 0
+        self.presence_needed = 0
+
+    def _apply(self, cell, sign):
+        charges = cell_charges().get(cell)
+        if charges is None:  # off the board
+            return
+        self.cells[cell] = self.cells.get(cell, 0) + sign
+        if not self.cells[cell]:
+            del self.cells[cell]
+        for key, n in charges:
+            self.charges[key] += sign * n
+        self.placed += sign
+        if cell in S.PRESENCE_REQUIRED_COORDS:
+            self.presence_needed += sign
+
+    def add(self, cell):
+        self._apply(cell, +1)
+
+    def remove(self, cell):
+        self._apply(cell, -1)
+
+    def clear(self):
+        self.__init__()
+
+    def placed_cells(self):
+        return [cell for cell, n in self.cells.items() for _ in range(n)]
+
+    def pending_cost(self, funds) -> int:
+        c = self.charges
+        return (funds.peek_cost("compute_or_model", c["compute_or_model"])
+                + funds.peek_cost("lobby", c["lobby"])
+                + funds.peek_cost("scale_presence", c["scale_presence"]))
+
+    def blocker(self, funds, regions):
+        """Why Take Actions is unavailable ("" when it is)."""
+        if self.pending_cost(funds) > funds.value:
+            return "Insufficient Funds"
+        if self.presence_needed and not regions.any_presence():
+            return "Requires presence in a region"
+        return ""
+
+
+def advance_trackers(compute_idx, model_idx, bumps_compute=0, bumps_model=0):
+    """New (compute, model) indices; the model can never pass compute."""
+    if bumps_compute:
+        compute_idx = min(compute_idx + bumps_compute, len(S.COMPUTE_STEPS) - 1)
+        model_idx = min(model_idx, compute_idx)
+    if bumps_model:
+        model_idx = min(model_idx + bumps_model, compute_idx, len(S.MODEL_STEPS) - 1)
+    return compute_idx, model_idx
+
+
+def turn_income(regions) -> int:
+    return regions.total_reputation() * regions.total_power()
+
+
+class SimGame:
+    """One game without Tk: the same state Game keeps, minus the canvas.
+
+    A strategy (see strategies.py) supplies placements, region picks and
+    card choices; play_turn() resolves them exactly as Game does.
+    """
+
+    def __init__(self, seed=None, catalog=None, telemetry=None):
+        self.seed = seed
+        self.telemetry = telemetry  # optional telemetry.TelemetryWriter
+        self.rng = random.Random(seed)
+        self.regions = RegionManager()
+        self.funds = Funds(S.FUNDS_START, S.FUNDS_SERIES, None, 0, 0)
+        self.catalog = catalog or load_catalog()
+        self.deck = DeckSet(self.catalog, self.rng)
+        self.hand = []
+        self.compute_idx = 0
+        self.model_idx = 0
+        self.ops_available = S.OPS_START_AVAILABLE
+        self.ops_aspirational = S.OPS_START_ASPIRATIONAL
+        self.turn = 0
+        zobrist.attach(self, fresh=True)
+
+    def legal_cells(self):
+        """Cells a token may go on this turn (ignoring cost)."""
+        cells = all_cells()
+        if self.regions.any_presence():
+            return list(cells)
+        return [cell for cell in cells if cell not in S.PRESENCE_REQUIRED_COORDS]
+
+    def can_take(self, cells) -> bool:
+        cells = list(cells)
+        if len(cells) > self.ops_available or len(set(cells)) != len(cells):
+            return False
+        board = cell_charges()
+        if any(cell not in board for cell in cells):
+            return False
+        if needs_presence(cells) and not self.regions.any_presence():
+            return False
+        return pending_cost(self.funds, cells) <= self.funds.value
+
+    def play_turn(self, cells, strategy) -> dict:
+        """Resolve one turn; returns {"charges", "income", "kept"}."""
+        cells = list(cells)
+        if not self.can_take(cells):
+            raise ValueError(f"Illegal placement {cells}")
+        funds_before = self.funds.value
+
+        for task in selection_tasks(cells):
+            if task["requires_presence"]:
+                candidates = [r.name for r in self.regions.with_presence()]
+            else:
+                candidates = list(S.REGION_NAMES)
+            name = strategy.pick_region(self, task["type"], candidates)
+            apply_region_task(self.regions, task["type"], name)
+
+        offers = []
+        for row, col in cells:
+            if col != S.GRID_COLS - 1 or row not in S.FINAL_COLUMN_CARD_TYPES:
+                continue
+            if len(self.hand) + len(offers) >= S.HAND_LIMIT:
+                continue
+            drawn = self.deck.draw(S.FINAL_COLUMN_CARD_TYPES[row], S.CARD_DRAW_COUNT)
+            if drawn:
+                offers.append(drawn)
+
+        if (0, 1) in cells:
+            for r in self.regions.with_presence():
+                r.adjust_rep(+1); r.adjust_power(+1)
+
+        bumps_compute, bumps_model, charges = turn_effects(cells)
+        trackers = zobrist.tracker_values(self)
+        ops_to_add = charges["scale_operations"]
+        while ops_to_add > 0 and self.ops_available < S.OPS_MAX_TOKENS and self.ops_aspirational > 0:
+            self.ops_available += 1
+            self.ops_aspirational -= 1
+            ops_to_add -= 1
+        self.compute_idx, self.model_idx = advance_trackers(
+            self.compute_idx, self.model_idx, bumps_compute, bumps_model)
+        self.zobrist.move_all(zobrist.TRACKERS, trackers, zobrist.tracker_values(self))
+
+        for key, n in charges.items():
+            if n: self.funds.charge(key, n)
+        income = turn_income(self.regions)
+        if income: self.funds.add(income)
+
+        # Offers are settled after income, as they are in the UI
+        kept = []
+        for drawn in offers:
+            index = strategy.keep_card(self, drawn)
+            if index is not None and self.catalog.costs[drawn[index]] <= self.funds.value:
+                card = drawn[index]
+                self.funds.pay(self.catalog.costs[card])
+                self.hand.append(card)
+                self.zobrist.move(("hand", card), False, True)
+                kept.append(card)
+                drawn = drawn[:index] + drawn[index + 1:]
+            self.deck.put_back(drawn)
+
+        self.turn += 1
+        if self.telemetry is not None:
+            self.telemetry.record_turn(self, funds_before, charges, income)
+        return {"charges": charges, "income": income, "kept": kept}
+
+    def outcome(self) -> dict:
+        regions = self.regions.regions.values()
+        return {
+            "funds": self.funds.value,
+            "compute": self.compute_idx,
+            "model": self.model_idx,
+            "ops": self.ops_available,
+            "presence": sum(r.player_presence for r in regions),
+            "reputation": self.regions.total_reputation(),
+            "power": self.regions.total_power(),
+            "chaos": sum(r.chaos for r in regions),
+            "hand": len(self.hand),
+        }
+
+
+def play_game(strategy, seed=None, turns=None, catalog=None, telemetry=None) -> SimGame:
+    """Play `turns` (default S.SIM_TURNS) turns of `strategy` from `seed`."""
+    game = SimGame(seed, catalog, telemetry)
+    for _ in range(S.SIM_TURNS if turns is None else turns):
+        game.play_turn(strategy.place(game), strategy)
+    return game
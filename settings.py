@@ -7,9 +7,11 @@ CELL_SIZE = 140
 GRID_PADDING = 20
 GRID_ORIGIN_X = 300
 GRID_ORIGIN_Y = 40
+GRID_CULL_CELLS = 64  # larger boards draw only the cells in view (and scroll); smaller ones draw all
 
 # Cube layout
 CUBE_SIZE = 64
+TOKEN_SIZE = 60  # drawn size of an action token
 CUBE_GAP = 16
 START_AREA_X = 40
 START_AREA_Y = 40
@@ -52,6 +54,22 @@ BOARD_LABELS = [
 # Actions that require selecting a region where the player ALREADY has presence
 PRESENCE_REQUIRED_COORDS = {(1,0), (1,2), (2,1), (2,2)}
 
+# --- Cards ---
+# Catalog rows: id,type,cost,name,effect (effect is a ';'-joined list like "rep+1;chaos+10")
+CARD_CATALOG_PATH = "data/cards.csv"
+CARD_TYPES = ("RESEARCH", "INFLUENCE", "CHAOS")
+# Final-column row -> deck it draws from
+FINAL_COLUMN_CARD_TYPES = {0: "RESEARCH", 1: "INFLUENCE", 2: "CHAOS"}
+CARD_DRAW_COUNT = 3  # draw 3, keep 1
+CARD_TYPE_COLORS = {"RESEARCH": "#e3f0ff", "INFLUENCE": "#e8f7e4", "CHAOS": "#fde7e7"}
+
+# --- Art assets (packed into atlases at startup; missing dirs are fine) ---
+# Sprite names are "<group>/<file stem>", e.g. "cards/12", "tokens/C1", "markers/hex"
+ASSET_DIRS = {"cards": "images/cards", "tokens": "images/tokens", "markers": "images/markers"}
+ATLAS_MAX_W = 2048                       # atlas sheet width/height
+ASSET_SIZE_BUCKET = 16                   # requested sizes snap down to multiples of this
+ASSET_CACHE_MAX_BYTES = 32 * 1024 * 1024 # PhotoImage LRU cap (4 bytes/pixel)
+
 
 # Side image (to the right of the grid)
 SIDE_IMAGE_PATH = "images/Continents.jpg"
@@ -131,6 +149,9 @@ REGION_HEX_WIDTH = 3
 
 # Tracker geometry
 TRACKER_ROW_H = 36
+TRACKER_LABEL_W = 110
+TRACKER_BOX_W = 120
+TRACKER_BOX_GAP = 8
 
 # We now show: 2 fixed rows (Compute, Model) + one chaos row per region
 TRACKERS_EXTRA_ROWS = 2 + len(REGION_NAMES)
@@ -150,3 +171,68 @@ REGION_PANEL_GAP_X = 16
 REGION_PANEL_GAP_Y = 14
 REGION_PANELS_TITLE = "Regions"
 
+# --- Window scaling ---
+# All geometry above is in design pixels; the layout scales it to fit the window.
+LAYOUT_MIN_SCALE = 0.35
+LAYOUT_MAX_SCALE = 3.0
+RELAYOUT_DEBOUNCE_MS = 150  # re-resample the map / refit fonts once resizing settles
+SCROLL_UNITS = 3            # canvas scroll units per mouse-wheel notch
+
+# --- Headless simulation (balance tools) ---
+SIM_TURNS = 20  # turns per simulated game (the board game itself has no end condition yet)
+
+# --- Telemetry (opt-in per-turn records; see telemetry.py) ---
+TELEMETRY_CHUNK_ROWS = 256  # rows buffered before a chunk is handed to the writer thread
+
+# --- Game-record store (game_store.py) ---
+STORE_CHUNK_ROWS = 1 << 16  # records per chunk when scanning or indexing a store
+
+# --- Replay viewer (replay.py) ---
+REPLAY_KEYFRAME_EVERY = 16  # full-state keyframe interval; seeks apply at most this many - 1 deltas
+
+# --- Undo/redo (history.py) ---
+UNDO_LIMIT = 500  # steps kept; snapshots share unchanged parts, so each step is small
+
+# --- Map heat-map overlay (heatmap.py) ---
+HEATMAP_COLORS = {"chaos": (220, 30, 30), "reputation": (30, 110, 230), "power": (150, 40, 200)}
+HEATMAP_ALPHA = 0.75          # tint strength for a region at the top of the scale
+HEATMAP_LAND_THRESHOLD = 200  # map pixels whose darkest channel is below this are land
+HEATMAP_CACHE = 64            # composited overlays kept, keyed by map size + region values
+HEATMAP_POLL_MS = 30          # how often the UI checks for a finished overlay
+
+# --- State fingerprint and evaluation cache (zobrist.py) ---
+ZOBRIST_KEY_CACHE = 1 << 16  # memoised (feature, value) keys; funds values make the domain open-ended
+EVAL_CACHE_SIZE = 4096       # evaluations kept by zobrist.EVAL_CACHE, least recently used dropped first
+
+# --- Autosave (autosave.py) ---
+AUTOSAVE_INTERVAL_MS = 30_000  # periodic save while a turn is being planned (each finished turn also saves)
+AUTOSAVE_ROTATIONS = 3         # older saves kept beside the newest, as PATH.1 .. PATH.N
+AUTOSAVE_ERROR_TOAST_MS = 4000  # how long a failed save stays on the board
+
+# --- What-if forecaster panel (forecast.py) ---
+FORECAST_TURNS = 5      # turns projected ahead, repeating the placement on the board
+FORECAST_SEED = 0       # fixed draws, so a state and placement always project alike
+FORECAST_POLL_MS = 30   # how often the UI checks for a finished projection
+FORECAST_PANEL_W = 330
+FORECAST_LINE_H = 18
+
+# --- Animation (animation.py) ---
+ANIMATION_FPS = 60     # frame rate of the one animation loop; late frames are dropped, not queued
+ANIMATION_MS = 220     # token slides (drops onto cells, back to the tracks)
+CARD_FLY_MS = 320      # a card flying from the deck or an offer into its hand slot
+
+# --- Multi-session game host (host.py) ---
+HOST_MAX_FRAME = 1 << 16        # largest message accepted, in bytes; a bigger length prefix closes the connection
+HOST_SEND_BUFFER = 1 << 20      # a client this many unsent bytes behind is dropped
+HOST_BOT_TURN_MS = 250          # pause between turns of a bot match
+HOST_POLL_MS = 30               # how often an attached window checks for host messages
+
+# --- Shared-memory worker results (shm_ring.py) ---
+SHM_RING_CAPACITY = 4096   # records per worker ring; a worker this far ahead of the parent waits
+SHM_RING_WAIT_S = 0.0002   # a waiting worker's poll interval
+SHM_RING_POLL_S = 0.002    # how often the parent drains the rings while jobs run
+
+# --- Packed state encoding (state_codec.py) ---
+STATE_FUNDS_BITS = 32    # funds keep growing in long games; 2**32 - 1 is the most that packs
+STATE_COUNTER_BITS = 16  # each funds-series counter
+STATE_REGION_BITS = 16   # reputation and power, signed (reputation can go negative)
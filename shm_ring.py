@@ -0,0 +1,199 @@
+"""Worker results through shared memory instead of pickles.
+
+Every worker process gets its own RecordRing: a block of
+multiprocessing.shared_memory holding a fixed number of int64 records of
+a fixed width, plus three counters (records written, records read, shut).
+The worker is the only writer and the parent the only reader, so no lock
+is needed: a record is written before the write counter moves past it,
+and its slot is reused only after the read counter has.
+
+The parent reads pending records as a NumPy view of the block (no copy,
+no unpickling) and releases them when it has taken what it needs. A
+worker that gets S.SHM_RING_CAPACITY records ahead waits for space, so a
+parent that falls behind slows the workers down instead of growing a
+queue without bound.
+
+run_pool() maps a job function over worker processes with one ring each
+and hands every batch of records to a callback as it arrives:
+
+    def job(args):
+        ring = worker_ring()
+        for row in rows_for(args):
+            ring.put(row)
+
+    run_pool(job, work, workers=16, width=10, on_records=lambda rows: ...)
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import settings as S
+
+_HEAD, _TAIL, _SHUT = range(3)  # counter slots at the start of the block
+_COUNTERS = 3
+
+
+class RingClosed(Exception):
+    """The reader shut the ring (it gave up on the run); the writer should stop."""
+
+
+class RecordRing:
+    """Single-writer, single-reader ring of int64 records in shared memory.
+
+    RecordRing(width, capacity) creates a block (the creator unlinks it on
+    close()); RecordRing.attach(spec) maps an existing one by its spec.
+    """
+
+    def __init__(self, width, capacity=None, _name=None):
+        self.width = width
+        self.capacity = S.SHM_RING_CAPACITY if capacity is None else capacity
+        self.owner = _name is None
+        size = 8 * (_COUNTERS + self.capacity * width)
+        self.shm = SharedMemory(name=_name, create=self.owner, size=size if self.owner else 0)
+        self._counters = np.ndarray(_COUNTERS, dtype=np.int64, buffer=self.shm.buf)
+        self.records = np.ndarray((self.capacity, width), dtype=np.int64, buffer=self.shm.buf,
+                                  offset=8 * _COUNTERS)
+        if self.owner:
+            self._counters[:] = 0
+        self.stalls = 0  # put()s that had to wait for space
+
+    @classmethod
+    def attach(cls, spec):
+        name, width, capacity = spec
+        return cls(width, capacity, _name=name)
+
+    @property
+    def spec(self):
+        """(name, width, capacity): what another process needs to attach."""
+        return self.shm.name, self.width, self.capacity
+
+    def __len__(self):
+        return int(self._counters[_HEAD] - self._counters[_TAIL])
+
+    @property
+    def shut(self):
+        return bool(self._counters[_SHUT])
+
+    # --- writer side ---
+
+    def put(self, record, timeout=None):
+        """Append one record (up to `width` values, the rest zero); waits while the ring is full."""
+        head = int(self._counters[_HEAD])
+        if head - int(self._counters[_TAIL]) >= self.capacity:
+            self.stalls += 1
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while head - int(self._counters[_TAIL]) >= self.capacity:
+                if self._counters[_SHUT]:
+                    raise RingClosed(self.shm.name)
+                if deadline is not None and time.monotonic() > deadline:
+                    raise TimeoutError(f"ring {self.shm.name} stayed full for {timeout}s")
+                time.sleep(S.SHM_RING_WAIT_S)
+        if self._counters[_SHUT]:
+            raise RingClosed(self.shm.name)
+        slot = self.records[head % self.capacity]
+        n = len(record)
+        slot[:n] = record
+        slot[n:] = 0
+        self._counters[_HEAD] = head + 1  # publish only once the record is complete
+
+    # --- reader side ---
+
+    def pending(self):
+        """The records written and not yet released, oldest first, as a view (up to the wrap)."""
+        tail = int(self._counters[_TAIL])
+        start = tail % self.capacity
+        n = min(int(self._counters[_HEAD]) - tail, self.capacity - start)
+        return self.records[start:start + n]
+
+    def release(self, n):
+        """Hand the `n` oldest pending slots back to the writer."""
+        self._counters[_TAIL] += n
+
+    def drain(self, on_records):
+        """Pass every pending batch to on_records(view), releasing each after; returns the count."""
+        total = 0
+        while True:
+            batch = self.pending()
+            if not len(batch):
+                return total
+            on_records(batch)
+            total += len(batch)
+            self.release(len(batch))
+
+    def shut_down(self):
+        """Tell the writer to stop: a put() that would wait raises RingClosed instead."""
+        self._counters[_SHUT] = 1
+
+    def close(self):
+        """Unmap the block (and unlink it, for the creator). Views from pending() must be gone."""
+        if self.shm is None:
+            return
+        self._counters = self.records = None  # the buffer cannot be unmapped while exported
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+        self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_worker_ring = None
+
+
+def _attach_worker(specs):
+    global _worker_ring
+    _worker_ring = RecordRing.attach(specs.get())
+
+
+def worker_ring() -> RecordRing:
+    """The ring of the run_pool() worker this is called in."""
+    if _worker_ring is None:
+        raise RuntimeError("worker_ring() is only available inside a run_pool() job")
+    return _worker_ring
+
+
+def run_pool(fn, work, workers, width, on_records, capacity=None, on_done=None):
+    """Run fn(job) for every job in `work` on `workers` processes, one ring each.
+
+    Jobs write records with worker_ring().put(); on_records(view) gets them
+    in batches as they arrive, in each worker's order (views are only valid
+    during the call). on_done(done, total) is called as jobs finish.
+    Returns the jobs' return values in `work` order. Shared memory is
+    released however the run ends; a worker error is re-raised here.
+    """
+    ctx = get_context()
+    rings = [RecordRing(width, capacity) for _ in range(workers)]
+    specs = ctx.Queue()
+    for ring in rings:
+        specs.put(ring.spec)
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                               initializer=_attach_worker, initargs=(specs,))
+    try:
+        futures = [pool.submit(fn, job) for job in work]
+        running = set(futures)
+        while running:
+            done, running = wait(running, timeout=S.SHM_RING_POLL_S, return_when=FIRST_COMPLETED)
+            for ring in rings:
+                ring.drain(on_records)
+            for future in done:
+                future.result()
+            if on_done is not None and done:
+                on_done(len(futures) - len(running), len(futures))
+        for ring in rings:  # a job's last records land before its future resolves
+            ring.drain(on_records)
+        return [future.result() for future in futures]
+    finally:
+        for ring in rings:
+            ring.shut_down()  # release any worker still waiting for space
+        pool.shutdown(cancel_futures=True)
+        for ring in rings:
+            ring.close()
+        specs.close()
+        specs.join_thread()
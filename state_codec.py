@@ -0,0 +1,186 @@
+"""Canonical bit-packed encoding of a game's rule state.
+
+encode() packs everything the rules look at into size() bytes -- 56 on
+the standard board with its six regions and 48-card catalog -- for
+transposition tables, dedup of visited states and position archives.
+decode() turns the bytes back into plain values and restore() into a Game
+or SimGame.
+
+Fields, from the least significant bit up (the bytes are little-endian):
+
+    occupancy   one bit per board cell, row-major: a token stands on it
+    funds       S.STATE_FUNDS_BITS, unsigned
+    counters    S.STATE_COUNTER_BITS each, in S.FUNDS_SERIES order
+    trackers    compute index, model index, ops available, ops aspirational
+    regions     per region in S.REGION_NAMES order: presence bit, then
+                reputation and power (S.STATE_REGION_BITS each, two's
+                complement), then chaos / S.CHAOS_STEP
+    hand, deck  one bit per card id (0 up to the catalog's largest)
+
+The encoding is canonical: equal positions give equal bytes. For that
+the hand and the draw piles are sets (the rules never depend on their
+order; draws are uniform), and the turn number is left out, as it is
+from the zobrist fingerprint. A value too wide for its field raises
+ValueError instead of wrapping into some other state.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+import settings as S
+import zobrist
+
+
+class Widths(NamedTuple):
+    cells: int
+    funds: int
+    counter: int
+    compute: int
+    model: int
+    ops: int
+    value: int  # reputation and power
+    chaos: int
+    cards: int  # card id space: the hand and deck bitsets
+    size: int   # bytes
+
+
+@lru_cache(maxsize=16)
+def _widths(cells, counters, regions, cards, funds, counter, value, compute, model, ops, chaos):
+    bits = cells + funds + counters * counter + compute + model + 2 * ops
+    bits += regions * (1 + 2 * value + chaos) + 2 * cards
+    return Widths(cells, funds, counter, compute, model, ops, value, chaos, cards, -(-bits // 8))
+
+
+def widths(catalog) -> Widths:
+    """Field widths (and the encoded size) for `catalog` under the current settings."""
+    return _widths(S.GRID_ROWS * S.GRID_COLS, len(S.FUNDS_SERIES), len(S.REGION_NAMES), len(catalog.types),
+                   S.STATE_FUNDS_BITS, S.STATE_COUNTER_BITS, S.STATE_REGION_BITS,
+                   (len(S.COMPUTE_STEPS) - 1).bit_length(), (len(S.MODEL_STEPS) - 1).bit_length(),
+                   S.OPS_MAX_TOKENS.bit_length(), (S.CHAOS_MAX // S.CHAOS_STEP).bit_length())
+
+
+def size(catalog) -> int:
+    return widths(catalog).size
+
+
+def _unsigned(v, bits, name):
+    if not 0 <= v < 1 << bits:
+        raise ValueError(f"{name} {v} does not fit in {bits} bits")
+    return v
+
+
+def _signed(v, bits, name):
+    if not -(1 << bits - 1) <= v < 1 << bits - 1:
+        raise ValueError(f"{name} {v} does not fit in {bits} signed bits")
+    return v & ((1 << bits) - 1)
+
+
+def encode(game, occupied=None) -> bytes:
+    """The packed rule state of a Game or SimGame.
+
+    occupied: board cells holding a token; defaults to game.occupied where
+    there is one (a SimGame has no tokens between turns).
+    """
+    w = widths(game.catalog)
+    if occupied is None:
+        occupied = getattr(game, "occupied", ())
+    cols = S.GRID_COLS
+    acc = 0
+    for r, c in occupied:
+        acc |= 1 << (r * cols + c)
+    shift = w.cells
+
+    acc |= _unsigned(game.funds.value, w.funds, "funds") << shift
+    shift += w.funds
+    for key in S.FUNDS_SERIES:
+        acc |= _unsigned(game.funds.counters[key], w.counter, key) << shift
+        shift += w.counter
+    for v, bits in ((game.compute_idx, w.compute), (game.model_idx, w.model),
+                    (game.ops_available, w.ops), (game.ops_aspirational, w.ops)):
+        acc |= _unsigned(v, bits, "tracker") << shift
+        shift += bits
+
+    regions = game.regions.regions
+    for name in S.REGION_NAMES:
+        r = regions[name]
+        acc |= bool(r.player_presence) << shift
+        acc |= _signed(r.reputation, w.value, "reputation") << shift + 1
+        acc |= _signed(r.power, w.value, "power") << shift + 1 + w.value
+        acc |= _unsigned(r.chaos // S.CHAOS_STEP, w.chaos, "chaos step") << shift + 1 + 2 * w.value
+        shift += 1 + 2 * w.value + w.chaos
+
+    for cid in game.hand:
+        acc |= 1 << shift + cid
+    shift += w.cards
+    for deck in game.deck.decks.values():
+        for cid in deck.ids():
+            acc |= 1 << shift + cid
+    return acc.to_bytes(w.size, "little")
+
+
+def _card_ids(bits):
+    ids, cid = [], 0
+    while bits:
+        if bits & 1:
+            ids.append(cid)
+        bits >>= 1
+        cid += 1
+    return ids
+
+
+def decode(data, catalog) -> dict:
+    """encode()'s fields as plain values.
+
+    Keys: "occupied" (cells), "funds", "counters" ({key: n}), "compute",
+    "model", "ops_available", "ops_aspirational", "regions" ({name:
+    (presence, reputation, power, chaos)}), "hand" and "deck" (card ids,
+    ascending).
+    """
+    w = widths(catalog)
+    if len(data) != w.size:
+        raise ValueError(f"expected {w.size} bytes, got {len(data)}")
+    acc = int.from_bytes(data, "little")
+
+    def take(bits):
+        nonlocal acc
+        v = acc & ((1 << bits) - 1)
+        acc >>= bits
+        return v
+
+    def take_signed(bits):
+        v = take(bits)
+        return v - (1 << bits) if v >> bits - 1 else v
+
+    cells = take(w.cells)
+    state = {"occupied": [divmod(i, S.GRID_COLS) for i in range(w.cells) if cells >> i & 1],
+             "funds": take(w.funds),
+             "counters": {key: take(w.counter) for key in S.FUNDS_SERIES},
+             "compute": take(w.compute), "model": take(w.model),
+             "ops_available": take(w.ops), "ops_aspirational": take(w.ops)}
+    regions = {}
+    for name in S.REGION_NAMES:
+        presence = bool(take(1))
+        rep, power = take_signed(w.value), take_signed(w.value)
+        regions[name] = (presence, rep, power, take(w.chaos) * S.CHAOS_STEP)
+    state["regions"] = regions
+    state["hand"] = _card_ids(take(w.cards))
+    state["deck"] = _card_ids(take(w.cards))
+    return state
+
+
+def restore(game, data):
+    """Write encoded state into a Game or SimGame's rules state (no redraw).
+
+    The occupancy is not applied: which token stands on a cell is not encoded.
+    """
+    state = decode(data, game.catalog)
+    game.funds.value = state["funds"]
+    game.funds.counters.update(state["counters"])
+    game.compute_idx, game.model_idx = state["compute"], state["model"]
+    game.ops_available, game.ops_aspirational = state["ops_available"], state["ops_aspirational"]
+    for name, (presence, rep, power, chaos) in state["regions"].items():
+        r = game.regions[name]
+        r.player_presence, r.reputation, r.power, r.chaos = presence, rep, power, chaos
+    game.hand = state["hand"]
+    types = game.catalog.types
+    game.deck.restore(tuple(tuple(cid for cid in state["deck"] if types[cid] == t) for t in S.CARD_TYPES))
+    zobrist.rehash(game)
@@ -0,0 +1,106 @@
+"""Fixed playing strategies for headless games (see rules.SimGame).
+
+A strategy chooses a turn's placements, the region for each region pick
+and which offered card to keep. Randomness comes from game.rng, so a
+game is reproducible from its seed and strategies hold no state.
+"""
+import settings as S
+
+
+class Strategy:
+    """Random play; subclasses override the preferences."""
+
+    name = "random"
+
+    def preferred_cells(self, game):
+        cells = game.legal_cells()
+        game.rng.shuffle(cells)
+        return cells
+
+    def place(self, game):
+        """Greedily take preferred cells while the turn stays affordable."""
+        chosen = []
+        for cell in self.preferred_cells(game):
+            if len(chosen) == game.ops_available:
+                break
+            if game.can_take(chosen + [cell]):
+                chosen.append(cell)
+        return chosen
+
+    def pick_region(self, game, task_type, candidates):
+        if task_type == "add_presence":
+            fresh = [n for n in candidates if not game.regions.has_presence(n)]
+            candidates = fresh or candidates
+        return game.rng.choice(candidates)
+
+    def keep_card(self, game, offered):
+        """Index into `offered` to keep, or None to pass."""
+        affordable = [i for i, cid in enumerate(offered) if game.catalog.costs[cid] <= game.funds.value]
+        return game.rng.choice(affordable) if affordable else None
+
+
+class EconomyStrategy(Strategy):
+    """Spread presence, then grow reputation x power income."""
+
+    name = "economy"
+    ORDER = [(1, 1), (1, 0), (1, 2), (0, 1), (0, 2), (0, 0), (0, 3), (1, 3)]
+
+    def preferred_cells(self, game):
+        legal = set(game.legal_cells())
+        cells = [c for c in self.ORDER if c in legal]
+        if game.regions.total_reputation() > game.regions.total_power():
+            # the product grows fastest by raising the smaller factor
+            cells.sort(key=lambda c: c != (1, 2))
+        return cells
+
+    def pick_region(self, game, task_type, candidates):
+        if task_type == "add_presence":
+            return super().pick_region(game, task_type, candidates)
+        key = (lambda n: game.regions[n].power) if "power" in task_type else (lambda n: game.regions[n].reputation)
+        return min(candidates, key=key)
+
+    def keep_card(self, game, offered):
+        costs = [game.catalog.costs[cid] for cid in offered]
+        i = min(range(len(offered)), key=costs.__getitem__)
+        return i if costs[i] <= game.funds.value // 2 else None
+
+
+class ModelRushStrategy(Strategy):
+    """Race compute and model version, scaling operations on the way."""
+
+    name = "model_rush"
+    ORDER = [(0, 0), (0, 1), (0, 2), (1, 1), (0, 3), (1, 0), (1, 2)]
+
+    def preferred_cells(self, game):
+        legal = set(game.legal_cells())
+        cells = [c for c in self.ORDER if c in legal]
+        if game.model_idx >= game.compute_idx:
+            cells.sort(key=lambda c: c != (0, 0))
+        return cells
+
+
+class ChaosStrategy(Strategy):
+    """Buy power with chaos: misinformation and malicious apps first."""
+
+    name = "chaos"
+    ORDER = [(1, 1), (2, 1), (2, 2), (2, 3), (1, 2), (0, 2), (1, 0)]
+
+    def preferred_cells(self, game):
+        legal = set(game.legal_cells())
+        return [c for c in self.ORDER if c in legal]
+
+    def pick_region(self, game, task_type, candidates):
+        if task_type == "add_presence":
+            return super().pick_region(game, task_type, candidates)
+        # regions still under the chaos cap first, strongest of those first
+        return min(candidates, key=lambda n: (game.regions[n].chaos >= S.CHAOS_MAX, -game.regions[n].power))
+
+
+STRATEGIES = {cls.name: cls for cls in (Strategy, EconomyStrategy, ModelRushStrategy, ChaosStrategy)}
+
+
+def get_strategy(name: str) -> Strategy:
+    try:
+        return STRATEGIES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r}; choose from {', '.join(STRATEGIES)}") from None
@@ -0,0 +1,190 @@
+"""Per-turn telemetry: one fixed-schema record per turn, streamed to disk.
+
+File layout (append-only):
+    b"QSTEL1\\n" + one JSON line {"columns": [...], "dtype": "<i4"}
+    then chunks: uint32 row count n, followed by each column's n values
+    (column-major, so a reader can pull one column without the rest).
+    A chunk torn by a crash or a failed write is cut off before the file
+    is appended to again.
+
+TelemetryWriter fills a preallocated row buffer; a full buffer is handed
+to a writer thread and replaced by a recycled one, so memory stays at a
+few chunks however long the run is and the caller never waits on disk.
+"""
+import json
+import queue
+import struct
+import threading
+
+import numpy as np
+
+import settings as S
+from rules import CHARGE_KEYS
+
+MAGIC = b"QSTEL1\n"
+DTYPE = np.dtype("<i4")
+_COUNT = struct.Struct("<I")
+
+
+def region_slug(name):
+    return name.lower().replace(" ", "_")
+
+
+def turn_columns(region_names=None):
+    """The record schema; per-region columns follow the fixed ones."""
+    cols = ["turn", "funds_before", "funds_after"]
+    cols += [f"charge_{k}" for k in CHARGE_KEYS]
+    cols += ["income", "compute", "model", "hand", "deck"]
+    for name in region_names or S.REGION_NAMES:
+        slug = region_slug(name)
+        cols += [f"{slug}_rep", f"{slug}_power", f"{slug}_chaos", f"{slug}_presence"]
+    return tuple(cols)
+
+
+def turn_record(game, funds_before, charges, income):
+    """Row values for the turn `game` (Game or rules.SimGame) just finished."""
+    row = [game.turn, funds_before, game.funds.value]
+    row += [charges.get(k, 0) for k in CHARGE_KEYS]
+    row += [income, game.compute_idx, game.model_idx, len(game.hand), len(game.deck)]
+    for r in game.regions.regions.values():
+        row += [r.reputation, r.power, r.chaos, int(r.player_presence)]
+    return row
+
+
+class TelemetryWriter:
+    def __init__(self, path, columns=None, chunk_rows=None, buffers=3):
+        self.path = path
+        self.columns = tuple(columns or turn_columns())
+        self.chunk_rows = chunk_rows or S.TELEMETRY_CHUNK_ROWS
+        self._free = queue.Queue()
+        for _ in range(max(2, buffers)):
+            self._free.put(np.empty((len(self.columns), self.chunk_rows), dtype=DTYPE))
+        self._buf = self._free.get()
+        self._n = 0
+        self._pending = queue.Queue()
+        self._fh = self._open()
+        self._thread = threading.Thread(target=self._drain, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        self.closed = False
+        self.error = None  # the OSError that stopped the writer thread's writes, if any
+
+    def _open(self):
+        """Open for appending, after cutting off a chunk a crash or failed write left torn."""
+        header = MAGIC + json.dumps({"columns": list(self.columns), "dtype": DTYPE.str}).encode() + b"\n"
+        fh = open(self.path, "a+b", buffering=0)  # unbuffered: a failed write can be cut back exactly
+        fh.seek(0)
+        existing = fh.read(len(header))
+        if not header.startswith(existing):
+            fh.close()
+            raise ValueError(f"{self.path} holds telemetry with a different schema")
+        if len(existing) < len(header):  # new, or the header itself was torn
+            fh.truncate(0)
+            self._write(fh, header)
+            return fh
+        # walk the chunks; anything past the last whole one would misalign every later read
+        end, pos = fh.seek(0, 2), len(header)
+        row_bytes = len(self.columns) * DTYPE.itemsize
+        while pos + _COUNT.size <= end:
+            fh.seek(pos)
+            (n,) = _COUNT.unpack(fh.read(_COUNT.size))
+            if pos + _COUNT.size + n * row_bytes > end:
+                break
+            pos += _COUNT.size + n * row_bytes
+        if pos < end:
+            fh.truncate(pos)
+        return fh
+
+    @staticmethod
+    def _write(fh, data):
+        view = memoryview(data).cast("B")
+        while view:
+            view = view[fh.write(view):]
+
+    def record(self, values):
+        """Append one row (len(columns) ints); never touches the disk itself."""
+        if self.closed:
+            raise ValueError("TelemetryWriter is closed")
+        self._raise_error()
+        self._buf[:, self._n] = values
+        self._n += 1
+        if self._n == self.chunk_rows:
+            self._hand_off()
+
+    def record_turn(self, game, funds_before, charges, income):
+        self.record(turn_record(game, funds_before, charges, income))
+
+    def _hand_off(self):
+        if self._n:
+            self._pending.put((self._buf, self._n))
+            # blocks only if the disk is a whole `buffers` chunks behind
+            self._buf = self._free.get()
+            self._n = 0
+
+    def _drain(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                break
+            buf, n = item
+            start = None
+            try:
+                if self.error is None:  # after a failed write the file is not appended to again
+                    start = self._fh.seek(0, 2)
+                    self._write(self._fh, _COUNT.pack(n) + np.ascontiguousarray(buf[:, :n]).tobytes())
+            except OSError as e:  # disk full, I/O error: record() and close() report it
+                self.error = e
+                if start is not None:
+                    try:
+                        self._fh.truncate(start)  # no torn chunk left behind
+                    except OSError:
+                        pass  # the next _open() cuts it off instead
+            finally:
+                self._free.put(buf)  # always, or _hand_off would wait on it forever
+
+    def _raise_error(self):
+        if self.error is not None:
+            raise self.error
+
+    def flush(self):
+        """Queue the partial chunk; the writer thread writes it."""
+        self._hand_off()
+
+    def close(self):
+        if self.closed:
+            return
+        self._hand_off()
+        self._pending.put(None)
+        self._thread.join()
+        self.closed = True
+        try:
+            self._fh.close()
+        except OSError as e:
+            self.error = self.error or e
+        self._raise_error()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_telemetry(path) -> dict:
+    """Load a telemetry file as {column: int32 array}."""
+    with open(path, "rb") as fh:
+        if fh.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a telemetry file")
+        meta = json.loads(fh.readline())
+        columns, dtype = meta["columns"], np.dtype(meta["dtype"])
+        chunks = []
+        while True:
+            head = fh.read(_COUNT.size)
+            if len(head) < _COUNT.size:
+                break
+            (n,) = _COUNT.unpack(head)
+            data = np.frombuffer(fh.read(n * len(columns) * dtype.itemsize), dtype=dtype)
+            if data.size < n * len(columns):
+                break  # torn final chunk (crash mid-write); keep what is whole
+            chunks.append(data.reshape(len(columns), n))
+    table = np.concatenate(chunks, axis=1) if chunks else np.empty((len(columns), 0), dtype=dtype)
+    return {name: table[i] for i, name in enumerate(columns)}
@@ -0,0 +1,78 @@
+import unittest
+import tkinter as tk
+
+from animation import Animator, linear
+from canvas_pool import TimerRegistry
+from cube import Cube
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAnimation(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.canvas = tk.Canvas(self.root, width=400, height=400)
+        self.timers = TimerRegistry(self.canvas)
+        self.clock = _Clock()
+        self.anim = Animator(self.canvas, self.timers, fps=50, clock=self.clock)  # 20 ms frames
+
+    def tearDown(self):
+        self.timers.cancel_all()
+        self.canvas.destroy()
+        self.root.destroy()
+
+    def _frame_at(self, ms):
+        self.clock.now = ms / 1000.0
+        self.anim._frame()
+
+    def test_one_loop_moves_every_item_by_the_clock(self):
+        a = self.canvas.create_rectangle(0, 0, 10, 10)
+        b = self.canvas.create_text(5, 5, text="x")
+        done = []
+        self.anim.move("a", [a], 100, 0, duration_ms=100, ease=linear, on_done=lambda: done.append("a"))
+        self.anim.move("b", [b], 0, 50, duration_ms=100, ease=linear)
+        self.assertIn("animation", self.timers)  # a single timer for both
+        self._frame_at(20)
+        self.assertEqual(self.canvas.coords(a)[0], 20)
+        self._frame_at(80)  # frames 40 and 60 never ran
+        self.assertEqual(self.anim.dropped, 2)
+        self.assertEqual(self.canvas.coords(a)[0], 80)
+        self._frame_at(150)
+        self.assertEqual(self.canvas.coords(a)[0], 100)
+        self.assertEqual(self.canvas.coords(b), [5, 55])
+        self.assertEqual(done, ["a"])
+        self.assertEqual(len(self.anim), 0)
+
+    def test_disabled_moves_at_once(self):
+        self.anim.enabled = False
+        a = self.canvas.create_rectangle(0, 0, 10, 10)
+        self.anim.move("a", [a], 30, 40)
+        self.assertEqual(self.canvas.coords(a), [30, 40, 40, 50])
+        self.assertNotIn("animation", self.timers)
+
+    def test_cube_retargets_from_where_it_is(self):
+        cube = Cube(self.canvas, 0, 0, 0, "#f00", size=10)
+        cube.animator = self.anim
+        cube.set_start(100, 0)
+        self.assertEqual(cube.current_cell, None)
+        self._frame_at(1000)  # well past the slide
+        self.assertEqual(self.canvas.coords(cube.rect), [100, 0, 110, 10])
+
+        cube.set_start(0, 0)
+        self._frame_at(1050)
+        mid = self.canvas.coords(cube.rect)[0]
+        self.assertTrue(0 < mid < 100)
+        cube.set_start(200, 0)  # a new target mid-slide starts from `mid`
+        self.anim.finish_all()
+        self.assertEqual(self.canvas.coords(cube.rect), [200, 0, 210, 10])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import resource
+import shutil
+import tempfile
+import unittest
+
+from PIL import Image
+
+from assets import AssetCache, SpriteAtlas, bucket_size
+
+
+class TestAssets(unittest.TestCase):
+    def _atlas(self):
+        named = {f"cards/{i}": Image.new("RGB", (40, 60), (i * 20, 0, 0)) for i in range(1, 8)}
+        named["markers/hex"] = Image.new("RGB", (32, 32), (0, 0, 255))
+        return SpriteAtlas.pack(named, max_w=128)
+
+    def test_pack_keeps_sprites_disjoint_and_croppable(self):
+        atlas = self._atlas()
+        self.assertEqual(len(atlas), 8)
+        boxes = {}
+        for name, (sheet, box) in atlas.index.items():
+            x0, y0, x1, y1 = box
+            self.assertLessEqual(x1, 128)
+            for other in boxes.get(sheet, []):
+                ox0, oy0, ox1, oy1 = other
+                self.assertTrue(x1 <= ox0 or ox1 <= x0 or y1 <= oy0 or oy1 <= y0)
+            boxes.setdefault(sheet, []).append(box)
+        self.assertEqual(atlas.crop("cards/3").getpixel((5, 5))[:3], (60, 0, 0))
+
+    def test_from_dirs_packs_more_files_than_can_be_open(self):
+        path = tempfile.mkdtemp()
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        try:
+            for i in range(300):
+                Image.new("RGB", (4, 4), (i % 256, 0, 0)).save(os.path.join(path, f"c{i}.png"))
+            with open(os.path.join(path, "broken.png"), "wb") as fh:
+                fh.write(b"not a png")
+            resource.setrlimit(resource.RLIMIT_NOFILE, (128, hard))
+            with self.assertWarns(UserWarning):
+                atlas = SpriteAtlas.from_dirs({"cards": path}, max_w=256)
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+            shutil.rmtree(path)
+        self.assertEqual(len(atlas), 300)
+        self.assertNotIn("cards/broken", atlas)
+
+    def test_bucket_size_snaps_down(self):
+        self.assertEqual(bucket_size(70, 92), (64, 80))
+        self.assertEqual(bucket_size(3, 3), (16, 16))
+
+    def test_cache_reuses_buckets_and_evicts_lru(self):
+        cache = AssetCache(self._atlas(), max_bytes=3 * 64 * 80 * 4, factory=lambda img: img)
+        a = cache.get("cards/1", 70, 92)
+        self.assertIs(cache.get("cards/1", 66, 85), a)   # same bucket -> hit
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.get("cards/2", 70, 92)
+        cache.get("cards/3", 70, 92)
+        cache.get("cards/1", 70, 92)                     # refresh 1
+        cache.get("cards/4", 70, 92)                     # evicts 2
+        self.assertEqual(len(cache), 3)
+        self.assertLessEqual(cache.bytes_used, cache.max_bytes)
+        misses = cache.misses
+        cache.get("cards/1", 70, 92)
+        self.assertEqual(cache.misses, misses)
+        self.assertIsNone(cache.get("cards/999", 70, 92))
+
+
+if __name__ == "__main__":
+    unittest.main()
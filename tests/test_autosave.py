@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from autosave import Autosaver, dumps, load_latest, loads, rotations
+from history import Snapshot
+
+
+def _snap(turn):
+    return Snapshot(turn=turn, funds=(10, (("lobby", 1),)), trackers=(0, 0, 1, 3),
+                    regions=((0, 0, 0, False),), hand=(4,), decks=((1, 2), ()),
+                    board=((0, (1, 2), False), (1, None, True)), pending=((), (), False))
+
+
+class TestAutosave(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "game.sav")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_round_trip_keeps_tuples(self):
+        snap = _snap(3)
+        self.assertEqual(loads(dumps(snap)), snap)
+
+    def test_rotations_are_bounded(self):
+        saver = Autosaver(self.path, rotations=2)
+        for turn in range(5):
+            saver.submit(_snap(turn))
+            saver.flush()
+        self.assertFalse(saver.submit(_snap(4)))  # unchanged state is not rewritten
+        saver.close()
+        self.assertEqual(saver.saved, 5)
+        self.assertEqual(sorted(os.listdir(self.dir)), ["game.sav", "game.sav.1", "game.sav.2"])
+        self.assertEqual([load_latest(p, 0).turn for p in rotations(self.path, 2)], [4, 3, 2])
+
+    def test_torn_newest_save_falls_back(self):
+        with Autosaver(self.path) as saver:
+            saver.submit(_snap(1))
+            saver.flush()
+            saver.submit(_snap(2))
+        with open(self.path, "wb") as fh:
+            fh.write(b'{"format":1,"snap')  # power cut mid-write of a copied file
+        self.assertEqual(load_latest(self.path).turn, 1)
+        self.assertIsNone(load_latest(os.path.join(self.dir, "missing.sav")))
+
+    def test_disk_errors_are_raised_by_the_next_call(self):
+        saver = Autosaver(os.path.join(self.dir, "no", "such", "dir.sav"))
+        saver.submit(_snap(1))
+        saver.flush()
+        self.assertIsInstance(saver.error, OSError)  # the worker is not taken down by it
+        with self.assertRaises(OSError):
+            saver.submit(_snap(2))
+        self.assertTrue(saver.submit(_snap(2)))  # reported once; later saves are still tried
+        with self.assertRaises(OSError):
+            saver.close()
+        self.assertEqual(saver.saved, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
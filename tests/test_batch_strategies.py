@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+import settings as S
+from batch_strategies import (BATCH_STRATEGIES, N_CELLS, STATE_DTYPE, TASK_TYPES, BatchStrategy,
+                              encode_states, get_batch_strategy, play_batch)
+from rules import ALL_CELLS, SimGame, pending_cost
+from strategies import get_strategy
+
+
+class TestBatchStrategies(unittest.TestCase):
+    def test_encoded_states_match_games(self):
+        games = [SimGame(seed) for seed in range(3)]
+        for g in games[1:]:
+            g.play_turn([(1, 1)], get_strategy("random"))
+        states = encode_states(games)
+        self.assertEqual(states.dtype, STATE_DTYPE)
+        for g, row in zip(games, states):
+            self.assertEqual(row["funds"], g.funds.value)
+            self.assertEqual(row["presence"].sum(), len(g.regions.with_presence()))
+            self.assertEqual(row["legal"].tolist(), [c in g.legal_cells() for c in ALL_CELLS])
+            self.assertEqual(row["cell_cost"].tolist(), [pending_cost(g.funds, [c]) for c in ALL_CELLS])
+            self.assertEqual(row["income"], g.regions.total_reputation() * g.regions.total_power())
+
+    def test_decisions_drive_every_game(self):
+        europe = S.REGION_NAMES.index("Europe")
+
+        class PresenceInEurope(BatchStrategy):
+            def decide(self, states):
+                n = len(states)
+                cells = np.full((n, N_CELLS), -1)
+                cells[:, 0] = ALL_CELLS.index((1, 1))
+                return {"cells": cells, "regions": np.full((n, len(TASK_TYPES)), europe)}
+
+        for g in play_batch(PresenceInEurope(), range(4), turns=1):
+            self.assertEqual([r.name for r in g.regions.with_presence()], ["Europe"])
+
+    def test_batches_are_reproducible(self):
+        for name in BATCH_STRATEGIES:
+            a = [g.outcome() for g in play_batch(get_batch_strategy(name, seed=1), range(5), turns=15)]
+            b = [g.outcome() for g in play_batch(get_batch_strategy(name, seed=1), range(5), turns=15)]
+            self.assertEqual(a, b)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import tkinter as tk
+
+from canvas_pool import GridView, ItemPool, TimerRegistry
+from layout import DEFAULT_LAYOUT as L
+
+
+class TestCanvasPool(unittest.TestCase):
+    def setUp(self):
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.canvas = tk.Canvas(self.root, width=200, height=200)
+        self.canvas.pack()
+
+    def tearDown(self):
+        self.canvas.destroy()
+        self.root.destroy()
+
+    def test_released_items_are_hidden_and_reused(self):
+        pool = ItemPool(self.canvas, "text")
+        a = pool.acquire(10, 10, text="one")
+        pool.release(a)
+        self.assertEqual(self.canvas.itemcget(a, "state"), "hidden")
+
+        b = pool.acquire(50, 60, text="two")
+        self.assertEqual(a, b)
+        self.assertEqual(self.canvas.itemcget(b, "state"), "normal")
+        self.assertEqual(self.canvas.itemcget(b, "text"), "two")
+        self.assertEqual(self.canvas.coords(b), [50.0, 60.0])
+
+    def test_grid_view_recycles_cells_that_leave_the_view(self):
+        pool, made = ItemPool(self.canvas, "rectangle"), []
+
+        def make(r, c):
+            made.append((r, c))
+            return pool.acquire(*L.cell_rects[L.cell_index(r, c)])
+
+        view = GridView(3, 4, make, pool.release, margin=0)
+        x0, y0 = L.grid_x + 1, L.grid_y + 1
+        view.update(*L.cells_in(x0, y0, x0 + L.cell / 2, y0 + L.cell / 2))
+        self.assertEqual(list(view.shown), [(0, 0)])
+        view.update(*L.cells_in(x0 + 3 * L.cell, y0, x0 + 3.5 * L.cell, y0 + 2.5 * L.cell))
+        self.assertEqual(sorted(view.shown), [(0, 3), (1, 3), (2, 3)])
+        self.assertEqual(len(pool.live) + len(pool._free), 3)  # (0, 0)'s item was reused
+        self.assertEqual(L.cells_in(-500, -500, -100, -100), (0, 0, 0, 0))
+
+    def test_timer_reschedule_cancels_stale_callback(self):
+        fired = []
+        timers = TimerRegistry(self.canvas)
+        timers.schedule("toast", 10_000, fired.append, "stale")
+        timers.schedule("toast", 10_000, fired.append, "fresh")
+        self.assertIn("toast", timers)
+        timers.cancel_all()
+        self.assertNotIn("toast", timers)
+        self.assertEqual(fired, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
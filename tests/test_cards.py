@@ -0,0 +1,46 @@
+import random
+import unittest
+
+import settings as S
+from cards import Card, CardCatalog, Deck, DeckSet, load_catalog
+
+
+class TestCards(unittest.TestCase):
+    def test_catalog_indexed_by_id(self):
+        cat = load_catalog()
+        self.assertIs(cat, load_catalog())  # shared, never copied per game
+        for t in S.CARD_TYPES:
+            ids = cat.ids_of_type(t)
+            self.assertTrue(ids)
+            self.assertTrue(all(cat.types[i] == t for i in ids))
+        card = cat[1]
+        self.assertIsInstance(card, Card)
+        self.assertEqual(card.type, cat.types[1])
+        with self.assertRaises(AttributeError):
+            cat.costs = ()
+
+    def test_catalog_rejects_duplicates_and_unknown_types(self):
+        with self.assertRaises(ValueError):
+            CardCatalog([Card(1, "RESEARCH", 1, "a", ""), Card(1, "CHAOS", 1, "b", "")])
+        with self.assertRaises(ValueError):
+            CardCatalog([Card(1, "BOGUS", 1, "a", "")])
+
+    def test_deck_draw_is_without_replacement(self):
+        deck = Deck(range(10), random.Random(3))
+        drawn = deck.draw(4) + deck.draw(10)
+        self.assertEqual(sorted(drawn), list(range(10)))
+        self.assertEqual(len(deck), 0)
+        self.assertEqual(deck.draw(3), [])
+
+    def test_deckset_put_back_routes_by_type(self):
+        cat = load_catalog()
+        ds = DeckSet(cat, random.Random(1))
+        total = len(ds)
+        drawn = ds.draw("INFLUENCE", 3)
+        self.assertEqual(len(ds), total - 3)
+        ds.put_back(drawn)
+        self.assertEqual(len(ds["INFLUENCE"]), len(cat.ids_of_type("INFLUENCE")))
+
+
+if __name__ == "__main__":
+    unittest.main()
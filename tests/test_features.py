@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+import settings as S
+from features import FEATURE_INDEX, FEATURE_NAMES, FEATURE_SIZE, encode_batch, encode_into
+from rules import SimGame
+from strategies import get_strategy
+
+
+class TestFeatures(unittest.TestCase):
+    def test_encodes_into_the_callers_row(self):
+        games = [SimGame(seed) for seed in range(3)]
+        for _ in range(4):
+            for g in games:
+                g.play_turn(get_strategy("economy").place(g), get_strategy("economy"))
+        buf = np.full((4, FEATURE_SIZE), -1, dtype=np.float32)
+        out = encode_batch(games, buf[1:])
+        self.assertTrue(np.shares_memory(out, buf))
+        self.assertTrue((buf[0] == -1).all())  # rows outside the slice are untouched
+        for g, row in zip(games, buf[1:]):
+            self.assertEqual(row[FEATURE_INDEX["funds"]], g.funds.value)
+            self.assertEqual(row[FEATURE_INDEX["counter_scale_presence"]], g.funds.counters["scale_presence"])
+            self.assertEqual(row[FEATURE_INDEX["europe_rep"]], g.regions["Europe"].reputation)
+            self.assertEqual(row[FEATURE_INDEX["deck"]], len(g.deck))
+            self.assertEqual(row[:12].sum(), 0)  # nothing on the board between turns
+
+    def test_layout_covers_every_region_and_series(self):
+        self.assertEqual(len(set(FEATURE_NAMES)), FEATURE_SIZE)
+        self.assertEqual(sum(n.endswith("_chaos") for n in FEATURE_NAMES), len(S.REGION_NAMES))
+        self.assertEqual(sum(n.startswith("counter_") for n in FEATURE_NAMES), len(S.FUNDS_SERIES))
+
+    def test_int_buffers_work_too(self):
+        row = np.zeros(FEATURE_SIZE, dtype=np.int32)
+        self.assertIs(encode_into(SimGame(1), row), row)
+        self.assertEqual(row[FEATURE_INDEX["funds"]], S.FUNDS_START)
+
+
+if __name__ == "__main__":
+    unittest.main()
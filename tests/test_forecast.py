@@ -0,0 +1,49 @@
+import unittest
+
+import settings as S
+from forecast import Forecaster, capture, project, sim_from
+from rules import SimGame
+from strategies import get_strategy
+from zobrist import EvalCache
+
+
+class TestForecast(unittest.TestCase):
+    def test_projection_matches_playing_it_out(self):
+        strategy, cells = get_strategy("economy"), [(1, 1), (0, 0)]
+        game = SimGame(S.FORECAST_SEED)
+        rows = project(sim_from(capture(game), game.catalog), cells, turns=4)
+        self.assertEqual(game.turn, 0)  # the game itself is untouched
+        for row in rows:
+            played = game.can_take(cells)
+            income = game.play_turn(cells if played else [], strategy)["income"]
+            self.assertEqual((row["played"], row["funds"], row["income"], row["compute"]),
+                             (played, game.funds.value, income, game.compute_idx))
+        self.assertEqual([r["turn"] for r in rows], [1, 2, 3, 4])
+
+    def test_unaffordable_turns_pass(self):
+        game = SimGame(1)
+        game.funds.value = 0
+        rows = project(sim_from(capture(game), game.catalog), [(0, 2)], turns=2)  # lobbying costs money
+        self.assertFalse(rows[0]["played"])
+
+    def test_stale_projection_is_abandoned(self):
+        game = SimGame(1)
+        self.assertIsNone(project(sim_from(capture(game), game.catalog), [(0, 0)], stale=lambda: True))
+
+    def test_forecaster_answers_latest_then_from_cache(self):
+        forecaster = Forecaster(turns=3, cache=EvalCache(8))
+        try:
+            game = SimGame(2)
+            self.assertIsNone(forecaster.request(game, [(0, 0)]))
+            self.assertIsNone(forecaster.request(game, [(0, 2)]))
+            generation, rows = forecaster.results.get(timeout=10)
+            while generation != forecaster.generation:  # the first may have finished before the second came
+                generation, rows = forecaster.results.get(timeout=10)
+            self.assertEqual(len(rows), 3)
+            self.assertEqual(forecaster.request(game, [(0, 2)]), rows)
+        finally:
+            forecaster.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
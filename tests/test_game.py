@@ -1,7 +1,18 @@
+import asyncio
+import os
+import tempfile
+import threading
 import unittest
 import tkinter as tk
+import numpy as np
 import settings as S
+from features import FEATURE_INDEX, FEATURE_SIZE, encode_into
 from game import Game
+from telemetry import TelemetryWriter, read_telemetry
+from zobrist import full_hash
+from autosave import load_latest
+from host import GameHost, HostClient
+from replay import snapshot
 
 class TestGame(unittest.TestCase):
     def setUp(self):
@@ -25,9 +36,15 @@ class TestGame(unittest.TestCase):
         cube = next(c for c in self.game.cubes if not c.locked)
 
         cube.current_cell = (0, S.GRID_COLS - 1)
+        self.game.funds.add(1000)
 
         before = len(self.game.hand)
         self.game.take_actions()
+        # Research row offers 3 research cards; keep the first
+        card_type, offered = self.game.card_offers[0]
+        self.assertEqual(card_type, "RESEARCH")
+        self.assertEqual(len(offered), S.CARD_DRAW_COUNT)
+        self.game.choose_offered_card(0)
         after = len(self.game.hand)
 
         self.assertGreater(after, before)
@@ -67,10 +84,13 @@ class TestGame(unittest.TestCase):
         cube = self.game.cubes[2]
         final_col = S.GRID_COLS - 1
 
-        # Fill up to the hand limit via place -> take_actions cycles
+        self.game.funds.add(1000)
+
+        # Fill up to the hand limit via place -> take_actions -> keep cycles
         for _ in range(S.HAND_LIMIT):
             self.game.place_cube_and_handle_events(cube, 0, final_col)
             self.game.take_actions()  # draw happens here
+            self.game.choose_offered_card(0)
 
         self.assertEqual(len(self.game.hand), S.HAND_LIMIT)
 
@@ -91,10 +111,45 @@ class TestGame(unittest.TestCase):
     def test_draw_occurs_on_take_actions(self):
         cube = next(c for c in self.game.cubes if not c.locked)
         cube.current_cell = (0, S.GRID_COLS - 1)  # simulate cube placed in final column
+        self.game.funds.add(1000)
 
         self.assertEqual(len(self.game.hand), 0)  # before
         self.game.take_actions()
+        self.assertEqual(len(self.game.hand), 0)  # waiting on keep-one choice
+        self.assertTrue(self.game.choosing_cards)
+        self.game.choose_offered_card(1)
         self.assertEqual(len(self.game.hand), 1)  # after
+        self.assertFalse(self.game.choosing_cards)
+
+    def test_keep_one_pays_cost_and_returns_rest(self):
+        g = self.game
+        g.funds.add(1000)
+        g.place_cube_and_handle_events(g.cubes[0], 2, S.GRID_COLS - 1)
+        deck_before = len(g.deck["CHAOS"])
+        g.take_actions()
+        _type, offered = g.card_offers[0]
+        funds_before = g.funds.value
+        g.choose_offered_card(2)
+
+        kept = offered[2]
+        self.assertEqual(g.hand, [kept])
+        self.assertEqual(g.catalog.types[kept], "CHAOS")
+        self.assertEqual(g.funds.value, funds_before - g.catalog.costs[kept])
+        self.assertEqual(len(g.deck["CHAOS"]), deck_before - 1)
+
+    def test_keep_one_rejected_when_unaffordable(self):
+        g = self.game
+        g.place_cube_and_handle_events(g.cubes[0], 1, S.GRID_COLS - 1)
+        g.take_actions()
+        _type, offered = g.card_offers[0]
+        g.funds.value = 0
+        priced = [i for i, cid in enumerate(offered) if g.catalog.costs[cid] > 0]
+        if priced:
+            self.assertFalse(g.choose_offered_card(priced[0]))
+            self.assertTrue(g.choosing_cards)
+        # Passing always works and keeps nothing
+        self.assertTrue(g.choose_offered_card(None))
+        self.assertEqual(g.hand, [])
 
     def test_trackers_start_at_leftmost(self):
         self.assertEqual(self.game.compute_idx, 0)
@@ -309,6 +364,227 @@ class TestGame(unittest.TestCase):
         txt = g.canvas.itemcget(tid, "text")
         self.assertIn(f"Chaos: 10 out of {S.CHAOS_MAX}", txt)
 
+    def test_telemetry_records_each_finished_turn(self):
+        path = os.path.join(tempfile.mkdtemp(), "turns.tel")
+        self.game.telemetry = TelemetryWriter(path)
+        cube = next(c for c in self.game.cubes if not c.locked)
+        self.game.place_cube_and_handle_events(cube, 0, 0)
+        self.game.take_actions()
+        self.game.telemetry.close()
+        data = read_telemetry(path)
+        self.assertEqual(list(data["turn"]), [1])
+        self.assertEqual(int(data["charge_compute_or_model"][0]), 1)
+        self.assertEqual(int(data["compute"][0]), 1)
+
+    def test_undo_redo_placement_and_turn(self):
+        g = self.game
+        cube = next(c for c in g.cubes if not c.locked)
+        deck_before, funds_before = len(g.deck), g.funds.value
+        g.place_cube_and_handle_events(cube, 0, 0)
+        g._checkpoint()
+        g.take_actions()
+        self.assertEqual(g.compute_idx, 1)
+        self.assertEqual(g.turn, 1)
+
+        self.assertTrue(g.undo())  # back to "placed on BUY-CHIPS, not taken"
+        self.assertEqual((g.compute_idx, g.turn, g.funds.value), (0, 0, funds_before))
+        self.assertEqual(cube.current_cell, (0, 0))
+        self.assertEqual(g.occupied, {(0, 0): cube.idx})
+        self.assertTrue(g.undo())  # back to the start
+        self.assertIsNone(cube.current_cell)
+        self.assertEqual(len(g.deck), deck_before)
+        self.assertFalse(g.undo())
+
+        g.redo(); g.redo()
+        self.assertEqual((g.compute_idx, g.turn), (1, 1))
+
+    def test_undo_wrong_region_click(self):
+        g = self.game
+        g.funds.add(100)
+        cube = next(c for c in g.cubes if not c.locked)
+        g.place_cube_and_handle_events(cube, 1, 1)
+        g.take_actions()
+        self.assertTrue(g.selecting_regions)
+        x0, y0, x1, y1 = g.region_hitboxes["Europe"]
+        evt = type("E", (), {"x": (x0 + x1) / 2, "y": (y0 + y1) / 2})()
+        g._maybe_region_click(evt)
+        self.assertTrue(g.regions.has_presence("Europe"))
+
+        g.undo()
+        self.assertFalse(g.regions.has_presence("Europe"))
+        self.assertTrue(g.selecting_regions)
+        self.assertEqual(len(g.selection_tasks), 1)
+
+    def test_turn_cost_readout_follows_placements(self):
+        g = self.game
+        cube = next(c for c in g.cubes if not c.locked)
+        g.place_cube_and_handle_events(cube, 0, 2)
+        g.update_reset_visibility()
+        self.assertEqual(g.ledger.placed_cells(), [(0, 2)])
+        cost = g._pending_total_cost()
+        self.assertEqual(g.canvas.itemcget(g.turn_cost_id, "text"), f"This turn costs ${cost}")
+        cube.return_to_start()
+        self.assertEqual(g.ledger.placed, 0)
+        self.assertEqual(g.canvas.itemcget(g.turn_cost_id, "text"), "")
+
+    def test_features_see_placed_tokens(self):
+        g = self.game
+        row = np.zeros(FEATURE_SIZE, dtype=np.float32)
+        g.place_cube_and_handle_events(next(c for c in g.cubes if not c.locked), 0, 2)
+        encode_into(g, row)
+        self.assertEqual(row[FEATURE_INDEX["occupancy_0_2"]], 1)
+        self.assertEqual(row[FEATURE_INDEX["funds"]], g.funds.value)
+
+    def test_fingerprint_follows_turns_and_undo(self):
+        g = self.game
+        start = g.zobrist.value
+        g.funds.add(100)
+        g.place_cube_and_handle_events(g.cubes[0], 0, 0)
+        g.place_cube_and_handle_events(g.cubes[1], 0, 3)
+        g._checkpoint()
+        g.take_actions()
+        if g.card_offers:
+            g.choose_offered_card(0)
+        self.assertNotEqual(g.zobrist.value, start)
+        self.assertEqual(g.zobrist.value, full_hash(g))
+        g.undo()
+        self.assertEqual(g.zobrist.value, full_hash(g))
+
+    def test_autosave_each_turn_and_resume(self):
+        tmp = tempfile.mkdtemp()
+        path = os.path.join(tmp, "game.sav")
+        g = Game(self.root, autosave=path)
+        try:
+            g.place_cube_and_handle_events(next(c for c in g.cubes if not c.locked), 0, 0)
+            g.take_actions()
+            g.autosave.flush()
+            saved = load_latest(path)
+            self.assertEqual((saved.turn, saved.trackers[0]), (1, 1))
+        finally:
+            g.canvas.destroy()
+
+        other = Game(self.root)
+        try:
+            other.resume(saved)
+            self.assertEqual((other.turn, other.compute_idx, other.funds.value), (1, 1, g.funds.value))
+            self.assertEqual(other.zobrist.value, full_hash(other))
+            self.assertFalse(other.history.can_undo())
+        finally:
+            other.canvas.destroy()
+            for name in os.listdir(tmp):
+                os.remove(os.path.join(tmp, name))
+            os.rmdir(tmp)
+
+    def test_failed_autosave_is_shown_on_the_board(self):
+        tmp = tempfile.mkdtemp()
+        g = Game(self.root, autosave=os.path.join(tmp, "gone", "game.sav"))
+        try:
+            def turn():
+                g.place_cube_and_handle_events(next(c for c in g.cubes if not c.locked), 0, 0)
+                g.take_actions()  # saves in the background, into a directory that is not there
+                g.autosave.flush()
+
+            turn()
+            g._autosave_tick()  # the periodic save finds out
+            self.assertIn("Autosave failed", g.canvas.itemcget(g.toast_id, "text"))
+            turn()
+            with self.assertRaises(OSError):
+                g.autosave_now()
+        finally:
+            g.canvas.destroy()
+            os.rmdir(tmp)
+
+    def test_forecast_panel_follows_the_placement(self):
+        g = self.game
+        g.place_cube_and_handle_events(next(c for c in g.cubes if not c.locked), 0, 0)
+        g._request_forecast()
+        generation = g.forecaster.generation
+        for _ in range(500):
+            if g.forecast_rows is not None and g._forecast_wanted is None:
+                break
+            g.forecaster.results.put(g.forecaster.results.get(timeout=10))
+            g._poll_forecast()
+        self.assertEqual(g.forecaster.generation, generation)
+        self.assertEqual(len(g.forecast_rows), S.FORECAST_TURNS)
+        self.assertEqual(g.forecast_rows[0]["compute"], 1)  # BUY-CHIPS projected
+        self.assertIn("this placement", g.canvas.itemcget(g.forecast_text_id, "text"))
+
+    def test_end_of_turn_slides_tokens_home(self):
+        g = Game(self.root, animate=True)
+        try:
+            cube = next(c for c in g.cubes if not c.locked)
+            g.place_cube_and_handle_events(cube, 0, 0)
+            g.animator.finish_all()
+            g.take_actions()
+            self.assertIsNone(cube.current_cell)  # the rules state moves at once
+            self.assertIn(("cube", cube.idx), g.animator)
+            g.animator.finish_all()
+            x0, y0, _x1, _y1 = g.canvas.coords(cube.rect)
+            self.assertEqual((round(x0, 6), round(y0, 6)), (round(cube.start_x, 6), round(cube.start_y, 6)))
+        finally:
+            g.canvas.destroy()
+
+    def test_snapshots_share_unchanged_parts(self):
+        g = self.game
+        first = g.history.current
+        cube = next(c for c in g.cubes if not c.locked)
+        g.place_cube_and_handle_events(cube, 2, 0)
+        g._checkpoint()
+        second = g.history.current
+        self.assertIsNot(second.board, first.board)
+        for field in ("funds", "regions", "hand", "decks", "trackers"):
+            self.assertIs(getattr(second, field), getattr(first, field))
+
+    def test_a_draw_copies_only_its_own_pile(self):
+        g = self.game
+        first = g.history.current
+        g.hand.append(g.deck.draw("CHAOS")[0])
+        g._checkpoint()
+        second = g.history.current
+        chaos = S.CARD_TYPES.index("CHAOS")
+        self.assertEqual(len(second.decks[chaos]), len(first.decks[chaos]) - 1)
+        for i, (old, new) in enumerate(zip(first.decks, second.decks)):
+            if i != chaos:
+                self.assertIs(new, old)
+
+    def test_attached_window_plays_through_the_host(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        host = GameHost(bot_turn_ms=0)
+        address = asyncio.run_coroutine_threadsafe(host.start("127.0.0.1:0"), loop).result(10)
+        g = self.game
+        try:
+            g.attach_host(HostClient(address), "tk", seed=5)
+
+            def pump(until):
+                for _ in range(500):
+                    g._poll_remote()
+                    if until():
+                        return
+                    threading.Event().wait(0.01)
+                self.fail("no message from the host")
+
+            pump(lambda: g._remote_state is not None)
+            cube = next(c for c in g.cubes if not c.locked)
+            g.place_cube_and_handle_events(cube, 1, 1)
+            g.take_actions()
+            pump(lambda: g.selecting_regions)
+            self.assertEqual(g.selection_tasks[0]["type"], "add_presence")
+            self.assertEqual(g.turn, 0)  # nothing is resolved here
+            g._send_region(S.REGION_NAMES[0])
+            pump(lambda: g.turn == 1)
+            self.assertTrue(g.regions.has_presence(S.REGION_NAMES[0]))
+            self.assertFalse(g.selecting_regions)
+            self.assertIsNone(cube.current_cell)
+            self.assertEqual(snapshot(g), snapshot(host.sessions["tk"].game))
+            self.assertFalse(g.undo())
+        finally:
+            g.detach_host()
+            asyncio.run_coroutine_threadsafe(host.close(), loop).result(10)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import settings as S
+import rules
+from game_store import GameStore, StoreWriter, TurnCollector
+from strategies import get_strategy
+
+
+class TestGameStore(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.finals = []
+        with StoreWriter(self.dir) as w:
+            for seed in range(6):
+                name = "chaos" if seed % 2 else "economy"
+                rows = TurnCollector()
+                g = rules.play_game(get_strategy(name), seed=seed, turns=12, telemetry=rows)
+                w.add_game(rows.rows, name, seed=seed)
+                self.finals.append((name, g))
+        self.store = GameStore(self.dir)
+
+    def tearDown(self):
+        self.store = None
+        shutil.rmtree(self.dir)
+
+    def test_game_and_turn_lookup(self):
+        self.assertEqual(len(self.store), 6)
+        turns = self.store.game_turns(4)
+        self.assertEqual(list(turns["turn"]), list(range(1, 13)))
+        self.assertEqual(int(turns["funds_after"][-1]), self.finals[4][1].funds.value)
+        rows = self.store.turn_rows(7)
+        self.assertEqual(len(rows), 6)
+        self.assertTrue((self.store.turns["turn"][rows] == 7).all())
+
+    def test_strategy_and_income_indexes(self):
+        self.assertEqual(list(self.store.games_for_strategy("chaos")), [1, 3, 5])
+        incomes = self.store.games["final_income"]
+        mid = int(np.median(incomes))
+        expected = [i for i, v in enumerate(incomes) if v >= mid]
+        self.assertEqual(list(self.store.games_by_income(lo=mid)), expected)
+
+    def test_index_queries_leave_the_games_table_alone(self):
+        expected = (list(self.store.games_for_strategy("economy")), list(self.store.games_by_income(hi=0)))
+        self.store.games = None  # the sorted keys saved beside each index are all a query reads
+        self.assertEqual((list(self.store.games_for_strategy("economy")), list(self.store.games_by_income(hi=0))),
+                         expected)
+        self.assertEqual(expected[0], [0, 2, 4])
+
+    def test_chaos_max_query_matches_a_full_scan(self):
+        hit = self.store.games_hitting_chaos_max("Africa")
+        expected = sorted({int(g) for g in self.store.turns["game"][self.store.turns["africa_chaos"] >= S.CHAOS_MAX]})
+        self.assertEqual(list(hit), expected)
+
+    def test_appending_keeps_ids_dense(self):
+        self.store = None
+        with StoreWriter(self.dir) as w:
+            self.assertEqual(w.add_game([], "random"), 6)
+        self.assertEqual(len(GameStore(self.dir)), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
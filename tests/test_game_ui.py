@@ -1,9 +1,13 @@
 import os
+import time
 import unittest
 import tkinter as tk
+from unittest import mock
 
 import settings as S
+from assets import SpriteAtlas
 from game import Game, Image, ImageTk  # Image, ImageTk may be None
+from replay import record_game
 
 class TestGameUI(unittest.TestCase):
     def setUp(self):
@@ -66,6 +70,21 @@ class TestGameUI(unittest.TestCase):
                 self.assertLessEqual(tx1 - tol, cx1)
                 self.assertLessEqual(ty1 - tol, cy1)
 
+    def test_large_board_draws_only_cells_in_view(self):
+        with mock.patch.multiple(S, GRID_ROWS=12, GRID_COLS=12):
+            g = Game(self.root)
+            try:
+                L = g.layout
+                g.canvas.config(width=L.grid_x + 3 * L.cell, height=L.grid_y + 2 * L.cell)
+                g._update_grid_view()
+                self.assertLess(len(g.grid_view.shown), 30)
+                self.assertIn((0, 0), g.grid_view.shown)
+                self.assertNotIn((11, 11), g.grid_view.shown)
+                self.assertIn((0, 1), g.cell_text_ids)  # labels come with their cells
+                self.assertEqual(L.cell_at(*L.cell_centers[L.cell_index(11, 11)]), (11, 11))
+            finally:
+                g.canvas.destroy()
+
     def test_side_image_position_if_available(self):
         if Image is None or ImageTk is None or not os.path.exists(S.SIDE_IMAGE_PATH):
             self.skipTest("Side image not available in this environment")
@@ -142,6 +161,164 @@ class TestGameUI(unittest.TestCase):
         bolded = [txt for (_tid, bold, txt) in g.costs_line_ids if bold]
         self.assertIn(f"V3: Pay ${S.MODEL_UPGRADE_COSTS[3]}, {S.COMPUTE_STEPS[3]}", bolded)
 
+    def test_toasts_and_markers_reuse_canvas_items(self):
+        g = self.game
+        g._toast("first")
+        first = g.toast_id
+        g._toast("second")
+        self.assertEqual(g.toast_id, first)
+        self.assertEqual(g.canvas.itemcget(first, "text"), "second")
+        g._hide_toast()
+        self.assertIsNone(g.toast_id)
+
+        if not g.region_hitboxes:
+            self.skipTest("Side image not available in this environment")
+        g.regions.add_presence("Asia")
+        g._render_region_markers()
+        hex_id = g.region_hex_ids["Asia"]
+        g._render_region_markers()
+        self.assertEqual(g.region_hex_ids["Asia"], hex_id)
+
+    def test_marker_goes_back_to_the_pool_that_drew_it(self):
+        g = self.game
+        if not g.region_hitboxes or Image is None:
+            self.skipTest("Side image not available in this environment")
+        g.regions.add_presence("Asia")
+        g._render_region_markers()
+        kind, outline = g.region_hex_ids["Asia"]  # no marker art packed yet: a drawn hexagon
+        self.assertEqual(kind, "hex")
+
+        g.assets.atlas = SpriteAtlas.pack({"markers/hex": Image.new("RGB", (32, 32), "blue")})
+        g.assets.clear()
+        g._render_region_markers()
+        kind, image = g.region_hex_ids["Asia"]
+        self.assertEqual(kind, "hex_image")
+        self.assertEqual(g.canvas.itemcget(outline, "state"), "hidden")
+
+        g.regions["Asia"].player_presence = False
+        g._render_region_markers()
+        self.assertNotIn("Asia", g.region_hex_ids)
+        self.assertEqual(g.canvas.itemcget(image, "state"), "hidden")
+
+    def test_rescale_keeps_placement_and_hitboxes_in_sync(self):
+        g = self.game
+        g.apply_scale(0.5)
+        L = g.layout
+        self.assertAlmostEqual(L.cell, S.CELL_SIZE * 0.5)
+
+        # Grid rect for (0, 0) moved with the canvas
+        cube = g.cubes[0]
+        g.place_cube_and_handle_events(cube, 1, 2)
+        self.assertEqual(g.cell_from_cube_center(cube), (1, 2))
+        cube.return_to_start()
+        x0, y0, _x1, _y1 = g.canvas.coords(cube.rect)
+        self.assertAlmostEqual(x0, cube.start_x, delta=1)
+
+        if g.region_hitboxes:
+            hx0, hy0, _hx1, _hy1 = g.region_hitboxes["North America"]
+            self.assertGreaterEqual(hx0, L.side_x)
+            self.assertGreaterEqual(hy0, L.side_y)
+
+        # Debounced refit runs once
+        g._relayout_settled()
+        if g.side_image_id is not None:
+            self.assertEqual(g.side_image_dims[1], int(round(L.side_h)))
+
+    def test_window_size_fits_layout(self):
+        root = tk.Tk(); root.withdraw()
+        try:
+            base = self.game.layout
+            g = Game(root, window_size=(base.width // 2, base.height // 2))
+            self.assertAlmostEqual(g.layout.scale, 0.5, delta=0.01)
+            self.assertLessEqual(g.layout.width, base.width // 2 + 1)
+        finally:
+            root.destroy()
+
+    def test_replay_seek_updates_panels_in_place(self):
+        g = self.game
+        rec = record_game("random", seed=4, turns=30)
+        items_before = len(g.canvas.find_all())
+        g.enter_replay(rec)
+        g.replay_seek(25)
+        state = rec.state_at(25)
+        self.assertEqual(g.funds.value, state["funds"])
+        self.assertIn(f"${state['funds']}", g.canvas.itemcget(g.funds.label_id, "text"))
+        txt = g.canvas.itemcget(g.region_panel_items["Europe"]["text"], "text")
+        self.assertIn(f"Reputation: {state['Europe:rep']}", txt)
+        self.assertEqual(sum(not c.locked for c in g.cubes), state["ops_available"])
+        self.assertFalse(set(g.hand) & {cid for t in S.CARD_TYPES for cid in g.deck[t].ids()})
+        g.replay_seek(3)
+        self.assertEqual(g.turn, 3)
+        self.assertFalse(set(g.hand) & {cid for t in S.CARD_TYPES for cid in g.deck[t].ids()})
+        self.assertEqual(g.canvas.itemcget(g.deck_text, "text"), g._deck_label())
+        first = S.CARD_TYPES[0]
+        self.assertIn(f"{first.title()} {len(rec.state_at(3)[f'deck:{first}'])}", g._deck_label())
+        # seeking only re-renders: the slider window and caption are the only new items
+        self.assertLessEqual(len(g.canvas.find_all()), items_before + 2 + len(S.REGION_NAMES))
+
+    def test_heatmap_overlay_follows_region_state(self):
+        g = self.game
+        if g.side_image_id is None:
+            self.skipTest("map image unavailable")
+
+        def settle():
+            for _ in range(500):
+                g._poll_heatmap()
+                if g._heatmap_wanted is None:
+                    return
+                time.sleep(0.01)
+            self.fail("overlay never arrived")
+
+        g.set_heatmap("chaos")
+        settle()
+        self.assertEqual(g.canvas.itemcget(g.heatmap_id, "state"), "normal")
+        g.regions["Asia"].set_chaos(S.CHAOS_STEP)
+        g._update_region_panel("Asia")
+        settle()
+        self.assertEqual(g.heatmap.composited, 2)
+        g._update_region_panel("Asia")  # nothing changed: no new work
+        self.assertIsNone(g._heatmap_wanted)
+        g.set_heatmap(None)
+        self.assertEqual(g.canvas.itemcget(g.heatmap_id, "state"), "hidden")
+
+    def test_staged_construction_paints_grid_first(self):
+        g = Game(self.root, staged=True)
+        self.assertFalse(g.constructed)
+        self.assertIsNone(g.side_image_id)
+        self.assertFalse(hasattr(g, "region_panel_items"))
+        self.assertTrue(g._placeholder_ids)
+        # tokens are live before the rest of the board exists
+        cube = next(c for c in g.cubes if not c.locked)
+        g.place_cube_and_handle_events(cube, 0, 0)
+        self.assertEqual(g.ledger.placed_cells(), [(0, 0)])
+
+        g._run_next_stage()  # sprites
+        self.assertIn("first_frame", g.startup_ms)
+        self.assertFalse(g.constructed)
+        g.take_actions()  # needs the panels: builds the rest at once
+        self.assertTrue(g.constructed)
+        self.assertEqual(g._placeholder_ids, {})
+        self.assertIn("Europe", g.region_panel_items)
+        self.assertLessEqual(g.startup_ms["first_frame"], g.startup_ms["ready"])
+
+    def test_staged_construction_defers_decoding_art(self):
+        if Image is None or ImageTk is None:
+            self.skipTest("PIL not available in this environment")
+        sprites = SpriteAtlas.pack({f"tokens/C{i + 1}": Image.new("RGB", (80, 80), "red") for i in range(4)})
+        with mock.patch.object(SpriteAtlas, "from_dirs", return_value=sprites) as from_dirs:
+            g = Game(self.root, staged=True)
+            from_dirs.assert_not_called()
+            self.assertIsNone(g._side_img_src)
+            self.assertTrue(all(c.image_id is None for c in g.cubes))
+            g._run_next_stage()  # sprites
+            from_dirs.assert_called_once()
+        self.assertTrue(all(c.image_id is not None for c in g.cubes))
+        self.assertIsNone(g._side_img_src)
+        g.finish_construction()
+        if os.path.exists(S.SIDE_IMAGE_PATH):
+            self.assertIsNotNone(g._side_img_src)
+            self.assertEqual(g.side_image_dims[1], int(round(g.layout.side_h)))
+
 
 if __name__ == "__main__":
     unittest.main()
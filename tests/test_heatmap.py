@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+import settings as S
+from heatmap import HeatmapCompositor, composite, metric_weights, region_labels, region_values
+from regions import RegionManager
+
+
+class TestHeatmap(unittest.TestCase):
+    def setUp(self):
+        # white sea with one dark pixel block in the middle of every region box
+        self.base = np.full((100, 200, 3), 255, dtype=np.uint8)
+        for x0, y0, x1, y1 in S.REGION_BBOXES_FRAC.values():
+            cx, cy = int((x0 + x1) / 2 * 200), int((y0 + y1) / 2 * 100)
+            self.base[cy - 1:cy + 2, cx - 1:cx + 2] = 40
+
+    def test_labels_cover_land_only(self):
+        labels = region_labels(self.base)
+        self.assertTrue((labels[self.base.min(axis=2) >= S.HEATMAP_LAND_THRESHOLD] == -1).all())
+        for i, (x0, y0, x1, y1) in enumerate(S.REGION_BBOXES_FRAC.values()):
+            cx, cy = int((x0 + x1) / 2 * 200), int((y0 + y1) / 2 * 100)
+            self.assertEqual(labels[cy, cx], i)
+
+    def test_composite_tints_by_weight(self):
+        labels = region_labels(self.base)
+        weights = np.zeros(len(S.REGION_NAMES))
+        weights[2] = 1.0
+        out = composite(self.base, labels, weights, (255, 0, 0), alpha=1.0)
+        self.assertTrue((out[labels == 2] == (255, 0, 0)).all())
+        self.assertTrue((out[labels != 2] == self.base[labels != 2]).all())
+
+    def test_weights_are_scaled_per_metric(self):
+        self.assertEqual(metric_weights("chaos", [S.CHAOS_MAX, 0])[0], 1.0)
+        self.assertEqual(list(metric_weights("power", [4, 2, -1])), [1.0, 0.5, 0.0])
+
+    def test_compositor_memoises_by_state(self):
+        comp = HeatmapCompositor()
+        try:
+            values = region_values(RegionManager(), "chaos")
+            self.assertIsNone(comp.request(self.base, "chaos", values))
+            key, img = comp.results.get(timeout=5)
+            self.assertEqual(key, HeatmapCompositor.key(self.base, "chaos", values))
+            self.assertIs(comp.request(self.base, "chaos", values), img)
+            self.assertEqual(comp.composited, 1)
+        finally:
+            comp.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from history import History
+
+
+class TestHistory(unittest.TestCase):
+    def test_undo_redo_and_dedupe(self):
+        h = History(limit=10)
+        for s in ("a", "a", "b", "c"):
+            h.commit(s)
+        self.assertEqual(len(h), 3)
+        self.assertEqual(h.undo(), "b")
+        self.assertEqual(h.undo(), "a")
+        self.assertIsNone(h.undo())
+        self.assertEqual(h.redo(), "b")
+        h.commit("d")  # a new action drops the redo branch
+        self.assertFalse(h.can_redo())
+        self.assertEqual(h.current, "d")
+
+    def test_limit_bounds_memory(self):
+        h = History(limit=3)
+        for i in range(20):
+            h.commit(i)
+        steps = 0
+        while h.undo() is not None:
+            steps += 1
+        self.assertEqual(steps, 3)
+        self.assertEqual(h.current, 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
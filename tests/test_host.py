@@ -0,0 +1,146 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+import settings as S
+from host import GameHost, HostClient, encode, parse_address, read_message, state_diff
+from replay import snapshot
+from rules import SimGame, play_game
+from strategies import Strategy, get_strategy
+
+
+class _Picks(Strategy):
+    def __init__(self, regions):
+        self.regions = list(regions)
+
+    def pick_region(self, game, task_type, candidates):
+        return self.regions.pop(0)
+
+    def keep_card(self, game, offered):
+        return None
+
+
+class TestProtocol(unittest.TestCase):
+    def test_addresses(self):
+        self.assertEqual(parse_address("unix:/tmp/a.sock"), ("unix", "/tmp/a.sock"))
+        self.assertEqual(parse_address(":7000"), ("tcp", ("127.0.0.1", 7000)))
+        self.assertEqual(parse_address("0.0.0.0:0"), ("tcp", ("0.0.0.0", 0)))
+        with self.assertRaises(ValueError):
+            parse_address("localhost")
+
+    def test_frames_are_length_prefixed_compact_json(self):
+        frame = encode({"op": "place", "cells": [[1, 1]]})
+        self.assertEqual(frame[4:], b'{"op":"place","cells":[[1,1]]}')
+        self.assertEqual(int.from_bytes(frame[:4], "big"), len(frame) - 4)
+
+    def test_diff_holds_only_changed_fields(self):
+        game = SimGame(1)
+        before = snapshot(game)
+        game.play_turn([(0, 0)], get_strategy("economy"))
+        diff = state_diff(before, snapshot(game))
+        self.assertEqual(diff["compute"], 1)
+        self.assertNotIn("ops_available", diff)
+        self.assertEqual({**before, **diff}, snapshot(game))
+
+
+class TestGameHost(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.host = GameHost(bot_turn_ms=0)
+        self.address = await self.host.start("127.0.0.1:0")
+
+    async def asyncTearDown(self):
+        await self.host.close()
+
+    async def connect(self, **join):
+        reader, writer = await asyncio.open_connection(*parse_address(self.address)[1])
+        writer.write(encode({"op": "join", **join}))
+        msg = await asyncio.wait_for(read_message(reader), 5)
+        self.assertEqual(msg["op"], "state")
+        return reader, writer, msg["state"]
+
+    async def test_place_prompts_for_regions_then_pushes_the_diff(self):
+        reader, writer, state = await self.connect(session="hot", seed=4)
+        watcher, watcher_w, _ = await self.connect(session="hot", watch=True)
+        writer.write(encode({"op": "place", "cells": [[1, 1]]}))
+        prompt = await read_message(reader)
+        self.assertEqual(prompt["tasks"], [{"type": "add_presence", "requires_presence": False}])
+        self.assertEqual(prompt["candidates"], list(S.REGION_NAMES))
+        writer.write(encode({"op": "select", "region": "Atlantis"}))
+        self.assertEqual((await read_message(reader))["op"], "error")
+        self.assertEqual((await read_message(reader))["op"], "prompt")  # asked again
+        pick = S.REGION_NAMES[2]
+        writer.write(encode({"op": "select", "region": pick}))
+        diff = await read_message(reader)
+        self.assertEqual(diff["op"], "diff")
+        self.assertEqual(await read_message(watcher), diff)  # watchers see every turn too
+
+        local = SimGame(4)
+        local.play_turn([(1, 1)], _Picks([pick]))
+        self.assertEqual({**state, **diff["set"]}, snapshot(local))
+
+        watcher_w.write(encode({"op": "place", "cells": []}))
+        self.assertEqual((await read_message(watcher))["op"], "error")
+        for w in (writer, watcher_w):
+            w.close()
+
+    async def test_later_picks_see_presence_added_this_turn(self):
+        reader, writer, _ = await self.connect(session="p", seed=2)
+        self.host.sessions["p"].game.ops_available = 2
+        writer.write(encode({"op": "place", "cells": [[1, 1]]}))
+        await read_message(reader)
+        writer.write(encode({"op": "select", "region": S.REGION_NAMES[0]}))
+        await read_message(reader)
+        writer.write(encode({"op": "place", "cells": [[1, 1], [1, 0]]}))
+        self.assertEqual((await read_message(reader))["op"], "prompt")
+        writer.write(encode({"op": "select", "region": S.REGION_NAMES[1]}))
+        prompt = await read_message(reader)
+        self.assertEqual(prompt["tasks"], [{"type": "rep+1", "requires_presence": True}])
+        self.assertEqual(prompt["candidates"], list(S.REGION_NAMES[:2]))
+        writer.close()
+
+    async def test_bot_matches_run_side_by_side(self):
+        watchers = [await self.connect(session=f"bot-{i}", seed=i, bot="economy", turns=3) for i in range(3)]
+        for i, (reader, writer, state) in enumerate(watchers):
+            turn = 0
+            while turn < 3:
+                diff = await asyncio.wait_for(read_message(reader), 5)
+                state = {**state, **diff["set"]}
+                turn = diff["turn"]
+            self.assertEqual(state, snapshot(play_game(get_strategy("economy"), seed=i, turns=3)))
+            writer.close()
+
+    async def test_bad_frames_are_refused(self):
+        reader, writer, _ = await self.connect(session="x")
+        writer.write(encode({"op": "fly"}))
+        self.assertIn("unknown op", (await read_message(reader))["msg"])
+        writer.write((S.HOST_MAX_FRAME + 1).to_bytes(4, "big"))
+        self.assertEqual((await read_message(reader))["op"], "error")
+        self.assertEqual(await reader.read(), b"")  # and the connection is closed
+        writer.close()
+
+
+class TestHostClient(unittest.TestCase):
+    def test_blocking_client_over_a_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), "host.sock")
+
+        async def run():
+            host = GameHost(bot_turn_ms=0)
+            await host.start(f"unix:{path}")
+            client = await asyncio.to_thread(HostClient, f"unix:{path}")
+            client.send({"op": "join", "session": "s", "seed": 1})
+            state = await asyncio.to_thread(client.inbox.get, True, 5)
+            client.send({"op": "place", "cells": [[0, 0]]})
+            diff = await asyncio.to_thread(client.inbox.get, True, 5)
+            await host.close()
+            self.assertIsNone(await asyncio.to_thread(client.inbox.get, True, 5))
+            client.close()
+            return state, diff
+
+        state, diff = asyncio.run(run())
+        self.assertEqual(state["op"], "state")
+        self.assertEqual((diff["op"], diff["turn"], diff["set"]["compute"]), ("diff", 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
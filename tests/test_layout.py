@@ -0,0 +1,43 @@
+import unittest
+
+import settings as S
+from layout import build_layout, costs_line_pads
+
+
+class TestLayoutTable(unittest.TestCase):
+    def test_cell_at_matches_cell_rects(self):
+        L = build_layout()
+        for r in range(S.GRID_ROWS):
+            for c in range(S.GRID_COLS):
+                x0, y0, x1, y1 = L.cell_rects[L.cell_index(r, c)]
+                self.assertEqual(L.cell_at(x0 + 1, y0 + 1), (r, c))
+                self.assertEqual(L.cell_at(*L.cell_centers[L.cell_index(r, c)]), (r, c))
+        self.assertIsNone(L.cell_at(L.grid_x - 1, L.grid_y))
+        self.assertIsNone(L.cell_at(L.grid_x + L.grid_w, L.grid_y))
+
+    def test_tables_have_one_entry_per_thing(self):
+        L = build_layout(side_aspect=1.5)
+        self.assertEqual(len(L.cell_rects), S.GRID_ROWS * S.GRID_COLS)
+        self.assertEqual(len(L.hand_slots), S.HAND_LIMIT)
+        self.assertEqual(len(L.ops_avail_slots), S.OPS_MAX_TOKENS)
+        self.assertEqual(len(L.offer_cards), S.CARD_DRAW_COUNT)
+        self.assertEqual(len(L.region_hitboxes), len(S.REGION_NAMES))
+        self.assertEqual(len(L.panel_rects), len(S.REGION_NAMES))
+        self.assertEqual(len(L.costs_lines), len(costs_line_pads()))
+
+    def test_scaling_is_uniform(self):
+        a, b = build_layout(1.0, 1.5), build_layout(0.5, 1.5)
+        self.assertAlmostEqual(b.cell, a.cell / 2)
+        for ra, rb in zip(a.hand_slots + a.region_hitboxes, b.hand_slots + b.region_hitboxes):
+            for va, vb in zip(ra, rb):
+                self.assertAlmostEqual(vb, va / 2)
+        self.assertEqual(b.cell_at(*b.cell_centers[5]), a.cell_at(*a.cell_centers[5]))
+
+    def test_layout_is_frozen(self):
+        L = build_layout()
+        with self.assertRaises(Exception):
+            L.cell = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
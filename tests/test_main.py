@@ -0,0 +1,40 @@
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+import rules
+from balance_sweep import METRICS
+from main import main, run_batch
+from strategies import get_strategy
+
+
+class TestHeadlessBatch(unittest.TestCase):
+    def test_batch_matches_single_games_in_seed_order(self):
+        seeds, outcomes = run_batch("chaos", games=7, seed=5, turns=10, jobs=3)
+        self.assertEqual(seeds, list(range(5, 12)))
+        for s, row in zip(seeds, outcomes):
+            res = rules.play_game(get_strategy("chaos"), seed=s, turns=10).outcome()
+            self.assertEqual(row.tolist(), [res[m] for m in METRICS])
+
+    def test_cli_prints_throughput_and_writes_results(self):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        try:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                main(["--headless", "--games", "4", "--strategy", "economy", "--jobs", "1",
+                      "--turns", "5", "--out", path])
+            self.assertIn("games/s", out.getvalue())
+            self.assertIn("turns/s", out.getvalue())
+            with open(path) as fh:
+                rows = list(csv.DictReader(fh))
+            self.assertEqual([r["seed"] for r in rows], ["0", "1", "2", "3"])
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
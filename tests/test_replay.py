@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import rules
+import settings as S
+from replay import Recording, record_game, restore, snapshot
+from strategies import get_strategy
+
+
+class TestRecording(unittest.TestCase):
+    def test_every_turn_matches_a_live_replay(self):
+        rec = record_game("economy", seed=5, turns=40)
+        game, strategy = rules.SimGame(5), get_strategy("economy")
+        self.assertEqual(rec.state_at(0), snapshot(game))
+        for turn in range(1, 41):
+            game.play_turn(strategy.place(game), strategy)
+            self.assertEqual(rec.state_at(turn), snapshot(game))
+
+    def test_keyframes_bound_the_deltas_applied(self):
+        rec = record_game("random", seed=1, turns=40)
+        self.assertEqual(sorted(rec.keyframes), list(range(0, 41, rec.keyframe_every)))
+        self.assertEqual(rec.state_at(999), rec.state_at(40))
+
+    def test_deltas_carry_only_the_cards_that_moved(self):
+        rec = record_game("random", seed=3, turns=30)
+        for turn, delta in enumerate(rec.deltas, 1):
+            self.assertFalse([k for k in delta if k.startswith("deck:")])  # no whole piles
+            before, after = rec.state_at(turn - 1), rec.state_at(turn)
+            for t in S.CARD_TYPES:
+                moved = set(before[f"deck:{t}"]) ^ set(after[f"deck:{t}"])
+                self.assertEqual(set(delta.get(f"drawn:{t}", ())) | set(delta.get(f"returned:{t}", ())), moved)
+
+    def test_save_load_and_restore(self):
+        rec = record_game("chaos", seed=2, turns=10)
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            rec.save(path)
+            loaded = Recording.load(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(loaded.actions, rec.actions)
+        game = rules.SimGame(0)
+        restore(game, loaded.state_at(7))
+        self.assertEqual(snapshot(game), rec.state_at(7))
+
+    def test_restore_brings_back_the_draw_piles(self):
+        rec = record_game("random", seed=3, turns=30)
+        game = rules.SimGame(3)
+        for turn in (30, 4, 0):
+            state = rec.state_at(turn)
+            restore(game, state)
+            piles = [cid for deck in game.deck.decks.values() for cid in deck.ids()]
+            self.assertFalse(set(game.hand) & set(piles))
+            self.assertEqual(len(game.hand) + len(piles), len(game.catalog.types) - 1)
+            self.assertEqual(snapshot(game), state)
+
+
+if __name__ == "__main__":
+    unittest.main()
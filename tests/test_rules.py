@@ -0,0 +1,129 @@
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import settings as S
+import rules
+from balance_sweep import parse_values, settings_overrides, sweep, METRICS, main as sweep_main
+from game_store import GameStore, StoreWriter
+from strategies import STRATEGIES, get_strategy
+
+
+class TestRules(unittest.TestCase):
+    def test_selection_tasks_order(self):
+        tasks = rules.selection_tasks([(2, 2), (1, 0), (1, 1)])
+        self.assertEqual([t["type"] for t in tasks], ["add_presence", "rep+1", "rep-1_chaos+10"])
+
+    def test_model_never_passes_compute(self):
+        self.assertEqual(rules.advance_trackers(0, 0, bumps_model=2), (0, 0))
+        self.assertEqual(rules.advance_trackers(0, 0, bumps_compute=2, bumps_model=1), (2, 1))
+
+    def test_illegal_placement_raises(self):
+        g = rules.SimGame(seed=1)
+        with self.assertRaises(ValueError):
+            g.play_turn([(1, 0)], get_strategy("random"))  # needs presence
+        with self.assertRaises(ValueError):
+            g.play_turn([(0, 0), (0, 1)], get_strategy("random"))  # one token only
+
+    def test_turn_charges_and_income(self):
+        g = rules.SimGame(seed=1)
+        strat = get_strategy("random")
+        g.play_turn([(1, 1)], strat)
+        self.assertEqual(len(g.regions.with_presence()), 1)
+        self.assertEqual(g.funds.value, S.FUNDS_START - S.FUNDS_SERIES["scale_presence"][0])
+
+    def test_games_are_reproducible_from_seed(self):
+        for name in STRATEGIES:
+            a = rules.play_game(get_strategy(name), seed=7).outcome()
+            b = rules.play_game(get_strategy(name), seed=7).outcome()
+            self.assertEqual(a, b)
+
+    def test_ledger_tracks_placements_incrementally(self):
+        g = rules.SimGame(seed=1)
+        ledger = rules.TurnLedger()
+        for cell in [(0, 2), (1, 1), (1, 0)]:
+            ledger.add(cell)
+        cells = ledger.placed_cells()
+        self.assertEqual(ledger.charges, rules.preview_charges(cells))
+        self.assertEqual(ledger.pending_cost(g.funds), rules.pending_cost(g.funds, cells))
+        self.assertEqual(ledger.blocker(g.funds, g.regions), "Requires presence in a region")
+        ledger.remove((1, 0))
+        self.assertEqual(ledger.blocker(g.funds, g.regions), "")
+        g.funds.value = 0
+        self.assertEqual(ledger.blocker(g.funds, g.regions), "Insufficient Funds")
+        ledger.clear()
+        self.assertEqual((ledger.placed, ledger.placed_cells()), (0, []))
+
+    def test_ledger_follows_the_board_size_in_settings(self):
+        ledger = rules.TurnLedger()
+        ledger.add((5, 7))  # off the standard board
+        self.assertEqual(ledger.placed, 0)
+        with mock.patch.multiple(S, GRID_ROWS=12, GRID_COLS=12):
+            ledger.add((5, 7))
+            self.assertEqual((ledger.placed, ledger.placed_cells()), (1, [(5, 7)]))
+            g = rules.SimGame(seed=0)
+            g.regions.add_presence(S.REGION_NAMES[0])
+            self.assertIn((11, 11), g.legal_cells())
+            self.assertTrue(g.can_take([(3, 0)]))
+        self.assertFalse(rules.SimGame(seed=0).can_take([(3, 0)]))
+
+
+class TestBalanceSweep(unittest.TestCase):
+    def test_parse_values(self):
+        self.assertEqual(parse_values("1,2,5"), [1, 2, 5])
+        self.assertEqual(parse_values("0.5:2:0.5"), [0.5, 1.0, 1.5, 2.0])
+        self.assertEqual(parse_values("5:15:5"), [5, 10, 15])
+
+    def test_values_the_game_cannot_run_under_are_refused(self):
+        for arg in ("CHAOS_STEP=0:2:1", "CHAOS_STEP=1.5", "FUNDS_START=-5,5", "MODEL_UPGRADE_COSTS=-1"):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()) as err:
+                sweep_main(["--param", arg, "--games", "1"])
+            self.assertIn(arg.split("=")[0], err.getvalue())
+        with self.assertRaises(ValueError):
+            with settings_overrides({"CHAOS_STEP": 0}):
+                pass
+
+    def test_overrides_are_scoped(self):
+        before = (S.FUNDS_START, dict(S.FUNDS_SERIES), list(S.MODEL_UPGRADE_COSTS))
+        with settings_overrides({"FUNDS_START": 99, "MODEL_UPGRADE_COSTS": 2}):
+            self.assertEqual(S.FUNDS_START, 99)
+            self.assertEqual(S.FUNDS_SERIES["compute_or_model"][1], 2 * before[1]["compute_or_model"][1])
+            self.assertEqual(rules.SimGame(seed=0).funds.value, 99)
+        self.assertEqual((S.FUNDS_START, dict(S.FUNDS_SERIES), list(S.MODEL_UPGRADE_COSTS)), before)
+
+    def test_sweep_shape_and_config_effect(self):
+        configs, out = sweep({"FUNDS_START": [0, 50]}, ["economy"], games=3, turns=2, jobs=1)
+        self.assertEqual(out.shape, (2, 1, 3, len(METRICS)))
+        funds = METRICS.index("funds")
+        self.assertLess(out[0, 0, :, funds].mean(), out[1, 0, :, funds].mean())
+
+    def test_parallel_sweep_streams_the_same_games(self):
+        grid, names = {"FUNDS_START": [0, 50]}, ["economy", "chaos"]
+        dirs = [tempfile.mkdtemp(), tempfile.mkdtemp()]
+        try:
+            outs = []
+            for path, jobs in zip(dirs, (1, 2)):
+                with StoreWriter(path) as store:
+                    outs.append(sweep(grid, names, games=3, turns=4, jobs=jobs, store=store)[1])
+            np.testing.assert_array_equal(outs[0], outs[1])
+            serial, parallel = GameStore(dirs[0]), GameStore(dirs[1])
+            key = lambda store, g: (int(g["config"]), store.strategies[g["strategy"]], int(g["seed"]))
+            order = {key(serial, g): i for i, g in enumerate(serial.games)}  # games arrive in any order
+            self.assertEqual(len(parallel), len(serial))
+            for j, g in enumerate(parallel.games):
+                i = order[key(parallel, g)]
+                cols = [c for c in serial.turns.dtype.names if c != "game"]
+                np.testing.assert_array_equal(parallel.game_turns(j)[cols], serial.game_turns(i)[cols])
+            serial = parallel = None
+        finally:
+            for path in dirs:
+                shutil.rmtree(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
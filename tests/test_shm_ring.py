@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+import shm_ring
+from shm_ring import RecordRing, RingClosed, run_pool, worker_ring
+
+
+def _count_job(job):
+    start, n = job
+    ring = worker_ring()
+    for i in range(start, start + n):
+        ring.put((i, i * i))
+    return ring.stalls
+
+
+def _failing_job(job):
+    worker_ring().put((job,))
+    raise RuntimeError("boom")
+
+
+class TestRecordRing(unittest.TestCase):
+    def test_records_wrap_around_the_block(self):
+        with RecordRing(3, capacity=4) as ring:
+            seen = []
+            for i in range(10):
+                ring.put((i, -i))
+                if len(ring) == 3:
+                    seen += ring.pending().tolist()
+                    ring.release(len(ring.pending()))
+            ring.drain(lambda rows: seen.extend(rows.tolist()))
+            self.assertEqual(seen, [[i, -i, 0] for i in range(10)])  # short records are zero-filled
+            self.assertEqual(len(ring), 0)
+
+    def test_full_ring_pushes_back_on_the_writer(self):
+        with RecordRing(1, capacity=2) as ring:
+            ring.put((1,)); ring.put((2,))
+            with self.assertRaises(TimeoutError):
+                ring.put((3,), timeout=0.01)
+            self.assertEqual(ring.stalls, 1)
+            ring.release(1)
+            ring.put((3,))
+            ring.shut_down()
+            with self.assertRaises(RingClosed):
+                ring.put((4,))
+
+    def test_attached_ring_shares_the_records_and_only_the_creator_unlinks(self):
+        ring = RecordRing(2, capacity=8)
+        other = RecordRing.attach(ring.spec)
+        other.put((7, 8))
+        np.testing.assert_array_equal(ring.pending(), [[7, 8]])
+        name = ring.spec[0]
+        other.close()
+        SharedMemory(name).close()  # still there
+        ring.close()
+        with self.assertRaises(FileNotFoundError):
+            SharedMemory(name)
+
+
+class TestRunPool(unittest.TestCase):
+    def test_records_from_every_worker_arrive(self):
+        got, progress = [], []
+        stalls = run_pool(_count_job, [(i * 50, 50) for i in range(8)], 3, 2,
+                          lambda rows: got.extend(map(tuple, rows.tolist())),
+                          capacity=16, on_done=lambda done, total: progress.append((done, total)))
+        self.assertEqual(sorted(got), [(i, i * i) for i in range(400)])
+        self.assertEqual(len(stalls), 8)  # return values, in work order
+        self.assertEqual(progress[-1], (8, 8))
+
+    def test_worker_error_is_raised_and_memory_released(self):
+        created = []
+
+        class Tracked(RecordRing):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                created.append(self.spec[0])
+
+        with mock.patch.object(shm_ring, "RecordRing", Tracked):
+            with self.assertRaises(RuntimeError):
+                run_pool(_failing_job, [1, 2], 2, 1, lambda rows: None)
+        self.assertEqual(len(created), 2)
+        for name in created:
+            with self.assertRaises(FileNotFoundError):
+                SharedMemory(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
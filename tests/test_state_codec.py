@@ -0,0 +1,62 @@
+import unittest
+
+import settings as S
+import state_codec
+from rules import SimGame, play_game
+from strategies import get_strategy
+from zobrist import full_hash
+
+
+class TestStateCodec(unittest.TestCase):
+    def test_round_trip_through_another_game(self):
+        for seed in range(6):
+            game = play_game(get_strategy("chaos" if seed % 2 else "economy"), seed=seed, turns=30)
+            data = state_codec.encode(game)
+            self.assertEqual(len(data), state_codec.size(game.catalog))
+            other = SimGame(seed + 100)
+            state_codec.restore(other, data)
+            self.assertEqual(state_codec.encode(other), data)
+            self.assertEqual(other.zobrist.value, game.zobrist.value)
+            self.assertEqual(other.zobrist.value, full_hash(other))
+            self.assertEqual(sorted(other.hand), sorted(game.hand))
+            self.assertEqual(other.outcome(), game.outcome())
+
+    def test_a_few_dozen_bytes(self):
+        self.assertEqual(state_codec.size(SimGame(0).catalog), 56)
+
+    def test_canonical_for_equal_positions(self):
+        a, b = SimGame(1), SimGame(2)
+        b.deck.put_back(b.deck.draw("RESEARCH", 5))  # same cards, another order
+        b.turn = 7
+        self.assertNotEqual(a.deck.snapshot(), b.deck.snapshot())
+        self.assertEqual(state_codec.encode(a), state_codec.encode(b))
+        b.regions["Europe"].set_chaos(30)
+        self.assertNotEqual(state_codec.encode(a), state_codec.encode(b))
+
+    def test_fields_decode(self):
+        game = SimGame(3)
+        game.regions["Asia"].adjust_rep(-5)
+        game.regions["Asia"].set_presence()
+        game.regions["Asia"].set_chaos(180)
+        game.funds.charge("lobby", 2)
+        game.hand = [game.deck.draw("CHAOS")[0]]
+        state = state_codec.decode(state_codec.encode(game, occupied=[(0, 0), (2, 3)]), game.catalog)
+        self.assertEqual(state["occupied"], [(0, 0), (2, 3)])
+        self.assertEqual(state["regions"]["Asia"], (True, -5, 0, 180))
+        self.assertEqual(state["counters"]["lobby"], 2)
+        self.assertEqual(state["funds"], game.funds.value)
+        self.assertEqual(state["hand"], game.hand)
+        self.assertEqual(len(state["deck"]), len(game.deck))
+        self.assertEqual(state["ops_available"], S.OPS_START_AVAILABLE)
+
+    def test_values_too_wide_are_refused(self):
+        game = SimGame(0)
+        game.funds.value = 1 << S.STATE_FUNDS_BITS
+        with self.assertRaises(ValueError):
+            state_codec.encode(game)
+        with self.assertRaises(ValueError):
+            state_codec.decode(b"\0" * 3, game.catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import errno
+import os
+import tempfile
+import unittest
+
+import rules
+from strategies import get_strategy
+from telemetry import TelemetryWriter, read_telemetry, turn_columns
+
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".tel")
+        os.close(fd)
+        os.remove(self.path)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_one_record_per_turn_across_chunks(self):
+        with TelemetryWriter(self.path, chunk_rows=4) as tel:
+            game = rules.play_game(get_strategy("economy"), seed=3, turns=10, telemetry=tel)
+        data = read_telemetry(self.path)
+        self.assertEqual(tuple(data), turn_columns())
+        self.assertEqual(list(data["turn"]), list(range(1, 11)))
+        self.assertEqual(int(data["funds_after"][-1]), game.funds.value)
+        self.assertEqual(list(data["funds_before"][1:]), list(data["funds_after"][:-1]))
+        self.assertEqual(int(data["north_america_presence"][-1]), int(game.regions.has_presence("North America")))
+
+    def test_sessions_append_to_the_same_file(self):
+        for seed in (1, 2):
+            with TelemetryWriter(self.path, chunk_rows=8) as tel:
+                rules.play_game(get_strategy("random"), seed=seed, turns=5, telemetry=tel)
+        self.assertEqual(len(read_telemetry(self.path)["turn"]), 10)
+
+    def test_schema_mismatch_is_rejected(self):
+        TelemetryWriter(self.path).close()
+        with self.assertRaises(ValueError):
+            TelemetryWriter(self.path, columns=("turn",))
+
+    def test_failed_write_is_reported_not_hung_on(self):
+        class FullDisk:
+            """Takes a few bytes of the first chunk, then the disk is full."""
+
+            def __init__(self, fh):
+                self.fh, self.room = fh, 10
+
+            def write(self, data):
+                if not self.room:
+                    raise OSError(errno.ENOSPC, "No space left on device")
+                n = self.fh.write(data[:self.room])
+                self.room -= n
+                return n
+
+            def __getattr__(self, name):
+                return getattr(self.fh, name)
+
+        tel = TelemetryWriter(self.path, chunk_rows=2, buffers=2)
+        header_size = os.path.getsize(self.path)
+        tel._fh = FullDisk(tel._fh)
+        with self.assertRaises(OSError) as cm:
+            for _ in range(100):  # far more chunks than buffers
+                tel.record([0] * len(tel.columns))
+        self.assertEqual(cm.exception.errno, errno.ENOSPC)
+        with self.assertRaises(OSError):
+            tel.close()
+        self.assertTrue(tel.closed)
+        self.assertEqual(os.path.getsize(self.path), header_size)  # the torn chunk was cut back
+
+    def test_torn_chunk_is_cut_off_before_the_next_session(self):
+        with TelemetryWriter(self.path, chunk_rows=4) as tel:
+            rules.play_game(get_strategy("random"), seed=1, turns=5, telemetry=tel)
+        whole = os.path.getsize(self.path)
+        with open(self.path, "ab") as fh:  # a crash midway through the next chunk
+            fh.write((9).to_bytes(4, "little") + bytes(20))
+        with TelemetryWriter(self.path, chunk_rows=4) as tel:
+            self.assertEqual(os.path.getsize(self.path), whole)
+            rules.play_game(get_strategy("random"), seed=2, turns=5, telemetry=tel)
+        self.assertEqual(list(read_telemetry(self.path)["turn"]), [1, 2, 3, 4, 5] * 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
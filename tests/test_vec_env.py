@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+import settings as S
+from batch_strategies import N_CELLS, TASK_TYPES
+from rules import ALL_CELLS
+from vec_env import OBS_FIELDS, OBS_SIZE, VecEnv
+
+
+def _random_actions(rng, masks):
+    cells = masks["cells"] & (rng.random(masks["cells"].shape) < 0.4)
+    regions = np.argmax(rng.random(masks["regions"].shape) + masks["regions"], axis=2)
+    return {"cells": cells, "regions": regions}
+
+
+class TestVecEnv(unittest.TestCase):
+    def test_shapes_and_masks(self):
+        env = VecEnv(5, turns=3)
+        obs, masks = env.reset(seed=2)
+        self.assertEqual(obs.shape, (5, OBS_SIZE))
+        self.assertEqual(obs[:, OBS_FIELDS.index("funds")].tolist(), [S.FUNDS_START] * 5)
+        self.assertEqual(masks["cells"].shape, (5, N_CELLS))
+        self.assertEqual(masks["regions"].shape, (5, len(TASK_TYPES), len(S.REGION_NAMES)))
+        # no presence yet: presence-gated cells and region tasks are masked out
+        for cell in S.PRESENCE_REQUIRED_COORDS:
+            self.assertFalse(masks["cells"][:, ALL_CELLS.index(cell)].any())
+        self.assertTrue(masks["regions"][:, TASK_TYPES.index("add_presence")].all())
+        self.assertFalse(masks["regions"][:, TASK_TYPES.index("rep+1")].any())
+
+    def test_step_rewards_income_and_autoresets(self):
+        env = VecEnv(3, turns=4)
+        _obs, masks = env.reset(seed=0)
+        regions = np.zeros((3, len(TASK_TYPES)), dtype=int)  # everything to the first region
+        rewards_seen = []
+        for cell in [(1, 1), (1, 0), (1, 2), None]:  # presence, reputation, power, pass
+            cells = np.zeros((3, N_CELLS), dtype=bool)
+            if cell:
+                self.assertTrue(masks["cells"][:, ALL_CELLS.index(cell)].all())
+                cells[:, ALL_CELLS.index(cell)] = True
+            obs, rewards, dones, masks = env.step({"cells": cells, "regions": regions})
+            rewards_seen.append(rewards.tolist())
+        self.assertEqual(rewards_seen, [[0.0] * 3, [0.0] * 3, [1.0] * 3, [1.0] * 3])
+        self.assertTrue(dones.all())
+        # already the next games
+        self.assertEqual(obs[:, OBS_FIELDS.index("funds")].tolist(), [S.FUNDS_START] * 3)
+        self.assertFalse(obs[:, OBS_FIELDS.index("north_america_presence")].any())
+
+    def test_same_seed_and_actions_replay_exactly(self):
+        def run():
+            env, rng = VecEnv(4, turns=10), np.random.default_rng(5)
+            _obs, masks = env.reset(seed=7)
+            out = []
+            for _ in range(10):
+                obs, rewards, _dones, masks = env.step(_random_actions(rng, masks))
+                out.append((obs, rewards))
+            return out
+
+        for (a_obs, a_rew), (b_obs, b_rew) in zip(run(), run()):
+            np.testing.assert_array_equal(a_obs, b_obs)
+            np.testing.assert_array_equal(a_rew, b_rew)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+
+import settings as S
+from balance_sweep import settings_overrides
+from rules import SimGame
+from strategies import STRATEGIES, get_strategy
+from zobrist import EvalCache, full_hash, rehash
+
+
+class TestZobrist(unittest.TestCase):
+    def test_incremental_hash_tracks_every_turn(self):
+        for name in STRATEGIES:
+            strategy = get_strategy(name)
+            g = SimGame(seed=5)
+            self.assertEqual(g.zobrist.value, full_hash(g))
+            for _ in range(30):
+                g.play_turn(strategy.place(g), strategy)
+                self.assertEqual(g.zobrist.value, full_hash(g), f"{name} turn {g.turn}")
+
+    def test_fresh_games_under_overridden_settings(self):
+        default = SimGame(1).zobrist.value
+        with settings_overrides({"FUNDS_START": 20}):
+            g = SimGame(1)
+            self.assertEqual(g.zobrist.value, full_hash(g))
+            self.assertNotEqual(g.zobrist.value, default)
+        self.assertEqual(SimGame(1).zobrist.value, default)
+
+    def test_same_state_same_hash(self):
+        a, b = SimGame(seed=1), SimGame(seed=2)
+        self.assertEqual(a.zobrist.value, b.zobrist.value)
+        start = a.zobrist.value
+        a.regions["Asia"].adjust_rep(+2)
+        a.funds.charge("lobby", 1)
+        self.assertNotEqual(a.zobrist.value, start)
+        b.funds.charge("lobby", 1)  # same changes, the other order
+        b.regions["Asia"].adjust_rep(+1); b.regions["Asia"].adjust_rep(+1)
+        self.assertEqual(a.zobrist.value, b.zobrist.value)
+
+        a.regions["Asia"].adjust_rep(-2)
+        self.assertNotEqual(a.zobrist.value, start)  # the lobby counter still moved
+
+    def test_deck_and_hand_moves(self):
+        g = SimGame(seed=3)
+        start = g.zobrist.value
+        drawn = g.deck.draw(S.CARD_TYPES[0], 2)
+        self.assertNotEqual(g.zobrist.value, start)
+        self.assertEqual(g.zobrist.value, full_hash(g))
+        g.deck.put_back(drawn)
+        self.assertEqual(g.zobrist.value, start)
+
+    def test_rehash_after_direct_writes(self):
+        g = SimGame(seed=4)
+        g.compute_idx = 2
+        g.regions["Europe"].power = 7
+        self.assertNotEqual(g.zobrist.value, full_hash(g))
+        self.assertEqual(rehash(g), full_hash(g))
+
+
+class TestEvalCache(unittest.TestCase):
+    def test_lru_bound_and_hits(self):
+        cache, calls = EvalCache(maxsize=2), []
+
+        def evaluate(k):
+            return lambda: calls.append(k) or k * 10
+
+        self.assertEqual(cache.get(1, evaluate(1)), 10)
+        self.assertEqual(cache.get(1, evaluate(1)), 10)
+        cache.get(2, evaluate(2))
+        cache.get(1, evaluate(1))  # 1 is now the most recent
+        cache.get(3, evaluate(3))  # evicts 2
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn(2, cache)
+        self.assertEqual((cache.hits, cache.misses), (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Gym-style vectorised environment: many SimGames stepped in lockstep.
+
+    env = VecEnv(256, turns=40)
+    obs, masks = env.reset(seed=0)
+    while True:
+        obs, rewards, dones, masks = env.step({"cells": ..., "regions": ...})
+
+Everything crossing the interface is a NumPy array with one row per game:
+
+    obs       (n, FEATURE_SIZE) float32, features.FEATURE_NAMES per row,
+              written in place into one preallocated buffer
+    rewards   (n,) float32, the turn's income (total reputation x power)
+    dones     (n,) bool, True on a game's last turn; that row of `obs` is
+              already the first observation of the next game (auto-reset)
+    masks     {"cells": (n, N_CELLS) bool, "regions": (n, N_TASKS, N_REGIONS) bool}
+              cells a token could go on alone right now (legal and
+              affordable, with a token free), and region candidates per
+              region-task type
+
+Actions:
+    cells        (n, N_CELLS) bool, the cells to place tokens on (row-major
+                 over the S.GRID_ROWS x S.GRID_COLS grid); cells beyond what
+                 the turn can hold or afford are dropped in index order
+    regions      (n, N_TASKS) S.REGION_NAMES index per region-task type
+                 (batch_strategies.TASK_TYPES)
+    card_budget  optional (n,), as in batch_strategies
+"""
+import numpy as np
+
+import settings as S
+from batch_strategies import COSTED_KEYS, N_CELLS, N_REGIONS, TASK_TYPES, RowDecision, cell_costs, greedy_cells
+from cards import load_catalog
+from features import F_COMPUTE, F_FUNDS, F_REGIONS, FEATURE_NAMES, FEATURE_SIZE, SERIES_KEYS, encode_batch
+from rules import ALL_CELLS, REGION_TASKS, SimGame, TurnLedger
+
+N_TASKS = len(TASK_TYPES)
+OBS_FIELDS, OBS_SIZE = FEATURE_NAMES, FEATURE_SIZE
+
+_NEEDS_PRESENCE = np.array([requires for _cell, _kind, requires in REGION_TASKS])
+_ADD_PRESENCE = np.array([kind == "add_presence" for kind in TASK_TYPES])
+_PRESENCE_CELLS = np.array([cell in S.PRESENCE_REQUIRED_COORDS for cell in ALL_CELLS])
+_COSTED_COLS = [F_FUNDS + 1 + SERIES_KEYS.index(k) for k in COSTED_KEYS]
+_PRESENCE_COLS = slice(F_REGIONS + 3, F_REGIONS + 4 * N_REGIONS, 4)
+
+
+class VecEnv:
+    """copy=False hands out the observation buffer itself (overwritten by the next step)."""
+
+    def __init__(self, num_envs, turns=None, catalog=None, copy=True):
+        self.num_envs = num_envs
+        self.turns = S.SIM_TURNS if turns is None else turns
+        self.catalog = catalog or load_catalog()
+        self.copy = copy
+        self.games = []
+        self._obs = np.zeros((num_envs, OBS_SIZE), dtype=np.float32)
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._dones = np.zeros(num_envs, dtype=bool)
+        self._ledger = TurnLedger()
+        self._row = RowDecision()
+        self._next_seed = 0
+
+    def _new_game(self):
+        game = SimGame(self._next_seed, self.catalog)
+        self._next_seed += 1
+        return game
+
+    def reset(self, seed=None):
+        """Start num_envs fresh games (seeds seed, seed + 1, ...); returns (obs, masks)."""
+        if seed is not None:
+            self._next_seed = seed
+        self.games = [self._new_game() for _ in range(self.num_envs)]
+        return self._observe()
+
+    def step(self, actions):
+        """Play one turn in every game; returns (obs, rewards, dones, masks)."""
+        if not self.games:
+            raise RuntimeError("call reset() before step()")
+        cells = np.asarray(actions["cells"], dtype=bool).reshape(self.num_envs, N_CELLS)
+        regions = np.asarray(actions["regions"]).reshape(self.num_envs, N_TASKS).tolist()
+        budgets = actions.get("card_budget")
+        budgets = [-1] * self.num_envs if budgets is None else np.asarray(budgets).tolist()
+        # flatnonzero per row, in one pass over the whole batch
+        rows, idx = np.nonzero(cells)
+        prefs = np.split(idx, np.searchsorted(rows, np.arange(1, self.num_envs)))
+
+        row, ledger = self._row, self._ledger
+        for i, game in enumerate(self.games):
+            row.regions, row.budget = regions[i], budgets[i]
+            self._rewards[i] = game.play_turn(greedy_cells(game, prefs[i].tolist(), ledger), row)["income"]
+            self._dones[i] = game.turn >= self.turns
+            if self._dones[i]:
+                self.games[i] = self._new_game()
+        obs, masks = self._observe()
+        return obs, self._rewards.copy(), self._dones.copy(), masks
+
+    def _observe(self):
+        obs = encode_batch(self.games, self._obs)
+        presence = obs[:, _PRESENCE_COLS] > 0
+        legal = ~_PRESENCE_CELLS | presence.any(axis=1)[:, None]
+        costs = cell_costs(obs[:, _COSTED_COLS].astype(np.int64), self.games[0].funds.series_map)
+        affordable = costs <= obs[:, F_FUNDS:F_FUNDS + 1]
+        cell_mask = legal & affordable & (obs[:, F_COMPUTE + 2:F_COMPUTE + 3] > 0)
+        presence = presence[:, None, :]
+        region_mask = np.where(_NEEDS_PRESENCE[None, :, None], presence, True)
+        # new presence only where there is none yet (a repeat would be wasted)
+        region_mask = np.where(_ADD_PRESENCE[None, :, None], ~presence, region_mask)
+        return (obs.copy() if self.copy else obs), {"cells": cell_mask, "regions": region_mask}
@@ -0,0 +1,175 @@
+"""Incremental 64-bit state fingerprint and the evaluation cache keyed on it.
+
+Every rule-level feature of a game -- each region's chaos, reputation,
+power and presence, funds and the funds counters, the compute/model
+trackers, both ops tracks, and which deck or hand each card is in --
+contributes zkey(feature, value) to one XOR. A mutation swaps the old
+value's key for the new one (Zobrist.move), so keeping the fingerprint
+current costs two dict lookups per change instead of a walk over the
+state.
+
+Region, Funds and Deck do this themselves once attach() has given them
+the game's Zobrist; the trackers, ops tracks and hand are plain game
+attributes, so the code that changes them calls move() alongside. Paths
+that write state wholesale (undo/redo, replay seeks) call rehash().
+
+Keys come from blake2b over the feature's repr, so fingerprints agree
+across processes (unlike hash(), which is salted per run).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import settings as S
+
+TRACKERS = (("compute",), ("model",), ("ops_available",), ("ops_aspirational",))
+
+
+@lru_cache(maxsize=S.ZOBRIST_KEY_CACHE)
+def zkey(feature, value) -> int:
+    """The 64-bit key for `feature` (a tuple) holding `value`."""
+    digest = hashlib.blake2b(repr((feature, value)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class Zobrist:
+    """The running fingerprint; `value` is the current 64-bit hash."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value=0):
+        self.value = value
+
+    def move(self, feature, old, new):
+        if old != new:
+            self.value ^= zkey(feature, old) ^ zkey(feature, new)
+
+    def move_all(self, features, olds, news):
+        for feature, old, new in zip(features, olds, news):
+            if old != new:
+                self.value ^= zkey(feature, old) ^ zkey(feature, new)
+
+
+def tracker_values(game) -> tuple:
+    """The TRACKERS features of a Game or SimGame, in order."""
+    return game.compute_idx, game.model_idx, game.ops_available, game.ops_aspirational
+
+
+def _features(game):
+    for r in game.regions.regions.values():
+        yield ("chaos", r.name), int(r.chaos)
+        yield ("rep", r.name), int(r.reputation)
+        yield ("power", r.name), int(r.power)
+        yield ("presence", r.name), bool(r.player_presence)
+    yield ("funds",), int(game.funds.value)
+    for key, n in game.funds.counters.items():
+        yield ("counter", key), int(n)
+    yield from zip(TRACKERS, map(int, tracker_values(game)))
+    in_deck = {cid for deck in game.deck.decks.values() for cid in deck.ids()}
+    in_hand = set(game.hand)
+    for cid in (cid for t in S.CARD_TYPES for cid in game.catalog.ids_of_type(t)):
+        yield ("deck", cid), cid in in_deck
+        yield ("hand", cid), cid in in_hand
+
+
+def full_hash(game) -> int:
+    """The fingerprint computed from scratch (what the incremental one must equal)."""
+    h = 0
+    for feature, value in _features(game):
+        h ^= zkey(feature, value)
+    return h
+
+
+_FRESH = {}  # _start_key() -> fingerprint of a new game's state
+
+
+def _start_key(game):
+    """Everything a new game's state depends on: the catalog and the starting settings."""
+    return (game.catalog, S.FUNDS_START, tuple(S.FUNDS_SERIES), S.OPS_START_AVAILABLE,
+            S.OPS_START_ASPIRATIONAL, tuple(S.REGION_NAMES))
+
+
+def attach(game, fresh=False):
+    """Give `game` a Zobrist (game.zobrist) and have its regions, funds and decks keep it current.
+
+    fresh: the game is in the start state, whose fingerprint depends only on
+    the catalog and the starting settings (sweeps override them), so it is
+    computed once per combination rather than per game.
+    """
+    key = _start_key(game) if fresh else None
+    value = _FRESH.get(key) if fresh else None
+    if value is None:
+        value = full_hash(game)
+        if fresh:
+            _FRESH[key] = value
+    z = Zobrist(value)
+    game.zobrist = z
+    for r in game.regions.regions.values():
+        r.zobrist = z
+    game.funds.zobrist = z
+    for deck in game.deck.decks.values():
+        deck.zobrist = z
+    return z
+
+
+def rehash(game):
+    """Recompute after state was written directly (restores); returns the new value."""
+    game.zobrist.value = full_hash(game)
+    return game.zobrist.value
+
+
+class EvalCache:
+    """Bounded, thread-safe LRU of evaluations keyed on (fingerprint, what).
+
+        score = EVAL_CACHE.get((game.zobrist.value, "economy"), lambda: evaluate(game))
+
+    A second game that reaches the same state shares the entry, so search,
+    overlays and projections over transpositions compute each state once.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize or S.EVAL_CACHE_SIZE
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, compute):
+        """The cached value for `key`, or compute() stored under it."""
+        value = self.peek(key)
+        if value is None:
+            value = compute()  # outside the lock; a racing duplicate only costs the work twice
+            self.put(key, value)
+        return value
+
+    def peek(self, key):
+        """The cached value for `key` (counted as a hit), or None without computing anything."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+EVAL_CACHE = EvalCache()  # shared by everything that evaluates game states